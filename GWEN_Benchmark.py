@@ -0,0 +1,778 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# GWEN_Benchmark.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# Headless benchmark suite for GWEN. Runs under QT_QPA_PLATFORM=offscreen and writes
+# machine-readable JSON, so results can be compared across revisions.
+#
+#   python GWEN_Benchmark.py                                  # run everything, print JSON
+#   python GWEN_Benchmark.py --output new.json --quick        # smaller sizes
+#   python GWEN_Benchmark.py --compare old.json --tolerance 0.2
+#
+# Exits with a non-zero status when a budget is exceeded or, with --compare, when a
+# result regressed by more than the tolerance.
+#
+# Dependencies
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+import subprocess
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+# Directory GWEN is installed in
+gwen_path = os.path.dirname(os.path.abspath(__file__))
+
+# `import GWEN_GuiEngine` (including QApplication creation) must stay below this many seconds
+import_budget = 0.5
+# Bytes one updatePlot call on the fast path (finite float arrays, skipFiniteCheck, fixed
+# ranges) may allocate in steady state; copying or scanning the benchmark data would take more
+fast_plot_budget = 32768
+# Backends that only load when a widget needing them is added
+heavy_modules = ('matplotlib', 'pyqtgraph', 'pyqt_led')
+
+# Widget counts and divies mixes used by the layout benchmarks
+layout_sizes = (10, 100, 1000, 10000)
+layout_mixes = ('rows', 'cols', 'tabs', 'groups')
+
+
+def benchImport(repeat=5):
+	""" Times `import GWEN_GuiEngine` in fresh interpreters. Returns the best and median
+	time in seconds and the heavy backends that were imported along with it.
+	"""
+	script = (
+		'import sys, time, json\n'
+		't = time.perf_counter()\n'
+		'import GWEN_GuiEngine\n'
+		't = time.perf_counter() - t\n'
+		'print(json.dumps([t, [m for m in {} if m in sys.modules]]))\n'
+	).format(repr(heavy_modules))
+
+	times = []
+	loaded = []
+	for run in range(repeat):
+		output = subprocess.check_output([sys.executable, '-c', script], cwd=gwen_path, env=os.environ)
+		seconds, loaded = json.loads(output.decode().strip().splitlines()[-1])
+		times.append(seconds)
+
+	return {'best': min(times), 'median': statistics.median(times), 'heavyModules': loaded}
+
+
+def checkImportBudget(budget=import_budget, repeat=5):
+	""" Returns (ok, result): ok is False if the median import time exceeds budget
+	or a heavy backend is imported eagerly
+	"""
+	result = benchImport(repeat)
+	result['budget'] = budget
+	ok = result['median'] <= budget and not result['heavyModules']
+	return ok, result
+
+
+def _engine_():
+	""" Imports the engine (and creates the QApplication) on first use """
+	import GWEN_GuiEngine
+	return GWEN_GuiEngine
+
+
+def _dispose_(gui):
+	engine = _engine_()
+	gui.deleteLater()
+	engine.QtCore.QCoreApplication.sendPostedEvents(None, engine.QtCore.QEvent.DeferredDelete)
+	engine.app.processEvents()
+
+
+def buildPanel(count, mix='rows', rowLength=10, lazyTabs=False):
+	""" Returns a GWENGui holding count indicators laid out with the given divies mix:
+		'rows' 		endRow every rowLength widgets
+		'cols' 		endCol every rowLength widgets, newCol after every column
+		'tabs' 		rows, plus a makeTab every 10 rows
+		'groups' 	rows, each row wrapped in startGroup/endGroup
+	"""
+	engine = _engine_()
+	gui = engine.GWENGui(lazyTabs=lazyTabs)
+	for index in range(count):
+		if mix == 'groups' and index % rowLength == 0:
+			gui.startGroup('group {}'.format(index // rowLength))
+		gui.addIndicator('w{}'.format(index), default=index)
+		if (index + 1) % rowLength == 0 or index == count - 1:
+			if mix == 'cols':
+				gui.endCol()
+				gui.newCol()
+			else:
+				gui.endRow()
+			if mix == 'groups':
+				gui.endGroup()
+			elif mix == 'tabs' and (index + 1) % (10*rowLength) == 0:
+				gui.makeTab('tab {}'.format(index // (10*rowLength)))
+	if mix == 'tabs':
+		gui.makeTab('last')
+	return gui
+
+
+def benchLayout(count, mix):
+	""" Seconds spent in createLayout for count widgets """
+	gui = buildPanel(count, mix)
+	start = time.perf_counter()
+	gui.createLayout()
+	seconds = time.perf_counter() - start
+	_dispose_(gui)
+	return seconds
+
+
+def panelDivies(count, mix='rows', rowLength=10):
+	""" Divies (as tuples) and widget dims of buildPanel(count, mix), without creating any Qt object """
+	divies = []
+	for index in range(count):
+		if mix == 'groups' and index % rowLength == 0:
+			divies.append(('startGroup', None, 'group {}'.format(index // rowLength)))
+		if (index + 1) % rowLength == 0 or index == count - 1:
+			size = index % rowLength + 1
+			if mix == 'cols':
+				divies += [('endCol', size, None), ('newCol', None, None)]
+			else:
+				divies.append(('endRow', size, None))
+			if mix == 'groups':
+				divies.append(('endGroup', None, None))
+			elif mix == 'tabs' and (index + 1) % (10*rowLength) == 0:
+				divies.append(('makeTab', None, 'tab {}'.format(index // (10*rowLength))))
+	if mix == 'tabs':
+		divies.append(('makeTab', None, 'last'))
+	return divies, [[1,1]]*count
+
+
+def benchPlan(count, mix):
+	""" Seconds GWEN_Layout needs to plan count widgets (pure Python, no Qt) """
+	from GWEN_Layout import compilePlan
+	divies, dims = panelDivies(count, mix)
+	start = time.perf_counter()
+	compilePlan(divies, dims)
+	return time.perf_counter() - start
+
+
+def benchPanel(count=1000):
+	""" Seconds GWEN_Panel.loadPanel needs for a count indicator panel file, on the first
+	load (parse and plan) and on a restart (cached). Returns (cold, warm).
+	"""
+	import tempfile
+	import GWEN_Panel
+	import GWEN_Layout
+	cacheDir = tempfile.mkdtemp()
+	items = []
+	for index in range(count):
+		items.append({'add': 'Indicator', 'id': 'w{}'.format(index), 'default': index})
+		if (index + 1) % 10 == 0:
+			items.append('endRow')
+	path = os.path.join(cacheDir, 'panel.json')
+	with open(path, 'w') as file:
+		json.dump({'title': 'bench', 'items': items}, file)
+
+	times = []
+	for load in range(2):
+		# Planner memo would hide the planning cost of the cold load
+		GWEN_Layout._plans_.clear()
+		start = time.perf_counter()
+		gui = GWEN_Panel.loadPanel(path, cacheDir=cacheDir)
+		times.append(time.perf_counter() - start)
+		_dispose_(gui)
+	return tuple(times)
+
+
+def benchLookup(count=1000, calls=100000):
+	""" Mean getWidget latency in seconds with count widgets registered """
+	gui = buildPanel(count)
+	ids = ['w{}'.format(index) for index in range(count)]
+	start = time.perf_counter()
+	for call in range(calls):
+		gui.getWidget(ids[call % count])
+	seconds = (time.perf_counter() - start)/calls
+	_dispose_(gui)
+	return seconds
+
+
+def benchIndicator(calls=20000, repeat=1):
+	""" updateIndicator calls per second, each value sent repeat times in a row """
+	gui = buildPanel(10)
+	gui.createLayout()
+	start = time.perf_counter()
+	for call in range(calls):
+		gui.updateIndicator('w3', call // repeat)
+	rate = calls/(time.perf_counter() - start)
+	_dispose_(gui)
+	return rate
+
+
+def benchLog(calls=20000):
+	""" updateLog messages per second, including the batched appends to the document """
+	engine = _engine_()
+	gui = engine.GWENGui()
+	gui.addLogBox('log')
+	gui.endRow()
+	gui.createLayout()
+	logBox = gui.getWidget('log')
+	start = time.perf_counter()
+	for call in range(calls):
+		gui.updateLog('log', 'message {}'.format(call))
+	logBox.flush()
+	rate = calls/(time.perf_counter() - start)
+	_dispose_(gui)
+	return rate
+
+
+def benchPlot(calls=500, points=1000, curves=2):
+	""" updatePlot calls per second (including the repaint) for curves x points """
+	import numpy as np
+	engine = _engine_()
+	gui = engine.GWENGui()
+	gui.addPlot('plot', curves, ['', 'x', 'y'])
+	gui.endRow()
+	gui.createLayout()
+	gui.show()
+	x = np.arange(points, dtype=np.float64)
+	y = [np.sin(x/50 + curve) for curve in range(curves)]
+	start = time.perf_counter()
+	for call in range(calls):
+		gui.updatePlot('plot', x, *y)
+		engine.app.processEvents()
+	rate = calls/(time.perf_counter() - start)
+	_dispose_(gui)
+	return rate
+
+
+def benchPlotAllocations(calls=20, points=100000, curves=4):
+	""" Steady-state updatePlot on the zero-copy fast path, without the repaint. Returns
+	(largest transient allocation of a call in bytes, True if every curve shares the memory
+	of the arrays that were passed)
+	"""
+	import tracemalloc
+	import numpy as np
+	engine = _engine_()
+	gui = engine.GWENGui()
+	gui.addPlot('plot', curves, ['', 'x', 'y'], skipFiniteCheck=True, connect='all', xRange=(0, points), yRange=(-1, 1))
+	gui.endRow()
+	gui.createLayout()
+	gui.show()
+	x = np.arange(points, dtype=np.float64)
+	Y = np.sin(x/50 + np.arange(curves)[:, np.newaxis])
+	for call in range(5):
+		gui.updatePlot('plot', x, Y)
+		engine.app.processEvents()
+
+	peak = 0
+	tracemalloc.start()
+	try:
+		for call in range(calls):
+			before = tracemalloc.get_traced_memory()[0]
+			tracemalloc.reset_peak()
+			gui.updatePlot('plot', x, Y)
+			peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+	finally:
+		tracemalloc.stop()
+	curves = gui.getWidget('plot').curves
+	shared = all(np.shares_memory(curve.curve.xData, x) and np.shares_memory(curve.curve.yData, Y) for curve in curves)
+	_dispose_(gui)
+	return peak, shared
+
+
+def benchFrameView(frames=60, size=1024):
+	""" Frames per second (including the repaint) of size x size uint16 frames with auto
+	levels and a colormap
+	"""
+	import numpy as np
+	engine = _engine_()
+	gui = engine.GWENGui()
+	gui.addFrameView('camera', colormap='viridis')
+	gui.endRow()
+	gui.createLayout()
+	gui.show()
+	view = gui.getWidget('camera')
+	generator = np.random.default_rng(0)
+	images = [generator.integers(0, 4096, (size, size), dtype=np.uint16) for image in range(4)]
+	gui.updateFrame('camera', images[0])
+	engine.app.processEvents()
+	start = time.perf_counter()
+	for frame in range(frames):
+		gui.updateFrame('camera', images[frame % len(images)])
+		view.viewport().repaint()
+	rate = frames/(time.perf_counter() - start)
+	_dispose_(gui)
+	return rate
+
+
+def benchImages(count=40, files=8, size=1500):
+	""" Seconds to build a panel of count images over files distinct files, and until every
+	image is shown: (build, loaded)
+	"""
+	import tempfile
+	engine = _engine_()
+	from PyQt5 import QtGui
+	import GWEN_GuiObjects
+	GWEN_GuiObjects.pixmap_cache.clear()
+	directory = tempfile.mkdtemp()
+	paths = []
+	for file in range(files):
+		image = QtGui.QImage(size, size, QtGui.QImage.Format_RGB32)
+		image.fill(QtGui.QColor(30*file % 256, 100, 150))
+		paths.append(os.path.join(directory, 'image{}.png'.format(file)))
+		image.save(paths[-1])
+
+	start = time.perf_counter()
+	gui = engine.GWENGui()
+	for image in range(count):
+		gui.addImage('image{}'.format(image), paths[image % files], size=[200,200])
+		if image % 8 == 7:
+			gui.endRow()
+	gui.createLayout()
+	build = time.perf_counter() - start
+	widgets = [gui.getWidget('image{}'.format(image)) for image in range(count)]
+	while not all(widget.ready for widget in widgets):
+		engine.app.processEvents()
+	loaded = time.perf_counter() - start
+	_dispose_(gui)
+	return build, loaded
+
+
+def benchTable(rows, calls=100):
+	""" Seconds per call on a table of rows rows sorted by time: (append 10 rows, update a
+	column slice, scroll and repaint). Only visible cells are formatted, so these should not
+	grow with rows
+	"""
+	import numpy as np
+	engine = _engine_()
+	gui = engine.GWENGui()
+	gui.addTable('table', [('t', np.float64), ('value', np.float64), ('count', np.int64)])
+	gui.endRow()
+	gui.createLayout()
+	gui.show()
+	table = gui.getWidget('table')
+	generator = np.random.default_rng(0)
+	gui.updateTable('table', {'t': np.arange(rows, dtype=np.float64), 'value': generator.random(rows), 'count': np.arange(rows)})
+	table.model().sort(0)
+	engine.app.processEvents()
+
+	start = time.perf_counter()
+	for call in range(calls):
+		t = rows + 10*call + np.arange(10, dtype=np.float64)
+		gui.updateTable('table', {'t': t, 'value': generator.random(10), 'count': np.zeros(10, np.int64)})
+	append = (time.perf_counter() - start)/calls
+
+	values = generator.random(100)
+	start = time.perf_counter()
+	for call in range(calls):
+		gui.updateTableColumn('table', 'value', values, rows//2)
+	update = (time.perf_counter() - start)/calls
+
+	scrollBar = table.verticalScrollBar()
+	start = time.perf_counter()
+	for call in range(calls):
+		scrollBar.setValue(scrollBar.maximum()*call//calls)
+		table.viewport().repaint()
+	scroll = (time.perf_counter() - start)/calls
+	_dispose_(gui)
+	return append, update, scroll
+
+
+def benchStackPlot(calls=50, channels=64, points=1000):
+	""" Seconds per update of channels curves: (one stack plot, one plot per channel) """
+	import numpy as np
+	engine = _engine_()
+	x = np.arange(points, dtype=np.float64)
+	Y = np.sin(x/50 + np.arange(channels)[:, np.newaxis])
+
+	gui = engine.GWENGui()
+	gui.addStackPlot('stack', channels, 1, [16,4], ['', 'x', 'y'])
+	gui.endRow()
+	gui.createLayout()
+	start = time.perf_counter()
+	for call in range(calls):
+		gui.updateStackPlot('stack', x, Y)
+		engine.app.processEvents()
+	stacked = (time.perf_counter() - start)/calls
+	_dispose_(gui)
+
+	gui = engine.GWENGui()
+	for channel in range(channels):
+		gui.addPlot('plot{}'.format(channel), 1, ['', 'x', 'y'])
+		if channel % 8 == 7:
+			gui.endRow()
+	gui.createLayout()
+	start = time.perf_counter()
+	for call in range(calls):
+		for channel in range(channels):
+			gui.updatePlot('plot{}'.format(channel), x, Y[channel])
+		engine.app.processEvents()
+	separate = (time.perf_counter() - start)/calls
+	_dispose_(gui)
+	return stacked, separate
+
+
+def benchHiddenTabs(calls=100, tabs=8, points=1000, deferHidden=True):
+	""" Rounds per second of updating one plot on each of tabs tabs (one tab visible) """
+	import numpy as np
+	engine = _engine_()
+	gui = engine.GWENGui()
+	gui.deferHidden = deferHidden
+	for tab in range(tabs):
+		gui.addPlot('plot{}'.format(tab), 1, ['', 'x', 'y'])
+		gui.endRow()
+		gui.makeTab('tab {}'.format(tab))
+	gui.createLayout()
+	gui.show()
+	x = np.arange(points, dtype=np.float64)
+	start = time.perf_counter()
+	for call in range(calls):
+		y = np.sin(x/50 + call)
+		for tab in range(tabs):
+			gui.updatePlot('plot{}'.format(tab), x, y)
+		engine.app.processEvents()
+	rate = calls/(time.perf_counter() - start)
+	_dispose_(gui)
+	return rate
+
+
+def benchRecorder(calls=20000, points=1000):
+	""" Extra seconds per update call while recording, for an indicator and for a plot
+	of points samples (the GUI thread snapshots the arguments, a thread writes them).
+	Returns (indicator, plot, dropped)
+	"""
+	import tempfile
+	import numpy as np
+	engine = _engine_()
+	gui = engine.GWENGui()
+	gui.addIndicator('indicator')
+	gui.addPlot('plot', 1, ['', 'x', 'y'])
+	gui.endRow()
+	gui.createLayout()
+	x = np.arange(points, dtype=np.float64)
+	y = np.sin(x/50)
+
+	def timed():
+		start = time.perf_counter()
+		for call in range(calls):
+			gui.updateIndicator('indicator', call)
+		indicator = (time.perf_counter() - start)/calls
+		start = time.perf_counter()
+		for call in range(calls // 10):
+			gui.updatePlot('plot', x, y)
+		return indicator, (time.perf_counter() - start)/(calls // 10)
+
+	plain = timed()
+	directory = tempfile.mkdtemp()
+	gui.startRecording(os.path.join(directory, 'bench.gwrec'))
+	recorded = timed()
+	stats = gui.stopRecording()
+	_dispose_(gui)
+	return recorded[0] - plain[0], recorded[1] - plain[1], stats['dropped']
+
+
+def benchProfiler(calls=20000):
+	""" Extra seconds per updateIndicator call with the profiler enabled """
+	gui = buildPanel(10)
+	gui.createLayout()
+
+	def timed():
+		start = time.perf_counter()
+		for call in range(calls):
+			gui.updateIndicator('w3', call)
+		return (time.perf_counter() - start)/calls
+
+	plain = timed()
+	gui.enableProfiler()
+	profiled = timed()
+	gui.disableProfiler()
+	_dispose_(gui)
+	return profiled - plain
+
+
+def benchReplay(calls=20000, points=1000):
+	""" Replays a recording of indicator and plot updates as fast as possible.
+	Returns (records per second, seconds to seek to the middle)
+	"""
+	import tempfile
+	import numpy as np
+	engine = _engine_()
+	gui = engine.GWENGui()
+	gui.addIndicator('indicator')
+	gui.addPlot('plot', 1, ['', 'x', 'y'])
+	gui.endRow()
+	gui.createLayout()
+	x = np.arange(points, dtype=np.float64)
+	y = np.sin(x/50)
+	path = os.path.join(tempfile.mkdtemp(), 'bench.gwrec')
+	gui.startRecording(path)
+	for call in range(calls):
+		if call % 10:
+			gui.updateIndicator('indicator', call)
+		else:
+			gui.updatePlot('plot', x, y)
+	gui.stopRecording()
+
+	replay = gui.startReplay(path, speed=0)
+	start = time.perf_counter()
+	while replay.isPlaying():
+		engine.app.processEvents()
+	rate = replay.applied/(time.perf_counter() - start)
+	start = time.perf_counter()
+	replay.seek(replay.duration()/2)
+	seek = time.perf_counter() - start
+	replay.close()
+	_dispose_(gui)
+	return rate, seek
+
+
+def benchStream(calls=2000, chunk=10, capacity=100000):
+	""" Ring-buffer appends per second into a full streaming plot, without the redraw
+	(cost must depend on chunk, not on capacity)
+	"""
+	import numpy as np
+	engine = _engine_()
+	gui = engine.GWENGui()
+	gui.addPlot('plot', 1, ['', 'x', 'y'], capacity=capacity)
+	gui.endRow()
+	gui.createLayout()
+	plot = gui.getWidget('plot')
+	x = np.arange(capacity, dtype=np.float64)
+	plot.appendData(x, np.sin(x/50))
+	x = np.arange(chunk, dtype=np.float64)
+	y = np.sin(x/50)
+	start = time.perf_counter()
+	for call in range(calls):
+		plot.appendData(x + call*chunk, y, redraw=False)
+	rate = calls/(time.perf_counter() - start)
+	_dispose_(gui)
+	return rate
+
+
+def benchSerial(frames=100000):
+	""" Frames per second a GWEN_Serial source reads, frames, decodes and pushes to a
+	streaming plot (length-prefixed binary records). Uses a pty pair where available,
+	loop:// otherwise (much slower, it queues every byte separately)
+	"""
+	import threading
+	import numpy as np
+	from GWEN_Serial import GWENLengthFramer, GWENBinaryDecoder
+	engine = _engine_()
+	gui = engine.GWENGui()
+	gui.addPlot('plot', 1, ['', 'x', 'y'], capacity=frames)
+	gui.endRow()
+	gui.createLayout()
+	dtype = np.dtype([('length', '<u1'), ('t', '<u4'), ('v', '<f4')])
+	records = np.zeros(frames, dtype)
+	records['length'] = dtype.itemsize - 1
+	records['t'] = np.arange(frames)
+	records['v'] = np.sin(np.arange(frames)/50)
+	data = records.tobytes()
+
+	master = None
+	if hasattr(os, 'openpty'):
+		import tty
+		master, slave = os.openpty()
+		tty.setraw(slave)
+		port = os.ttyname(slave)
+	else:
+		port = 'loop://'
+	source = gui.addSerialSource(port, GWENLengthFramer('<B'), GWENBinaryDecoder([('t', '<u4'), ('v', '<f4')]))
+	source.bind('plot', 'v', x='t')
+
+	def write():
+		view = memoryview(data)
+		while view:
+			view = view[os.write(master, view):]
+
+	start = time.perf_counter()
+	source.start()
+	if master is None:
+		source.write(data)
+	else:
+		threading.Thread(target=write, daemon=True).start()
+	while source.frames < frames and source.error is None and time.perf_counter() - start < 30:
+		engine.app.processEvents()
+	engine.app.processEvents()
+	rate = source.frames/(time.perf_counter() - start)
+	source.stop()
+	if master is not None:
+		os.close(master)
+		os.close(slave)
+	_dispose_(gui)
+	return rate
+
+
+def benchMatplotlib(frames=100, points=1000, curves=4, blit=True):
+	""" Mean GWENMatplotlibPlot.updatePlot frame time in seconds (curves x points) """
+	import numpy as np
+	engine = _engine_()
+	gui = engine.GWENGui()
+	gui.addMatplotlibPlot('mpl', blit=blit)
+	gui.endRow()
+	gui.createLayout()
+	gui.show()
+	engine.app.processEvents()
+	x = np.arange(points, dtype=np.float64)
+	phase = np.arange(curves)[:,None]
+	gui.updateMatPlot('mpl', x, np.sin(x/50 + phase))
+	engine.app.processEvents()
+	start = time.perf_counter()
+	for frame in range(frames):
+		gui.updateMatPlot('mpl', x, np.sin(x/50 + phase + 0.1*frame))
+		engine.app.processEvents()
+	seconds = (time.perf_counter() - start)/frames
+	_dispose_(gui)
+	return seconds
+
+
+def benchLaunch(count=100, mix='rows', lazyTabs=False):
+	""" Seconds from GWENGui() to the first processed paint of a count widget panel """
+	engine = _engine_()
+	start = time.perf_counter()
+	gui = buildPanel(count, mix, lazyTabs=lazyTabs)
+	gui.createLayout()
+	gui.show()
+	engine.app.processEvents()
+	seconds = time.perf_counter() - start
+	_dispose_(gui)
+	return seconds
+
+
+def runAll(quick=False):
+	""" Runs the whole suite. Returns {name: {'value', 'unit', 'better'}} where better is
+	'lower' or 'higher'. Some results carry details, ie. the modules of import.heavyModules
+	"""
+	results = dict()
+	def record(name, value, unit, better='lower', **details):
+		results[name] = dict(value=value, unit=unit, better=better, **details)
+
+	sizes = layout_sizes[:3] if quick else layout_sizes
+	for mix in layout_mixes:
+		for count in sizes:
+			record('layout.{}.{}'.format(mix, count), benchLayout(count, mix), 's')
+			record('plan.{}.{}'.format(mix, count), benchPlan(count, mix), 's')
+
+	cold, warm = benchPanel()
+	record('panel.load.cold', cold, 's')
+	record('panel.load.warm', warm, 's')
+	record('lookup.getWidget', benchLookup(), 's')
+	record('update.indicator', benchIndicator(), 'calls/s', 'higher')
+	record('update.indicator.repeat', benchIndicator(repeat=10), 'calls/s', 'higher')
+	record('update.log', benchLog(), 'calls/s', 'higher')
+	record('update.plot', benchPlot(calls=100 if quick else 500), 'calls/s', 'higher')
+	record('update.stream', benchStream(), 'calls/s', 'higher')
+	indicator, plot, dropped = benchRecorder(5000 if quick else 20000)
+	record('recorder.overhead.indicator', indicator, 's')
+	record('recorder.overhead.plot', plot, 's')
+	record('profiler.overhead.indicator', benchProfiler(5000 if quick else 20000), 's')
+	build, loaded = benchImages()
+	record('images.build', build, 's')
+	record('images.loaded', loaded, 's')
+	record('update.frame.1024', benchFrameView(20 if quick else 60), 'frames/s', 'higher')
+	allocated, shared = benchPlotAllocations()
+	record('update.plot.fastPath.allocated', allocated, 'bytes')
+	record('update.plot.fastPath.zeroCopy', int(shared), 'bool', 'higher')
+	for rows in (1000, 1000000):
+		append, update, scroll = benchTable(rows)
+		record('table.append.{}'.format(rows), append, 's')
+		record('table.update.{}'.format(rows), update, 's')
+		record('table.scroll.{}'.format(rows), scroll, 's')
+	stacked, separate = benchStackPlot(20 if quick else 50)
+	record('update.stackPlot.64', stacked, 's')
+	record('update.plots.64', separate, 's')
+	rate, seek = benchReplay(5000 if quick else 20000)
+	record('replay.records', rate, 'records/s', 'higher')
+	record('replay.seek', seek, 's')
+	record('update.hiddenTabs', benchHiddenTabs(), 'rounds/s', 'higher')
+	record('update.hiddenTabs.noDefer', benchHiddenTabs(deferHidden=False), 'rounds/s', 'higher')
+	record('serial.frames', benchSerial(20000 if quick else 100000), 'frames/s', 'higher')
+	record('matplotlib.frame', benchMatplotlib(frames=30 if quick else 100), 's')
+	record('launch.100', benchLaunch(), 's')
+	record('launch.tabs.1000', benchLaunch(1000, 'tabs'), 's')
+	record('launch.lazyTabs.1000', benchLaunch(1000, 'tabs', lazyTabs=True), 's')
+
+	ok, imported = checkImportBudget(repeat=3 if quick else 5)
+	record('import.median', imported['median'], 's')
+	record('import.heavyModules', len(imported['heavyModules']), 'modules', modules=imported['heavyModules'])
+	record('import.withinBudget', int(ok), 'bool', 'higher')
+	return results
+
+
+def compare(results, baseline, tolerance=0.2):
+	""" Returns the names of results that are more than tolerance (fraction) worse than baseline """
+	regressions = []
+	for name, result in results.items():
+		if name not in baseline:
+			continue
+		old = baseline[name]['value']
+		new = result['value']
+		if not old:
+			continue
+		worse = (new - old)/old if result['better'] == 'lower' else (old - new)/old
+		if worse > tolerance:
+			regressions.append(name)
+	return regressions
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Headless GWEN benchmarks.')
+	parser.add_argument('--output', help='write the JSON report to this file')
+	parser.add_argument('--compare', help='JSON report of a previous run to compare against')
+	parser.add_argument('--tolerance', type=float, default=0.2, help='allowed relative regression (default 0.2)')
+	parser.add_argument('--quick', action='store_true', help='smaller sizes, fewer repeats')
+	args = parser.parse_args(argv)
+
+	from GWEN_Version import getVersion
+	from GWEN_GuiMatplotlib import target_fps
+	results = runAll(args.quick)
+	report = {
+		'meta': {
+			'version': 	getVersion(),
+			'python': 	platform.python_version(),
+			'platform': platform.platform(),
+			'time': 	time.strftime('%Y-%m-%dT%H:%M:%S'),
+			'quick': 	args.quick,
+		},
+		'results': results,
+	}
+
+	# Budgets
+	failures = []
+	if not results['import.withinBudget']['value']:
+		if results['import.median']['value'] > import_budget:
+			failures.append('import.median exceeds {} s'.format(import_budget))
+		if results['import.heavyModules']['value']:
+			failures.append('import.heavyModules: {} imported at startup'.format(', '.join(results['import.heavyModules']['modules'])))
+	if results['matplotlib.frame']['value'] > 1.0/target_fps:
+		failures.append('matplotlib.frame is below {} fps'.format(target_fps))
+	if results['update.plot.fastPath.allocated']['value'] > fast_plot_budget:
+		failures.append('update.plot.fastPath.allocated exceeds {} bytes'.format(fast_plot_budget))
+	if not results['update.plot.fastPath.zeroCopy']['value']:
+		failures.append('update.plot.fastPath.zeroCopy: curves do not share the arrays passed to updatePlot')
+
+	if args.compare:
+		with open(args.compare) as file:
+			baseline = json.load(file)['results']
+		for name in compare(results, baseline, args.tolerance):
+			failures.append('{} regressed more than {:.0%}'.format(name, args.tolerance))
+	report['failures'] = failures
+
+	text = json.dumps(report, indent=2)
+	if args.output:
+		with open(args.output, 'w') as file:
+			file.write(text)
+	print(text)
+	return 1 if failures else 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
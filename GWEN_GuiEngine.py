@@ -19,24 +19,16 @@
 # A normal work flow begins with creating a GWENGui() object, followed by a series
 # of addWidget() function calls, and ends with a .launch() command.
 #
-#### Git Commit Identifier ####################################################################
-import os
-try: 
-	from pydriller import RepositoryMining
-	path = str(os.getcwd())
-	commits = RepositoryMining(path, filepath='GWEN_GuiEngine.py').traverse_commits()
-	commits = [commit.hash for commit in commits]
-	commit_tag = commits[-1]
-
-	print('Using Gui Library from commit {}'.format(commit_tag))
-
-except:
-	print('Git commit tag cannot be found.')
-###############################################################################################
-
+# The GWEN version (git commit or stamped build) is available through getVersion() or
+# GWENGui.showVersion(). It is only looked up when asked for, importing never touches git.
+#
 # Gui Library Dependencies
 from GWEN_GuiObjects import *
+from GWEN_Scheduler import GWENScheduler, GWENProducerQueue, GWENUpdateQueue
+from GWEN_Version import getVersion
+from GWEN_Layout import planLayout
 import sys
+import logging
 
 ###########################################################################################################
 def _delete_(clean_up):
@@ -55,10 +47,13 @@ class GWENGui(QtWidgets.QMainWindow):
 	""" Wrapper class around a PyQtGui QMainWIndow. Instantiating this class should provide the skeleton
 	needed for the GUI window. This will be filled out by various addWidget functions.
 	"""
-	def __init__(self, title='GWENGui'):
-		""" Class Constructor. Calls super constructor """
+	def __init__(self, title='GWENGui', lazyTabs=False):
+		""" Class Constructor. Calls super constructor. With lazyTabs, widgets on every tab
+		but the first are only built the first time their tab is shown (see GWENLazyWidget)
+		"""
 		super().__init__()
 		self.title = title
+		self.lazyTabs = lazyTabs
 
 		# Create central widget
 		self.centralWidget = QtWidgets.QWidget(self)
@@ -69,6 +64,10 @@ class GWENGui(QtWidgets.QMainWindow):
 		self.labels     = list()
 		self.divies     = list()
 
+		# Registry indexing widgets and labels by id (kept in sync by _register_)
+		self.widgetIndex = dict()
+		self.labelIndex  = dict()
+
 		# Create tabs object in case user wants to include tabs
 		self.tabs 		= QtWidgets.QTabWidget()
 		self.miniTabs	= QtWidgets.QTabWidget()
@@ -78,6 +77,42 @@ class GWENGui(QtWidgets.QMainWindow):
 		self.divieSize = 0
 		self.mini = False
 		self.is_tab = False
+		# Top level tab the next widget goes on (counts makeTab calls outside group boxes)
+		self.page = 0
+		# Tabs whose widgets are not built yet (lazyTabs)
+		self.lazyPages = set()
+
+		# Widgets on tabs that are not selected (or in a minimized window) are not redrawn.
+		# Their updates wait in deferred and are applied once they become visible
+		self.deferHidden = True
+		self.hiddenWidgets = set()
+		self.deferred = GWENUpdateQueue()
+		self.pageWidgets = list()
+		self.pageGroups = list()
+		self.groupTabs = dict()
+
+		# Placement plan computed by createLayout (see GWEN_Layout), or set beforehand by
+		# GWEN_Panel from its cache
+		self.layoutPlan = None
+
+		# Optional frame-paced update scheduler (see enableScheduler)
+		self.scheduler = None
+		# Optional queue for updates coming from worker threads (see enableProducerQueue)
+		self.producerQueue = None
+		# Background serial readers feeding the Gui (see addSerialSource)
+		self.serialSources = list()
+		# Session recorder (see startRecording)
+		self.recorder = None
+		# Profiler (see enableProfiler)
+		self.profiler = None
+		# Event loop watchdog (see enableWatchdog)
+		self.watchdog = None
+		# Wrappers installed around the update slots (see addSlotWrapper)
+		self.slotWrappers = list()
+		self.wrappedSlots = set()
+		# (begin, end) called around button callbacks (see addCallbackHook)
+		self.callbackHooks = list()
+		self.hookedButtons = dict()
 		
 		# Call Initialize Function
 		self.initializeUI()
@@ -90,6 +125,16 @@ class GWENGui(QtWidgets.QMainWindow):
 		self.statusBar().showMessage('Ready.')
 
 
+	def showVersion(self):
+		""" Shows the GWEN version (commit hash or stamped build) in the status bar """
+		version = getVersion()
+		if version:
+			self.statusBar().showMessage('Using Gui Library from commit {}'.format(version))
+		else:
+			self.statusBar().showMessage('Git commit tag cannot be found.')
+		return version
+
+
 	def launch(self, clean_up=None):   
 		# Create grid layout
 		self.createLayout()
@@ -105,305 +150,218 @@ class GWENGui(QtWidgets.QMainWindow):
 		""" GWEN Gui Layout manager function that is called in the launch function. This function
 		will create grid layout by reading in the series of addWidget and divies functions that the user specifies.
 		Refer to GWENGui_Documentation for more info on how the Gui is created in rowation to the divies calls.
+		The row/col arithmetic lives in GWEN_Layout.planLayout, this function only builds the Qt layouts.
 		"""
 		# If there are no divies then add an endCol (Creates a vertical layout)
 		if not self.divies:
 			self.endCol()
 
-		# Create new widget to hold grid layout
-		self.gridLayout = QtWidgets.QGridLayout()
-
-		# Establish variables for grid layout manager
-		widgetPtr	= 0	# Pointer to widget in list you are at
-		row 		= 0 # Pointer to the row in the grid you are currently at
-		col 		= 0 # Pointer to the col in the grid you are currently at
-		nextRow		= 0 # Row where a endCol() call would reference you to
-		nextCol 	= 0 # Col where a endRow() call would reference you to
-		newRow 		= 0 # Row where a newCol() call would reference you to
-		newCol 		= 0 # Col where a newRow() call would reference you to
-		rowSize		= 0
-		colSize		= 0
-
-		# DEBUG MESSAGES
-		# print('R:{} C:{}'.format(str(row),str(col)))
-		# print('nextRow: {} nextCol: {}'.format(str(nextRow),str(nextCol)))
-		# print('newRow: {} newCol: {}'.format(str(newRow),str(newCol)))
-
-		# Begin loop for layout manager
-		for divie in self.divies:
-
-			# assign row/col indices
-			row = nextRow
-			col = nextCol
-
-			# End Row will start grid layout on next available Row
-			if divie.type == 'endRow':
-
-				if divie.size == 0:
-					pass
-
-				else:
-					# DEBUG MESSAGES
-					# print('\nendRow has size: ' + str(divie.size))
-
-					# Will loop over all widgets in range from first available widget to dim of divie
-					for index,widget in enumerate(self.widgets[widgetPtr:widgetPtr+divie.size]):
-						# label exists then 
-						if self.labels[index+widgetPtr]:
-							# Construct mini Vertical Layout to put label and widget in same grid
-							miniVLayout = QtWidgets.QVBoxLayout()
-							miniVLayout.addWidget(self.labels[index+widgetPtr],alignment=QtCore.Qt.AlignCenter)
-							miniVLayout.addWidget(widget,alignment=QtCore.Qt.AlignCenter)
-							# Add newly created vertical layout to grid layout
-							self.gridLayout.addLayout(miniVLayout,row,col,widget.dim[0],widget.dim[1],alignment=QtCore.Qt.AlignCenter)
-
-						else:
-							# Widgets that don't have any labels
-							self.gridLayout.addWidget(widget,row,col,widget.dim[0],widget.dim[1],alignment=QtCore.Qt.AlignCenter)
-
-						# DEBUG MESSAGES
-						# print('R:{} C:{}'.format(str(row),str(col)))
-
-						# Update row Row and row Col (should just increment col)
-						col += widget.dim[1]
-						rowSize = widget.dim[0] if widget.dim[0] > rowSize else rowSize
-
-					# Update row Row and row Col (should just increment row and set col to abs col)
-					widgetPtr += divie.size
-					nextRow += rowSize
-					row += rowSize
-					newCol = col if col > newCol else newCol
-					newRow = row if row > newRow else newRow
-
-					# DEBUG MESSAGES
-					# print('nextRow: {} nextCol: {}'.format(str(nextRow),str(nextCol)))
-					# print('newRow: {} newCol: {}'.format(str(newRow),str(newCol)))
-
-
-			# End Col will start grid layout on next available col
-			elif divie.type == 'endCol':
-
-				if divie.size == 0:
-					pass
-
-				else:
-					# DEBUG MESSAGES
-					# print('\nendCol has size: ' + str(divie.size))
-
-					# Will loop over all widgets in range from first available widget to dim of divie
-					for index,widget in enumerate(self.widgets[widgetPtr:widgetPtr+divie.size]):
-						# label exists then 
-						if self.labels[index+widgetPtr]:
-							# Construct mini Vertical Layout to put label and widget in same grid
-							miniVLayout = QtWidgets.QVBoxLayout()
-							miniVLayout.addWidget(self.labels[index+widgetPtr],alignment=QtCore.Qt.AlignCenter)
-							miniVLayout.addWidget(widget,alignment=QtCore.Qt.AlignCenter)
-							# Add newly created vertical layout to grid layout
-							self.gridLayout.addLayout(miniVLayout,row,col,widget.dim[0],widget.dim[1],alignment=QtCore.Qt.AlignCenter)
-
-						else:
-							# Widgets that don't have any labels
-							self.gridLayout.addWidget(widget,row,col,widget.dim[0],widget.dim[1],alignment=QtCore.Qt.AlignCenter)
-
-						# DEBUG MESSAGES
-						# print('R:{} C:{}'.format(str(row),str(col)))
-
-						# Update row Row and row Col (should just increment col)
-						row += widget.dim[0]
-						colSize = widget.dim[1] if widget.dim[1] > colSize else colSize
-
-					# Update row Row and row Col (should just increment row and set col to abs col)
-					widgetPtr += divie.size
-					nextCol += colSize
-					col += colSize
-					newRow = row if row > newRow else newRow
-					newCol = col if col > newCol else newCol
-
-					# DEBUG MESSAGES
-					# print('nextRow: {} nextCol: {}'.format(str(nextRow),str(nextCol)))
-					# print('newRow: {} newCol: {}'.format(str(newRow),str(newCol)))
-
-
-			# Adjust grid layout to start at new row
-			elif divie.type == 'newRow':
-				nextCol = 0
-				nextRow = newRow
-
-				# DEBUG MESSAGES
-				# print('\nR:{} C:{}'.format(str(row),str(col)))
-				# print('\tnextRow: {} nextCol: {}'.format(str(nextRow),str(nextCol)))
-				# print('\tnewRow: {} newCol: {}'.format(str(newRow),str(newCol)))
-
-
-			# Adjust grid layout to start at new col
-			elif divie.type == 'newCol':
-				nextRow = 0
-				nextCol = newCol
-
-				# DEBUG MESSAGES
-				# print('\nR:{} C:{}'.format(str(row),str(col)))
-				# print('\tnextRow: {} nextCol: {}'.format(str(nextRow),str(nextCol)))
-				# print('\tnewRow: {} newCol: {}'.format(str(newRow),str(newCol)))
-
-
-			# Puts current grid layout onto tab and starts on new tab
-			elif divie.type == 'makeTab':
-				if not self.mini:
-					# Create a new widget and current layout
-					tab = QtWidgets.QWidget()
-					tab.setLayout(self.gridLayout)
-					# Add widget as a tab
-					self.tabs.addTab(tab,divie.name)
-
-					# Grid Layout must be reset
-					self.gridLayout = QtWidgets.QGridLayout()
-					row=col=nextRow=nextCol=newRow=newCol=rowSize=colSize = 0
-				
-				else:
-					# Create a new mini widget and current layout
-					miniTab = QtWidgets.QWidget()
-					miniTab.setLayout(self.gridLayout)
-					# Add widget as a tab
-					self.miniTabs.addTab(miniTab,divie.name)
-
-					# Grid Layout must be reset
-					self.gridLayout = QtWidgets.QGridLayout()
-					row=col=nextRow=nextCol=newRow=newCol=rowSize=colSize = 0
-
-
-			# Creates a new group box. The widgets added after this call will be put into box
-			elif divie.type == 'startGroup':
-				# Set group name
-				self.groupBox.setTitle(divie.name)
-				# Store all index variables for later use
-				self.masterGridLayout	= self.gridLayout
-				self.masterNextRow 		= nextRow
-				self.masterNextCol 		= nextCol
-				self.masterNewRow 		= newRow
-				self.masterNewCol 		= newCol
-				self.mini 				= True
-
-				# Reset grid layout for mini grid layout
-				row=col=nextRow=nextCol=newRow=newCol=rowSize=colSize = 0
-				self.gridLayout = QtWidgets.QGridLayout() 
-				self.groupBox.setObjectName('groupBox')
-				self.groupBox.setStyleSheet(
-     				'QGroupBox#groupBox {border: 2px solid gray;' + 
-     				'border-radius: 3px; padding: 10px;}' 
-				)
-
-
-			# Ends the current group box.
-			elif divie.type == 'endGroup':
-				# DEBUG MESSAGES
-				# print('\tnextRow: {} nextCol: {}'.format(str(self.masterNextRow),str(self.masterNextCol)))
-				# print('\tnewRow: {} newCol: {}'.format(str(self.masterNewRow),str(self.masterNewCol)))
-
-				# Sets mini grid layout to the groupBox
-				if self.miniTabs.count():
-					self.gridLayout.addWidget(self.miniTabs)
-					self.miniTabs	= QtWidgets.QTabWidget()
-
-				self.groupBox.setLayout(self.gridLayout)
-
-				# Now place groupbox in the grid
-				if not divie.size:
-					self.masterGridLayout.addWidget(self.groupBox,self.masterNextRow,self.masterNextCol,self.gridLayout.rowCount(),self.gridLayout.columnCount())
-					nextCol = self.masterNextCol + self.gridLayout.columnCount()
-					newRow = self.gridLayout.rowCount() + self.masterNextRow if self.gridLayout.rowCount() + self.masterNextRow > self.masterNewRow else self.masterNewRow
-
-				else:
-					self.masterGridLayout.addWidget(self.groupBox,self.masterNextRow,self.masterNextCol,divie.size[0],divie.size[1])
-					nextCol = self.masterNextCol + divie.size[1]
-					newRow = divie.size[0] + self.masterNextRow if divie.size[0] + self.masterNextRow > self.masterNewRow else self.masterNewRow
-
-				# Update necessary index values
-				newCol = nextCol if nextCol > self.masterNewCol else self.masterNewCol
-
-				if not nextCol >= newCol:
-					nextRow = self.masterNextRow
-
-				# Resets grid layout to what it was before group box
-				self.gridLayout = self.masterGridLayout
-				self.groupBox 	= QtWidgets.QGroupBox()
-				self.mini 		= False
-
-				# DEBUG MESSAGES
-				# print('\tnextRow: {} nextCol: {}'.format(str(nextRow),str(nextCol)))
-				# print('\tnewRow: {} newCol: {}'.format(str(newRow),str(newCol)))
-
-
-			# Corner Case Fix
-			if nextCol >= newCol:
-				nextRow = 0
-				newCol = nextCol
-
-			if nextRow >= newRow:
-				nextCol = 0
-				newRow = nextRow
-
+		# Placement of every widget and group box
+		if self.layoutPlan is None:
+			self.layoutPlan = planLayout(self.divies, [widget.dim for widget in self.widgets])
+		plan = self.layoutPlan
+
+		# Widgets and group boxes of every page (the last page is used when there are no tabs)
+		self.pageWidgets = [[] for page in range(len(plan['tabs']) + 1)]
+		self.pageGroups = [[] for page in range(len(plan['tabs']) + 1)]
+		for index, placement in enumerate(plan['widgets']):
+			if placement is not None:
+				self.pageWidgets[placement[4]].append(index)
+		for group, entry in enumerate(plan['groups']):
+			self.pageGroups[entry[1]].append(group)
+
+		if not plan['tabs']:
+			self.gridLayout = self._buildPage_(len(self.pageWidgets) - 1, self.centralWidget)
+			self.centralWidget.setLayout(self.gridLayout)
+			self._updateVisibility_()
+			return
+
+		# Pages are created inside the central widget so the widgets they take over stay in
+		# the same window (reparenting across windows walks the whole focus chain every time)
+		for page, name in enumerate(plan['tabs']):
+			tab = QtWidgets.QWidget(self.centralWidget)
+			if self.lazyTabs and page:
+				# Built by _showTab_ the first time the tab is selected. Until then, widgets are
+				# built in the tab: the central widget is replaced (and deleted) below
+				self.lazyPages.add(page)
+				for index in self.pageWidgets[page]:
+					widget = self.widgets[index]
+					if isinstance(widget, GWENLazyWidget):
+						widget.buildParent = tab
+					else:
+						# Already built through its stand-in
+						widget.setParent(tab)
+						if self.labels[index]:
+							self.labels[index].setParent(tab)
+			else:
+				tab.setLayout(self._buildPage_(page, tab))
+			self.tabs.addTab(tab,name)
+		self.tabs.currentChanged.connect(self._showTab_)
 
 		# Set the layout that you just created
-		if self.tabs.count():
-			self.is_tab = True
-			self.setCentralWidget(self.tabs)
-		else:
-			self.centralWidget.setLayout(self.gridLayout)
+		self.is_tab = True
+		self.setCentralWidget(self.tabs)
+		self._updateVisibility_()
+
+
+	def _buildPage_(self, page, parent):
+		""" Returns the grid layout of a page with its widgets and group boxes placed according
+		to the layout plan. Widgets that only have a lazy stand-in are built inside parent.
+		"""
+		plan = self.layoutPlan
+		grid = QtWidgets.QGridLayout()
+		# One grid per mini tab of every group, plus the grid of the group box itself
+		panes = {group: [QtWidgets.QGridLayout() for pane in range(len(plan['groups'][group][6]) + 1)] for group in self.pageGroups[page]}
+
+		for index in self.pageWidgets[page]:
+			row, col, rowSpan, colSpan, _, group, pane = plan['widgets'][index]
+			self.gridLayout = grid if group is None else panes[group][pane]
+			widget = self.widgets[index]
+			if isinstance(widget, GWENLazyWidget):
+				widget = widget.build(parent)
+			# label exists then 
+			if self.labels[index]:
+				# Construct mini Vertical Layout to put label and widget in same grid
+				miniVLayout = QtWidgets.QVBoxLayout()
+				miniVLayout.addWidget(self.labels[index],alignment=QtCore.Qt.AlignCenter)
+				miniVLayout.addWidget(widget,alignment=QtCore.Qt.AlignCenter)
+				# Add newly created vertical layout to grid layout
+				self.gridLayout.addLayout(miniVLayout,row,col,rowSpan,colSpan,alignment=QtCore.Qt.AlignCenter)
+			else:
+				# Widgets that don't have any labels
+				self.gridLayout.addWidget(widget,row,col,rowSpan,colSpan,alignment=QtCore.Qt.AlignCenter)
+
+		for group in self.pageGroups[page]:
+			name, _, row, col, rowSpan, colSpan, tabs, tabsRow, tabsCol = plan['groups'][group]
+			self.groupBox = QtWidgets.QGroupBox(parent)
+			self.groupBox.setTitle(name)
+			self.groupBox.setObjectName('groupBox')
+			self.groupBox.setStyleSheet(
+				'QGroupBox#groupBox {border: 2px solid gray;' + 
+				'border-radius: 3px; padding: 10px;}' 
+			)
+			# Mini tabs share one tab widget in the group's grid
+			if tabs:
+				self.miniTabs = QtWidgets.QTabWidget(parent)
+				for pane, tabName in enumerate(tabs):
+					miniTab = QtWidgets.QWidget(parent)
+					miniTab.setLayout(panes[group][pane])
+					self.miniTabs.addTab(miniTab,tabName)
+				panes[group][-1].addWidget(self.miniTabs,tabsRow,tabsCol)
+				self.groupTabs[group] = self.miniTabs
+				self.miniTabs.currentChanged.connect(self._updateVisibility_)
+
+			self.groupBox.setLayout(panes[group][-1])
+			grid.addWidget(self.groupBox,row,col,rowSpan,colSpan)
+
+		return grid
+
+
+	def _showTab_(self, index):
+		""" Builds the widgets of a lazy tab the first time it is shown """
+		if index in self.lazyPages:
+			self.lazyPages.discard(index)
+			self.tabs.widget(index).setLayout(self._buildPage_(index, self.tabs.widget(index)))
+		self._updateVisibility_()
+
+
+	def _updateVisibility_(self):
+		""" Recomputes which widgets are hidden behind an unselected tab or mini tab, or in a
+		minimized window, and applies the deferred updates of the ones that became visible
+		"""
+		if self.layoutPlan is None:
+			return
+		hidden = set()
+		if self.deferHidden:
+			placements = self.layoutPlan['widgets']
+			minimized = self.isMinimized()
+			current = self.tabs.currentIndex() if self.is_tab else len(self.pageWidgets) - 1
+			for page, indices in enumerate(self.pageWidgets):
+				for index in indices:
+					group, pane = placements[index][5:7]
+					if minimized or page != current or (group in self.groupTabs and pane < self.groupTabs[group].count() and pane != self.groupTabs[group].currentIndex()):
+						hidden.add(self.widgets[index])
+
+		shown = self.hiddenWidgets - hidden
+		self.hiddenWidgets = hidden
+		# One catch-up render for everything that just became visible
+		if shown and len(self.deferred):
+			self.deferred.flush(shown)
+
+
+	def changeEvent(self, event):
+		""" Tracks minimizing and restoring the window """
+		super().changeEvent(event)
+		if event.type() == QtCore.QEvent.WindowStateChange:
+			self._updateVisibility_()
+
 
-		
 	#################################### Available Widgets ##############################################
 
 	def addButton(self, id, callback, dim=[1,1], label=None, horizontalAlign=False, size=[120,25], font=False):
 		""" Adds a push button to the Gui """
 		if not label: label = id
-		self.widgets.append(GWENButton(self.centralWidget, id, callback, dim, label, size, font))
 		if horizontalAlign:
-			self.labels.append(GWENLabel(self.centralWidget, ' ', dim))
+			self._build_(id, dim, lambda parent: (GWENButton(parent, id, callback, dim, label, size, font), GWENLabel(parent, ' ', dim)))
 		else:
-			self.labels.append(None)
+			self._build_(id, dim, lambda parent: (GWENButton(parent, id, callback, dim, label, size, font), None))
 
 
 	def addToggle(self, id, dim=[1,1], label=None, size=[120,20], font=False):
 		""" Adds a toggle switch to the Gui """
 		if not label: label = id
-		self.widgets.append(GWENButton(self.centralWidget, id, None, dim, label, size, font))
 		# Toggles don't get labels
-		self.labels.append(None)
+		self._build_(id, dim, lambda parent: (GWENButton(parent, id, None, dim, label, size, font), None))
 
 
-	def addLED(self, id, dim=[1,1], label=None, color=pyqt_led.Led.green, shape=pyqt_led.Led.circle):
-		""" Adds an LED indicator to the Gui """ 
+	def addLED(self, id, dim=[1,1], label=None, color=None, shape=None):
+		""" Adds an LED indicator to the Gui. Defaults to a green circle """ 
 		if not label: label = id
-		self.widgets.append(GWENLED(self.centralWidget, id, dim, label, color, shape))
-		self.labels.append(GWENLabel(self.centralWidget, label, dim, id))
+		def make(parent):
+			from GWEN_GuiLED import GWENLED
+			return GWENLED(parent, id, dim, label, GWENLED.green if color is None else color, GWENLED.circle if shape is None else shape), GWENLabel(parent, label, dim, id)
+		self._build_(id, dim, make, 'updateLED')
 		
 
 	def addCheckbox(self, id, dim=[1,1], label=None, width=120):
 		""" Adds a checkbox to the Gui """
 		if not label: label = id
-		self.widgets.append(GWENCheckBox(self.centralWidget, id, dim, label, width))
-		self.labels.append(None)
+		self._build_(id, dim, lambda parent: (GWENCheckBox(parent, id, dim, label, width), None))
 
 
 	def addRadioButton(self, id, label=None):
 		""" Adds a radio button to the Gui """
 		if not label: label = id
-		self.widgets.append(GWENRadioButton(self.centralWidget, id, label))
-		self.labels.append(None)
+		self._build_(id, [1,1], lambda parent: (GWENRadioButton(parent, id, label), None))
 
 
-	def addIndicator(self, id, default='', dim=[1,1], label=None, width=120):
-		""" Adds an indicator to the Gui """
+	def addIndicator(self, id, default='', dim=[1,1], label=None, width=120, precision=None, unit='', si=False, minInterval=0):
+		""" Adds an indicator to the Gui. Numbers are shown with precision decimals, unit and,
+		with si, an SI prefix (2500 V -> 2.50 kV). minInterval (ms) limits how often the text changes
+		"""
 		if not label: label = id
-		self.widgets.append(GWENIndicator(self.centralWidget, id, str(default), dim, label, width))
-		self.labels.append(GWENLabel(self.centralWidget, label, dim))
+		self._build_(id, dim, lambda parent: (GWENIndicator(parent, id, str(default), dim, label, width, precision, unit, si, minInterval), GWENLabel(parent, label, dim)), 'updateIndicator')
 	  
 
-	def addLogBox(self, id, dim=[2,2], label=None, size=[200,200]):
-		""" Adds a log box to the Gui """
+	def addLogBox(self, id, dim=[2,2], label=None, size=[200,200], maxLines=10000, batchInterval=16):
+		""" Adds a log box to the Gui. Keeps the last maxLines lines (0 for no limit) and appends
+		messages in batches every batchInterval ms (None appends every message right away)
+		"""
 		if not label: label = id
-		self.widgets.append(GWENLoggingBox(self.centralWidget, id, dim, label, size))
-		self.labels.append(GWENLabel(self.centralWidget, label, dim))
+		self._build_(id, dim, lambda parent: (GWENLoggingBox(parent, id, dim, label, size, maxLines, batchInterval), GWENLabel(parent, label, dim)), 'updateLog', maxLines)
+
+
+	def addLogHandler(self, id, logger=None, level=logging.NOTSET, format=None):
+		""" Routes Python logging records into log box id. Attaches to the root logger unless
+		a logger (or logger name) is given. Returns the handler
+		"""
+		handler = GWENLogHandler(self.getWidget(id, GWENLoggingBox), level)
+		if format:
+			handler.setFormatter(logging.Formatter(format))
+		if not isinstance(logger, logging.Logger):
+			logger = logging.getLogger(logger)
+		logger.addHandler(handler)
+		return handler
 
 
 	def addInputBox(self, id, default=None, dim=[1,1], label=None, width=120):
@@ -414,49 +372,42 @@ class GWENGui(QtWidgets.QMainWindow):
 				default = str(default)
 		except:
 			default = str(default)
-		self.widgets.append(GWENUserInput(self.centralWidget, id, default, dim, label, width))
-		self.labels.append(GWENLabel(self.centralWidget, label, dim, id))
+		self._build_(id, dim, lambda parent: (GWENUserInput(parent, id, default, dim, label, width), GWENLabel(parent, label, dim, id)))
 
 
 	def addTextBox(self, id, dim=[1,1], label=None):
 		""" Adds a text box to the Gui """
-		self.widgets.append(GWENTextBox(self.centralWidget, id, default, dim, label))
-		self.labels.append(GWENLabel(self, label, dim))
+		self._build_(id, [1,1], lambda parent: (GWENTextBox(parent, id, default, dim, label), GWENLabel(self, label, dim)))
 
 
 	def addSpinBox(self, id, default=0, dim=[1,1], label=None):
 		""" Adds a spin box to the Gui """
 		if not label: label = id
-		self.widgets.append(GWENSpinBox(self.centralWidget, id, default, dim, label))
-		self.labels.append(GWENLabel(self, label, dim))
+		self._build_(id, dim, lambda parent: (GWENSpinBox(parent, id, default, dim, label), GWENLabel(self, label, dim)))
 
 
 	def addSlider(self, id, lower=0, upper=100, dim=[1,1], label=None):
 		""" Adds a slider to the Gui """
-		self.widgets.append(GWENSlider(self.centralWidget, id, default, dim, label))
-		self.labels.append(GWENLabel(self, label, dim))
+		self._build_(id, [1,1], lambda parent: (GWENSlider(parent, id, default, dim, label), GWENLabel(self, label, dim)))
 
 
 	def addComboBox(self, id, items, dim=[1,1], label=None, width=120):
 		""" Adds a combo box to the Gui """
 		if not label: label = id
-		self.widgets.append(GWENComboBox(self.centralWidget, id, items, dim, label, width))
-		self.labels.append(GWENLabel(self, label, dim))
+		self._build_(id, dim, lambda parent: (GWENComboBox(parent, id, items, dim, label, width), GWENLabel(self, label, dim)))
 
 
 	def addLabel(self, label=None, dim=[1,1], id=None):
 		""" Adds a label to the Gui """
 		if not label: label = id
-		self.widgets.append(GWENLabel(self.centralWidget, label, dim, id))
 		# Labels don't get labels
-		self.labels.append(None)
+		self._build_(id, dim, lambda parent: (GWENLabel(parent, label, dim, id), None))
 
 
 	def addSpace(self):
 		""" Adds a blank space to the Gui """
-		self.widgets.append(GWENLabel(self.centralWidget, dim=[1,1], label=''))
 		# Plots don't get labels
-		self.labels.append(None)
+		self._build_(None, [1,1], lambda parent: (GWENLabel(parent, dim=[1,1], label=''), None))
 
 
 	def addFileBox(self, id, filetypes=None, path=None):
@@ -465,13 +416,18 @@ class GWENGui(QtWidgets.QMainWindow):
 			parent = self.tabs
 		else:
 			parent = self.centralWidget
-		self.widgets.append(GWENFileDialog(parent, id, filetypes, path, dim=[1,1]))
 		# File Boxs don't get labels
-		self.labels.append(None)
+		self._register_(GWENFileDialog(parent, id, filetypes, path, dim=[1,1]))
 
 
-	def addTable():
-		pass
+	def addTable(self, id, columns, dim=[4,4], label=None, size=[400,300], formats=None, sortable=True):
+		""" Adds a table to the Gui. columns is a list of names (float64 columns), of (name, dtype)
+		or a structured dtype; formats maps column names to a format string or function. Rows
+		are added with updateTable and columns overwritten with updateTableColumn. Only the
+		visible cells are formatted, so the row count does not slow down scrolling or updates
+		"""
+		if not label: label = id
+		self._build_(id, dim, lambda parent: (GWENTable(parent, id, columns, dim, label, size, formats, sortable), GWENLabel(parent, label, dim)), 'updateTable')
 
 
 	def addMenuBar():
@@ -480,30 +436,58 @@ class GWENGui(QtWidgets.QMainWindow):
 
 	def addImage(self, id, image, size=[100,100], dim=[1,1]):
 		""" Adds an image to the Gui """
-		self.widgets.append(GWENImage(self.centralWidget, id, image, size, dim))
 		# Images don't get labels
-		self.labels.append(None)
+		self._build_(id, dim, lambda parent: (GWENImage(parent, id, image, size, dim), None))
 
 
-	def addPlot(self, id, numCurves, labels, color=None):
-		""" Adds a plot to the Gui """
-		self.widgets.append(GWENPlot(self.centralWidget, id, numCurves, labels, color)) 
-		# Plots don't get labels
-		self.labels.append(None)
+	def addPlot(self, id, numCurves, labels, color=None, capacity=None, decimate=False, skipFiniteCheck=False, connect='auto', xRange=None, yRange=None):
+		""" Adds a plot to the Gui. Passing a capacity creates a streaming plot that keeps
+		the last "capacity" samples per curve and is fed through appendData(). With decimate,
+		large curves are reduced to a min/max pair per pixel of the visible range.
+		For data known to be finite, skipFiniteCheck=True with connect='all' and fixed
+		xRange/yRange (min, max) make updates skip every scan of the data (see GWENPlot.setOptions)
+		"""
+		def make(parent):
+			from GWEN_GuiPlots import GWENPlot
+			return GWENPlot(parent, id, numCurves, labels, color, capacity, decimate, skipFiniteCheck, connect, xRange, yRange), None
+		# Plots don't get labels. GWENPlot is always 4x4
+		self._build_(id, [4,4], make, 'appendData' if capacity else 'updatePlot', capacity)
 
 
-	def addStackPlot(self, id, numPlots, numCurves, dim, labels):
-		""" Adds a stack plot to the Gui """
-		self.widgets.append(GWENPlot(self.centralWidget))
+	def addStackPlot(self, id, numPlots, numCurves, dim=[4,4], labels=['','x','y']):
+		""" Adds a stack plot to the Gui: numPlots rows with a shared x axis, numCurves
+		channels per row, all updated at once with updateStackPlot. labels is [title,
+		x label, y label] where the y label can be a list with one label per row
+		"""
+		def make(parent):
+			from GWEN_GuiPlots import GWENStackPlot
+			return GWENStackPlot(parent, id, numPlots, numCurves, dim, labels), None
 		# Plots don't get labels
-		self.labels.append(None)
+		self._build_(id, dim, make, 'updateStackPlot')
+
+
+	def addFrameView(self, id, dim=[4,4], levels=None, colormap=None, percentiles=(1, 99), levelsInterval=10, size=[350,350], showFPS=True):
+		""" Adds a view for streamed image frames (NumPy arrays), fed with updateFrame. levels
+		fixes the (low, high) display range, by default it follows the given percentiles of
+		the frames, recomputed every levelsInterval frames. colormap is a pyqtgraph colormap
+		name (ie. 'viridis') for single-channel frames. showFPS shows the measured frame rate
+		"""
+		def make(parent):
+			from GWEN_GuiPlots import GWENFrameView
+			return GWENFrameView(parent, id, dim, levels, colormap, percentiles, levelsInterval, size, showFPS), None
+		# Frame views don't get labels
+		self._build_(id, dim, make, 'updateFrame')
 
 
-	def addMatplotlibPlot(self, id, plot_labels=['','x','y'], legend=True, dim=[4,4]):
-		""" Adds a matplotlib imshow feature """
-		self.widgets.append(GWENMatplotlibPlot(self.centralWidget, id, plot_labels, legend, dim))
+	def addMatplotlibPlot(self, id, plot_labels=['','x','y'], legend=True, dim=[4,4], blit=True):
+		""" Adds a matplotlib imshow feature. With blit, updates only redraw the lines on top
+		of a cached background
+		"""
+		def make(parent):
+			from GWEN_GuiMatplotlib import GWENMatplotlibPlot
+			return GWENMatplotlibPlot(parent, id, plot_labels, legend, dim, blit), None
 		# Plots don't get labels
-		self.labels.append(None)
+		self._build_(id, dim, make, 'updateMatPlot')
 
 
 	################################### Setter Slot Functions ##########################################
@@ -514,13 +498,11 @@ class GWENGui(QtWidgets.QMainWindow):
 		indicator = self.getWidget(id)
 		# Allows an indicator to be made uneditable 
 		if freeze:
-			setattr(indicator, 'frozen', True)
-		try: 
-			if indicator.frozen == True:
-				return
-		except: pass
+			indicator.frozen = True
+		if getattr(indicator, 'frozen', False):
+			return
 		# Once found, set the Indicator 
-		indicator.setText(str(output))
+		self._post_(indicator, self._setIndicator_, output)
 
 
 	@QtCore.pyqtSlot()
@@ -528,23 +510,66 @@ class GWENGui(QtWidgets.QMainWindow):
 		# Searches for Gui Object given an ID
 		logBox = self.getWidget(id)
 		# Once found, append the message
-		logBox.append(str(message))
+		self._postQueued_(logBox, self._appendLog_, str(message))
 
 
 	@QtCore.pyqtSlot()
 	def updatePlot(self, id, x_data, *y_data):
+		# y_data is one array per curve or a single 2D array with one row per curve. NumPy
+		# float arrays are passed through untouched, see GWENPlot.updatePlot
 		# Searches for Gui Object given an ID
 		plot = self.getWidget(id)
 		# Once found, set the Indicator 
-		plot.updatePlot(x_data,*y_data)
+		self._post_(plot, self._setPlot_, x_data, *y_data)
 
 
 	@QtCore.pyqtSlot()
-	def updateMatPlot(self, id, y_data):
+	def appendData(self, id, x_chunk, *y_chunks):
 		# Searches for Gui Object given an ID
 		plot = self.getWidget(id)
-		# Once found, set the Indicator 
-		plot._update_canvas_(y_data)
+		# Samples always go straight into the ring buffers, only the redraw is paced
+		plot.appendData(x_chunk, *y_chunks, redraw=False)
+		self._post_(plot, self._redrawPlot_)
+
+
+	@QtCore.pyqtSlot()
+	def updateStackPlot(self, id, x_data, y_data, finite=None):
+		# Searches for Gui Object given an ID. y_data is (channels, samples), finite=True
+		# skips the NaN/inf check for data known to be finite (see GWENStackPlot)
+		plot = self.getWidget(id)
+		self._post_(plot, self._setStackPlot_, x_data, y_data, finite)
+
+
+	@QtCore.pyqtSlot()
+	def updateFrame(self, id, frame):
+		# Searches for Gui Object given an ID. Only the newest frame is drawn when they come faster
+		view = self.getWidget(id)
+		self._post_(view, self._setFrame_, frame)
+
+
+	@QtCore.pyqtSlot()
+	def updateTable(self, id, rows):
+		# Searches for Gui Object given an ID. rows is a structured array, a dict of columns
+		# or a list of tuples; every batch is kept, batches of one frame are appended at once
+		table = self.getWidget(id)
+		self._postQueued_(table, self._appendTable_, rows)
+
+
+	@QtCore.pyqtSlot()
+	def updateTableColumn(self, id, column, values, start=0):
+		# Searches for Gui Object given an ID. Overwrites column from row start on
+		table = self.getWidget(id)
+		self._postQueued_(table, self._setTableColumn_, (column, values, start))
+
+
+	@QtCore.pyqtSlot()
+	def updateMatPlot(self, id, x_data, y_data=None, data_labels=None):
+		# Searches for Gui Object given an ID. With a single data argument it is plotted against its index
+		plot = self.getWidget(id)
+		if y_data is None:
+			x_data, y_data = None, x_data
+		# Once found, update the lines (only the lines are redrawn)
+		self._post_(plot, self._setMatPlot_, x_data, y_data, data_labels)
 
 
 	@QtCore.pyqtSlot()
@@ -552,6 +577,335 @@ class GWENGui(QtWidgets.QMainWindow):
 		# Searches for Gui Object given an ID
 		led = self.getWidget(id)
 		# Once found, set the LED
+		self._post_(led, self._setLED_, set)
+
+
+	@QtCore.pyqtSlot()
+	def updateWidget(self, id, payload):
+		""" Generic setter. Forwards payload to the update slot of the widget's type
+		(updateIndicator, updateLog, updatePlot, ...). A tuple payload is passed as
+		positional arguments, ie. (x, y1, y2) for a plot.
+		"""
+		widget = self.getWidget(id)
+		slot = getattr(self, widget.updateSlot)
+		if isinstance(payload, tuple):
+			slot(widget, *payload)
+		else:
+			slot(widget, payload)
+
+
+	################################### Update Scheduling ##############################################
+
+	def enableScheduler(self, interval=16):
+		""" Turns on frame-paced updates. From now on the update slots only record the latest
+		value per widget (log lines are queued) and every dirty widget is redrawn once per
+		"interval" ms from a single QTimer.
+		"""
+		if self.scheduler is None:
+			self.scheduler = GWENScheduler(self, interval)
+		self.scheduler.start(interval)
+
+
+	def disableScheduler(self):
+		""" Turns off frame-paced updates after applying everything still pending """
+		if self.scheduler is not None:
+			self.scheduler.stop()
+			self.scheduler.deleteLater()
+			self.scheduler = None
+
+
+	def schedulerStats(self):
+		""" Returns the scheduler counters (posted, applied, coalesced, frames, ...) or None if off """
+		if self.scheduler is not None:
+			return self.scheduler.stats()
+
+
+	def enableProducerQueue(self, maxSize=10000, policy='drop-oldest', batchSize=500, timeout=None):
+		""" Creates the queue worker threads use to feed the Gui (call from the GUI thread).
+		Producers then call pushUpdate(id, payload) from any thread; see GWENProducerQueue
+		for the back-pressure policies ('drop-oldest', 'drop-newest', 'block').
+		"""
+		if self.producerQueue is None:
+			self.producerQueue = GWENProducerQueue(self, maxSize, policy, batchSize, timeout)
+		return self.producerQueue
+
+
+	def pushUpdate(self, id, payload):
+		""" Thread-safe version of updateWidget. The update is applied by the GUI thread.
+		The queue is created on first use from the GUI thread, worker threads need
+		enableProducerQueue to have been called first
+		"""
+		if self.producerQueue is None:
+			# The queue is a QObject, it must belong to the GUI thread
+			if QtCore.QThread.currentThread() != self.thread():
+				raise RuntimeError('pushUpdate called from a worker thread before the producer queue exists. Call enableProducerQueue() from the GUI thread first.')
+			self.enableProducerQueue()
+		return self.producerQueue.push(id, payload)
+
+
+	def producerStats(self):
+		""" Returns the producer queue counters (depth, dropped, ...) or None if off """
+		if self.producerQueue is not None:
+			return self.producerQueue.stats()
+
+
+	def addSerialSource(self, port, framer=None, decoder=None, baudrate=115200, interval=0.02, **kwargs):
+		""" Opens a serial port (name or pyserial URL such as loop://) read by a background thread.
+		Defaults to comma separated text lines with a single channel 'value'. Bind channels to
+		widgets with source.bind(id, channels) and call source.start(). Returns the source
+		"""
+		from GWEN_Serial import GWENSerialSource, GWENLineFramer, GWENTextDecoder
+		if framer is None: framer = GWENLineFramer()
+		if decoder is None: decoder = GWENTextDecoder(['value'])
+		source = GWENSerialSource(self, port, framer, decoder, baudrate, interval, **kwargs)
+		self.serialSources.append(source)
+		return source
+
+
+	def startRecording(self, path, maxFileSize=256*2**20, maxMemory=64*2**20, allowPickle=False):
+		""" Records every update slot call to path (binary, see GWEN_Recorder) until
+		stopRecording. Files rotate every maxFileSize bytes. Arguments other than numbers,
+		strings, arrays, lists, tuples and dicts are only recorded (pickled) with allowPickle.
+		Returns the recorder
+		"""
+		from GWEN_Recorder import GWENRecorder
+		self.stopRecording()
+		self.recorder = GWENRecorder(self, path, maxFileSize, maxMemory, allowPickle=allowPickle)
+		self.recorder.start()
+		return self.recorder
+
+
+	def stopRecording(self):
+		""" Stops recording and waits for the pending records to be written. Returns the recorder stats """
+		if self.recorder is not None:
+			self.recorder.stop()
+			stats = self.recorder.stats()
+			self.recorder = None
+			return stats
+
+
+	def enableProfiler(self, statusBar=False, statusInterval=1000, traceCapacity=100000):
+		""" Starts timing update slots, button callbacks, createLayout and plot painting
+		(see GWEN_Profiler). With statusBar, a summary is shown every statusInterval ms.
+		Nothing is timed, and nothing costs anything, until this is called. Returns the profiler
+		"""
+		from GWEN_Profiler import GWENProfiler
+		self.disableProfiler()
+		self.profiler = GWENProfiler(self, traceCapacity)
+		self.profiler.start(statusInterval if statusBar else None)
+		return self.profiler
+
+
+	def disableProfiler(self):
+		""" Stops profiling. Returns the profiler, which keeps what it measured """
+		profiler, self.profiler = self.profiler, None
+		if profiler is not None:
+			profiler.stop()
+		return profiler
+
+
+	def enableWatchdog(self, threshold=0.1, interval=10, capacity=100, statusBar=True):
+		""" Watches the event loop for stalls longer than threshold seconds (see GWEN_Watchdog).
+		Each stall keeps the GUI thread stack and the widget whose callback or update was running.
+		With statusBar, stalls are reported in the status bar. Returns the watchdog
+		"""
+		from GWEN_Watchdog import GWENWatchdog
+		self.disableWatchdog()
+		self.watchdog = GWENWatchdog(self, threshold, interval, capacity)
+		if statusBar:
+			self.watchdog.stalled.connect(self._showStall_)
+		self.watchdog.start()
+		return self.watchdog
+
+
+	def disableWatchdog(self):
+		""" Stops the watchdog. Returns it, with the stalls it recorded """
+		watchdog, self.watchdog = self.watchdog, None
+		if watchdog is not None:
+			watchdog.stop()
+		return watchdog
+
+
+	def _showStall_(self, stall):
+		where = ' in {} {}'.format(stall['activity'], stall['widget']) if stall['widget'] is not None else ''
+		self.statusBar().showMessage('GUI stalled for {:.2f} s{}.'.format(stall['duration'], where))
+
+
+	def addSlotWrapper(self, wrap, names):
+		""" Replaces each method in names with wrap(method, name) on this instance, on top of
+		the wrappers already added. Used by the recorder and the profiler
+		"""
+		self.slotWrappers.append((wrap, tuple(names)))
+		self._wrapSlots_()
+
+
+	def removeSlotWrapper(self, wrap):
+		""" Removes a wrapper added by addSlotWrapper, keeping the others """
+		self.slotWrappers = [(other, names) for other, names in self.slotWrappers if other != wrap]
+		self._wrapSlots_()
+
+
+	def _wrapSlots_(self):
+		""" Rebuilds the wrapped slots from the class methods and self.slotWrappers """
+		for name in self.wrappedSlots:
+			# Removing the instance attribute uncovers the class method again
+			delattr(self, name)
+		self.wrappedSlots = set()
+		for wrap, names in self.slotWrappers:
+			for name in names:
+				if hasattr(self, name):
+					setattr(self, name, wrap(getattr(self, name), name))
+					self.wrappedSlots.add(name)
+
+
+	def addCallbackHook(self, begin, end):
+		""" Calls begin(button) and end(button) around the callback of every button added with
+		one. Used by the profiler and the watchdog
+		"""
+		self.callbackHooks.append((begin, end))
+		for widget in self.widgets:
+			self._hookButton_(widget)
+
+
+	def removeCallbackHook(self, begin, end):
+		""" Removes hooks added by addCallbackHook. Buttons are reconnected as added once none are left """
+		self.callbackHooks.remove((begin, end))
+		if not self.callbackHooks:
+			for button, (before, after) in self.hookedButtons.items():
+				button.clicked.disconnect(before)
+				button.clicked.disconnect(after)
+			self.hookedButtons = dict()
+
+
+	def _hookButton_(self, button):
+		""" Connects the callback hooks around the callback of button """
+		# Lazy stand-ins are hooked by _built_ once built, asking them for callback would build them
+		if isinstance(button, GWENLazyWidget) or not getattr(button, 'callback', None) or button in self.hookedButtons:
+			return
+		def before(*args):
+			for begin, end in self.callbackHooks:
+				begin(button)
+		def after(*args):
+			for begin, end in reversed(self.callbackHooks):
+				end(button)
+		# Slots run in connection order, so reconnect the callback between the two
+		try:
+			button.clicked.disconnect(button.callback)
+		except TypeError:
+			# Disconnected elsewhere by the user, leave it alone
+			return
+		button.clicked.connect(before)
+		button.clicked.connect(button.callback)
+		button.clicked.connect(after)
+		self.hookedButtons[button] = (before, after)
+
+
+	def startReplay(self, path, speed=1.0, start=0.0, allowPickle=False):
+		""" Plays a recording (see startRecording) back into this Gui, which must hold the same
+		panel. speed 0 plays as fast as possible. Call after launch or createLayout. Only pass
+		allowPickle for trusted recordings made with it. Returns the GWENReplay, which has
+		pause, seek and setSpeed
+		"""
+		from GWEN_Replay import GWENReplay
+		replay = GWENReplay(self, path, speed, allowPickle=allowPickle)
+		if start:
+			replay.seek(start)
+		replay.play()
+		return replay
+
+
+	def closeEvent(self, event):
+		""" Stops the serial readers, the recorder, the profiler and the watchdog before the window goes away """
+		for source in self.serialSources:
+			source.stop()
+		self.stopRecording()
+		self.disableProfiler()
+		self.disableWatchdog()
+		super().closeEvent(event)
+
+
+	def _post_(self, widget, apply, *args):
+		""" Runs apply(widget, *args) now, or on the next frame if the scheduler is on.
+		Hidden widgets only keep the latest value until they are shown
+		"""
+		if isinstance(widget, GWENLazyWidget):
+			# Not built yet, keep the latest value until its tab is shown
+			if widget.target is None:
+				widget.post(apply, *args)
+				return
+			widget = widget.target
+		if widget in self.hiddenWidgets:
+			self.deferred.post(widget, apply, *args)
+		elif self.scheduler is None:
+			apply(widget, *args)
+		else:
+			self.scheduler.post(widget, apply, *args)
+
+
+	def _postQueued_(self, widget, apply, item):
+		""" Runs apply(widget, [item]) now, or batched with other items on the next frame """
+		if isinstance(widget, GWENLazyWidget):
+			if widget.target is None:
+				widget.postQueued(apply, item)
+				return
+			widget = widget.target
+		if widget in self.hiddenWidgets:
+			self.deferred.postQueued(widget, apply, item, getattr(widget, 'maxLines', None))
+		elif self.scheduler is None:
+			apply(widget, [item])
+		else:
+			self.scheduler.postQueued(widget, apply, item)
+
+
+	def _setIndicator_(self, indicator, output):
+		if isinstance(indicator, GWENIndicator):
+			indicator.setValue(output)
+		else:
+			indicator.setText(str(output))
+
+
+	def _appendLog_(self, logBox, messages):
+		# The scheduler already batches per frame, otherwise let the box batch them
+		if self.scheduler is None:
+			logBox.queueLines(messages)
+		else:
+			logBox.appendLines(messages)
+
+
+	def _setPlot_(self, plot, x_data, *y_data):
+		plot.updatePlot(x_data,*y_data)
+
+
+	def _setStackPlot_(self, plot, x_data, y_data, finite):
+		plot.updateStackPlot(x_data, y_data, finite)
+
+
+	def _setFrame_(self, view, frame):
+		view.updateFrame(frame)
+
+
+	def _appendTable_(self, table, batches):
+		model = table.model()
+		if len(batches) > 1:
+			# One insert for the frame instead of one per batch
+			batches = [np.concatenate([model.toRecords(batch) for batch in batches])]
+		model.appendRows(batches[0])
+
+
+	def _setTableColumn_(self, table, updates):
+		for column, values, start in updates:
+			table.model().updateColumn(column, values, start)
+
+
+	def _redrawPlot_(self, plot):
+		plot.redraw()
+
+
+	def _setMatPlot_(self, plot, x_data, y_data, data_labels):
+		plot.updatePlot(x_data, y_data, data_labels)
+
+
+	def _setLED_(self, led, set):
 		if set: led.toggleOn()
 		else: led.toggleOff()
 
@@ -562,7 +916,7 @@ class GWENGui(QtWidgets.QMainWindow):
 	def getInt(self, id):
 		""" Returns an int from text box, spinbox, or slider widget """
 		# See if id matches widget in database
-		widget = self.getWidget(id)
+		widget = self._readWidget_(id)
 		try: return int(widget.value())
 		except ValueError:
 			print('')
@@ -572,7 +926,7 @@ class GWENGui(QtWidgets.QMainWindow):
 	def getFloat(self, id):
 		""" Returns value of Float """
 		# See if id matches widget in database
-		widget = self.getWidget(id)
+		widget = self._readWidget_(id)
 		try: return float(widget.value())
 		except ValueError:
 			print('')
@@ -582,7 +936,7 @@ class GWENGui(QtWidgets.QMainWindow):
 	def getBool(self, id):
 		""" Returns value of Boolean """
 		# See if id matches widget in database
-		widget = self.getWidget(id)
+		widget = self._readWidget_(id)
 		try: return widget.value()
 		except ValueError:
 			print('')
@@ -592,28 +946,112 @@ class GWENGui(QtWidgets.QMainWindow):
 	def getString(self, id):
 		""" Returns a string """
 		# See if id matches widget in database
-		widget = self.getWidget(id)
+		widget = self._readWidget_(id)
 
 		try: return str(widget.value())
 		except ValueError:
 			print('')
 	
 
-	def getWidget(self, id):
-		for widget in self.widgets:
-			if widget.id == id:
-				return widget
+	def _readWidget_(self, id):
+		""" Returns widget id after applying the updates still waiting for it (hidden tab
+		or next frame), so getters read the newest value
+		"""
+		widget = self.getWidget(id)
+		if len(self.deferred):
+			self.deferred.flush({widget})
+		if self.scheduler is not None and len(self.scheduler.queue):
+			self.scheduler.queue.flush({widget})
+		return widget
+
+
+	def getWidget(self, id, widgetType=None):
+		""" Returns the widget registered under id, or None if no such widget exists.
+		A handle from getHandle() may be passed in place of the id. If widgetType is given
+		the widget must be an instance of it, otherwise a TypeError is raised.
+		Widgets on tabs that were not shown yet (lazyTabs) are returned as a GWENLazyWidget
+		that buffers updates; it is built when any other attribute is used or a widgetType is given.
+		"""
+		if isinstance(id, (QtWidgets.QWidget, GWENLazyWidget)):
+			widget = id
 		else:
-			pass
-	
+			widget = self.widgetIndex.get(id)
+		if isinstance(widget, GWENLazyWidget):
+			if widgetType is not None:
+				widget.build()
+			if widget.target is not None:
+				widget = widget.target
+		if widgetType is not None and widget is not None and not isinstance(widget, widgetType):
+			raise TypeError('Widget {} is a {}, not a {}.'.format(widget.id, type(widget).__name__, widgetType.__name__))
+		return widget
+
+
+	def getHandle(self, id, widgetType=None):
+		""" Resolves an id once and returns the widget itself. The handle can be passed
+		to every setter/getter slot in place of the id to skip the registry lookup.
+		"""
+		widget = self.getWidget(id, widgetType)
+		if widget is None:
+			raise KeyError('No widget with id {} exists.'.format(id))
+		return widget
+
 
 	def getLabel(self, id):
-		for label in self.labels:
-			if label:
-				if label.id == id:
-					return label
+		""" Returns the label registered under id, or None if no such label exists """
+		label = self.labelIndex.get(id)
+		widget = self.widgetIndex.get(id)
+		# Labels of widgets that are not built yet do not exist either
+		if label is None and isinstance(widget, GWENLazyWidget) and widget.target is None:
+			widget.build()
+			label = self.labelIndex.get(id)
+		return label
+
+
+	def _register_(self, widget, label=None):
+		""" Adds a widget and its (optional) label to the Gui and indexes both by id.
+		Every addWidget function goes through here so the registry never goes stale.
+		"""
+		# Ids must be unique, otherwise lookups would silently return the wrong widget
+		if widget.id is not None:
+			if widget.id in self.widgetIndex:
+				raise ValueError('Widget id {} is already in use.'.format(widget.id))
+			self.widgetIndex[widget.id] = widget
+		if label is not None and label.id is not None:
+			self.labelIndex[label.id] = label
+
+		self.widgets.append(widget)
+		self.labels.append(label)
+
+
+	def _build_(self, id, dim, make, updateSlot=None, capacity=None):
+		""" Creates and registers the widget and label returned by make(parent). In lazyTabs
+		mode, widgets on a tab after the first only get a GWENLazyWidget stand-in; updateSlot
+		and capacity tell it how to route and how much to buffer until the widget is built.
+		"""
+		if self.lazyTabs and self.page:
+			standIn = GWENLazyWidget(id, dim, make, updateSlot, capacity)
+			standIn.index = len(self.widgets)
+			standIn.onBuild = self._built_
+			# Built like the other widgets when it is used before its tab is shown
+			standIn.buildParent = self.centralWidget
+			self._register_(standIn)
 		else:
-			pass
+			self._register_(*make(self.centralWidget))
+
+
+	def _built_(self, standIn):
+		""" Swaps a stand-in for the widget and label it just built """
+		widget, label = standIn.target, standIn.targetLabel
+		self.widgets[standIn.index] = widget
+		self.labels[standIn.index] = label
+		if widget.id is not None:
+			self.widgetIndex[widget.id] = widget
+		if label is not None and label.id is not None:
+			self.labelIndex[label.id] = label
+		if self.callbackHooks:
+			self._hookButton_(widget)
+		if self.profiler is not None:
+			self.profiler.watch(widget)
 
 
 	def getSender(self):
@@ -659,6 +1097,8 @@ class GWENGui(QtWidgets.QMainWindow):
 	def makeTab(self, name):
 		""" This call will form all previous widgets into a tab and create a new tab """
 		self.divies.append(GWENDivies('makeTab',name=name))
+		if not self.mini:
+			self.page += 1
 
 
 	def startGroup(self, name):
@@ -666,8 +1106,10 @@ class GWENGui(QtWidgets.QMainWindow):
 		Will add widgets in the same layout until the endGroup func is called.
 		"""
 		self.divies.append(GWENDivies('startGroup',name=name))
+		self.mini = True
 
 
 	def endGroup(self, size=None):
 		""" Closing function of a group box. """
-		self.divies.append(GWENDivies('endGroup',size))
\ No newline at end of file
+		self.divies.append(GWENDivies('endGroup',size))
+		self.mini = False
\ No newline at end of file
@@ -0,0 +1,57 @@
+#   .d8888b.  888       888 8888888888 888b    888 
+#  d88P  Y88b 888   o   888 888        8888b   888 
+#  888    888 888  d8b  888 888        88888b  888 
+#  888        888 d888b 888 8888888    888Y88b 888 
+#  888  88888 888d88888b888 888        888 Y88b888 
+#  888    888 88888P Y88888 888        888  Y88888 
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888 
+#   "Y8888P88 888P     Y888 8888888888 888    Y888 
+#                                                                 
+# GWEN_GuiLED.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+# 
+# https://github.com/krkung/GWEN
+#
+# LED widget built on pyqt_led. Kept out of GWEN_GuiObjects.py so pyqt_led is only
+# imported when GWENGui.addLED is first called.
+#
+# Dependencies
+from GWEN_GuiObjects import importBackend
+
+pyqt_led = importBackend('pyqt_led')
+
+
+class GWENLED(pyqt_led.Led):
+	""" Class used to create a PyQt LED """
+	# GWENGui slot used by updateWidget
+	updateSlot = 'updateLED'
+
+	def __init__(self, parent, id, dim, label, color, shape):
+		# Call parent constructor
+		super().__init__(parent, on_color=color, shape=shape)
+
+		self.id = id
+		self.dim = dim
+		self.label = label
+
+		# Default size
+		self.setFixedSize(35,35)
+
+
+	def toggleOn(self):
+		""" Toggle LED on """
+		self._toggle_on()
+
+
+	def toggleOff(self):
+		""" Toggle LED off """
+		self._toggle_off()
+
+
+	def value(self):
+		""" Returns true if on """
+		if self.is_on():
+			return True
+		else:
+			return False
@@ -0,0 +1,248 @@
+#   .d8888b.  888       888 8888888888 888b    888 
+#  d88P  Y88b 888   o   888 888        8888b   888 
+#  888    888 888  d8b  888 888        88888b  888 
+#  888        888 d888b 888 8888888    888Y88b 888 
+#  888  88888 888d88888b888 888        888 Y88b888 
+#  888    888 88888P Y88888 888        888  Y88888 
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888 
+#   "Y8888P88 888P     Y888 8888888888 888    Y888 
+#                                                                 
+# GWEN_GuiMatplotlib.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+# 
+# https://github.com/krkung/GWEN
+#
+# Matplotlib plot widget. Kept out of GWEN_GuiObjects.py so matplotlib is only imported
+# when GWENGui.addMatplotlibPlot is first called. The figure is created without pyplot, so
+# GWEN neither loads pyplot nor changes the pyplot backend.
+#
+# Dependencies
+import time
+import collections
+import numpy as np
+from PyQt5 import QtWidgets
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT as NavigationToolbar
+
+
+# Frame rate a streaming GWENMatplotlibPlot must sustain with blitting on
+# (4 curves x 1000 points, measured by GWEN_Benchmark.py)
+target_fps = 30
+
+
+class GWENMatplotlibPlot(QtWidgets.QWidget):
+	""" Class to generate and update a matplotlib plot """ 
+	""" THIS IS CALLED IN GWENGui_Engine NOT GWENMatplotlibFig """
+	# GWENGui slot used by updateWidget
+	updateSlot = 'updateMatPlot'
+
+	def __init__(self, parent, id, labels, legend, dim, blit=True):
+		super().__init__(parent)
+		self.id = id
+		self.dim = dim
+		self.matplotlibFig = self.GWENMatplotlibFig(labels, legend)
+
+		# Lines are created once and then only updated with set_data
+		self.lines = []
+		self.dataLabels = None
+		self.showLegend = legend
+
+		# With blitting, only the lines are redrawn on top of a cached background
+		self.blit = blit
+		self.background = None
+		self.matplotlibFig.mpl_connect('draw_event', self._onDraw_)
+
+		# Time of the last updates, used by fps()
+		self.frameTimes = collections.deque(maxlen=60)
+
+		# Create layout combining axes and toolbar
+		toolbar = NavigationToolbar(self.matplotlibFig, parent)
+		layout = QtWidgets.QVBoxLayout()
+		layout.addWidget(toolbar)
+		layout.addWidget(self.matplotlibFig)
+		self.setLayout(layout)
+
+	def updatePlot(self, x, y, data_labels=None):
+		"""
+		@x ---> List or list of lists for x-axis data (or 2D numpy array of x_data). None plots against sample index
+		@y ---> List or list of lists for y-axis data (or 2D numpy array, one curve per row)
+		@data_labels --> If more than one function is being plotted, supply a list of labels
+		"""
+		self.frameTimes.append(time.perf_counter())
+		curves = self._curves_(x, y)
+		axes = self.matplotlibFig.axes
+
+		# New set of curves: (re)create the lines, legend and limits once
+		if len(curves) != len(self.lines) or data_labels != self.dataLabels:
+			for line in self.lines:
+				line.remove()
+			self.lines = []
+			for index,(_x,_y) in enumerate(curves):
+				label = data_labels[index] if data_labels else None
+				self.lines.extend(axes.plot(_x, _y, label=label, animated=self.blit))
+			self.dataLabels = data_labels
+			if self.showLegend and data_labels:
+				axes.legend()
+			self._fitLimits_(curves, force=True)
+			self.matplotlibFig.draw()
+			return
+
+		for line,(_x,_y) in zip(self.lines, curves):
+			line.set_data(_x, _y)
+
+		# Limits only change (and force a full redraw) when the data leaves the view
+		if self._fitLimits_(curves) or not self.blit or self.background is None:
+			self.matplotlibFig.draw()
+			return
+
+		# Blit: restore the cached background and draw only the lines on top
+		canvas = self.matplotlibFig
+		canvas.restore_region(self.background)
+		for line in self.lines:
+			axes.draw_artist(line)
+		canvas.blit(axes.bbox)
+
+
+	def fps(self):
+		""" Returns the update rate over the last (up to 60) updatePlot calls """
+		if len(self.frameTimes) < 2:
+			return 0.0
+		elapsed = self.frameTimes[-1] - self.frameTimes[0]
+		return (len(self.frameTimes) - 1)/elapsed if elapsed > 0 else 0.0
+
+
+	def _curves_(self, x, y):
+		""" Normalizes the updatePlot arguments into a list of (x, y) pairs """
+		# One curve per row/sub-list of y
+		if np.ndim(y[0]) > 0:
+			ys = list(y)
+			if x is None:
+				xs = [np.arange(len(_y)) for _y in ys]
+			elif np.ndim(x[0]) > 0:
+				xs = list(x)
+			else:
+				xs = [x]*len(ys)
+		else:
+			ys = [y]
+			xs = [np.arange(len(y)) if x is None else x]
+		return list(zip(xs, ys))
+
+
+	def _fitLimits_(self, curves, force=False):
+		""" Grows the axes limits to fit the data. The side that overflowed gets 25% headroom,
+		so streaming data does not force a full redraw every frame. Returns True if changed
+		"""
+		axes = self.matplotlibFig.axes
+		xs = [np.asarray(_x) for _x,_y in curves if len(_x)]
+		ys = [np.asarray(_y) for _x,_y in curves if len(_y)]
+		if not xs or not ys:
+			return False
+
+		changed = False
+		for data,getLimits,setLimits in ((xs, axes.get_xlim, axes.set_xlim), (ys, axes.get_ylim, axes.set_ylim)):
+			low = min(np.nanmin(_d) for _d in data)
+			high = max(np.nanmax(_d) for _d in data)
+			if not np.isfinite(low) or not np.isfinite(high):
+				continue
+			span = (high - low) or 1.0
+			lower, upper = getLimits()
+			if force:
+				setLimits(low - 0.05*span, high + 0.05*span)
+				changed = True
+			elif low < lower or high > upper:
+				lower = low - 0.25*span if low < lower else lower
+				upper = high + 0.25*span if high > upper else upper
+				setLimits(lower, upper)
+				changed = True
+		return changed
+
+
+	def _onDraw_(self, event):
+		""" After every full draw, cache the background and put the (animated) lines back """
+		if not self.blit:
+			return
+		canvas = self.matplotlibFig
+		self.background = canvas.copy_from_bbox(canvas.axes.bbox)
+		for line in self.lines:
+			canvas.axes.draw_artist(line)
+
+
+	class GWENMatplotlibFig(FigureCanvasQTAgg):
+		""" Child of GWENMatplotlibPlot. This is the plot. 
+			The parent simply adds the toolbar to the widget. """
+		def __init__(self, plot_labels, legend, width=5, height=5, dpi=90):
+			self.fig = Figure(figsize=(width, height), dpi=dpi)
+			self.axes = self.fig.add_subplot(111)
+			super().__init__(self.fig)
+
+			self.title = self.fig.suptitle(str(plot_labels[0]))
+			self.xlabel = self.axes.set_xlabel(str(plot_labels[1]))
+			self.ylabel = self.axes.set_ylabel(str(plot_labels[2]))
+			if legend:
+				self.legend = self.axes.legend()
+			self.setFixedSize(400, 360)
+
+		""" This probably needs to go outside into parent class """
+		# def updatePlot_Img(self, img_array, scaling):
+		#     """
+		#     Plot update callback.
+		#     @img_array: (numpy.array) image
+		#     @scaling: (int) pixel scaling factor
+		#     """
+		#     self.axes.cla()
+		#     if self.cbar: self.cbar.remove()
+		#     vmin, vmax = np.nanmin(img_array), np.nanmax(img_array)
+		#     dims = np.shape(img_array)
+		#     # Display interferogram with the appropriate pixel scaling factor.
+		#     self.im = self.axes.imshow(img_array, extent=[0, dims[0] * scaling, 0, dims[1] * scaling])
+		#     self.im.set_clim(vmin, vmax)
+		#     self.cbar = self.fig.colorbar(self.im, ticks=np.linspace(vmin, vmax, 10), format='%.2f')
+		#     self.draw()
+
+		""" Unfinished animation plot code """	
+		# class MyFigureCanvas(FigureCanvas, anim.FuncAnimation):
+		# 	'''
+		# 	This is the FigureCanvas in which the live plot is drawn.
+
+		# 	'''
+		# 	def __init__(self, parent, id, x_len:int, y_range:list, interval:int) -> None:
+		# 		'''
+		# 		:param x_len:       The nr of data points shown in one plot.
+		# 		:param y_range:     Range on y-axis.
+		# 		:param interval:    Get a new datapoint every .. milliseconds.
+
+		# 		'''
+		# 		# Call parent constructor
+		# 		#super().__init__(parent)
+		# 		self.id = id
+		# 		self.dim = [4,4]
+
+
+		# 		FigureCanvas.__init__(self, fig.Figure())
+		# 		# Range settings
+		# 		self._x_len_ = x_len
+		# 		self._y_range_ = y_range
+
+		# 		# Store two lists _x_ and _y_
+		# 		x = list(range(0, x_len))
+		# 		y = [0] * x_len
+
+		# 		# Store a figure and ax
+		# 		self._ax_  = self.figure.subplots()
+		# 		self._ax_.set_ylim(ymin=self._y_range_[0], ymax=self._y_range_[1])
+		# 		self._line_, = self._ax_.plot(x, y)
+
+		# 		# Call superclass constructors
+		# 		anim.FuncAnimation.__init__(self, self.figure, self._update_canvas_, fargs=(y,), interval=interval, blit=True)
+		# 		return
+
+		# 	def _update_canvas_(self, y):
+		# 		'''
+		# 		This function gets called regularly by the timer.
+
+		# 		'''
+		# 		y.append(round(get_next_datapoint(), 2))     # Add new datapoint
+		# 		y = y[-self._x_len_:]                        # Truncate list _y_
+		# 		self._line_.set_ydata(y)
+		# 		return self._line_,
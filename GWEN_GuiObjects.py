@@ -19,22 +19,19 @@
 # Dependencies
 import sys
 import os
+import logging
+import math
+import numbers
+import importlib
+import collections
 import numpy as np
 from PyQt5 import QtWidgets, QtCore, QtGui
-import matplotlib
-
-matplotlib.use('Qt5Agg')
-
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT as NavigationToolbar
-from matplotlib.collections import PatchCollection
 
 ##### Operating System Check ##################################################################################
 
 # Detect OS platform
 if sys.platform.startswith('linux') or sys.platform.startswith('cygwin'):
 	os_type = 'Linux'
-	graph_path = sys.path.insert(0, '/usr/lib/python3/dist-packages/')
 elif sys.platform.startswith('win'):
 	os_type = 'Windows'
 elif sys.platform.startswith('darwin'):
@@ -42,11 +39,47 @@ elif sys.platform.startswith('darwin'):
 else:
 	raise EnvironmentError('Unsupported platform.')
 
-print('Detected {} as the default operating system.'.format(os_type))
+# Where apt installs python3-pyqtgraph and friends on Linux
+linux_dist_packages = '/usr/lib/python3/dist-packages/'
+
+# SI prefixes from 1e-12 to 1e12, GWENIndicator(si=True) picks one
+si_prefixes = ('p', 'n', 'u', 'm', '', 'k', 'M', 'G', 'T')
+si_power = 4
+
+# Types GWENIndicator compares to its last value before formatting again
+_cacheable_ = (int, float, str)
+
+##### Lazy Widget Backends ####################################################################################
 
-# OS-Specific Dependencies 
-import pyqtgraph as pg
-import pyqt_led
+# Widgets built on heavy libraries (pyqtgraph, matplotlib, pyqt_led) live in their own modules,
+# which are only imported the first time one of these classes is used
+lazy_widgets = {
+	'GWENPlot': 			'GWEN_GuiPlots',
+	'GWENStackPlot': 		'GWEN_GuiPlots',
+	'GWENFrameView': 		'GWEN_GuiPlots',
+	'GWENMatplotlibPlot': 	'GWEN_GuiMatplotlib',
+	'GWENLED': 				'GWEN_GuiLED',
+}
+
+
+def __getattr__(name):
+	""" Module level hook that loads lazy widget classes on first access """
+	if name in lazy_widgets:
+		return getattr(importlib.import_module(lazy_widgets[name]), name)
+	raise AttributeError('module {} has no attribute {}'.format(__name__, name))
+
+
+def importBackend(name):
+	""" Imports a widget backend (ie. pyqtgraph, pyqt_led). On Linux, falls back on the
+	system dist-packages, where these libraries are often installed through apt
+	"""
+	try:
+		return importlib.import_module(name)
+	except ImportError:
+		if os_type != 'Linux' or linux_dist_packages in sys.path:
+			raise
+		sys.path.append(linux_dist_packages)
+		return importlib.import_module(name)
 
 ###############################################################################################################
 
@@ -61,6 +94,7 @@ class GWENButton(QtWidgets.QPushButton):
 		self.dim = dim
 		self.label = label
 		self.red = False
+		self.callback = callback
 
 		# Connect callback to button click
 		if callback:
@@ -116,38 +150,6 @@ class Color():
 	red = np.array([0xff, 0x00, 0x00], dtype=np.uint8)
 	yellow = np.array([0xff, 0xff, 0x00], dtype=np.uint8)
 
-class GWENLED(pyqt_led.Led):
-	""" Class used to create a PyQt LED """
-	def __init__(self, parent, id, dim, label, color, shape):
-		# Call parent constructor
-		super().__init__(parent, on_color=color, shape=shape)
-
-		self.id = id
-		self.dim = dim
-		self.label = label
-
-		# Default size
-		self.setFixedSize(35,35)
-
-
-	def toggleOn(self):
-		""" Toggle LED on """
-		self._toggle_on()
-
-
-	def toggleOff(self):
-		""" Toggle LED off """
-		self._toggle_off()
-
-
-	def value(self):
-		""" Returns true if on """
-		if self.is_on():
-			return True
-		else:
-			return False
-
-
 class GWENCheckBox(QtWidgets.QCheckBox):
 	""" Class used to create a Qt check box """
 	def __init__(self, parent, id, dim, label, width):
@@ -187,8 +189,17 @@ class GWENRadioButton(QtWidgets.QRadioButton):
 
 
 class GWENIndicator(QtWidgets.QLineEdit):
-	""" Class used to create a Qt indicator """
-	def __init__(self, parent, id, default, dim, label, width):
+	""" Class used to create a Qt indicator. Numbers can be shown with a fixed precision,
+	a unit and an SI prefix (si=True: 0.0032 V -> 3.2 mV). setText is skipped when the text
+	would not change, and with minInterval (ms) the text changes at most that often; the
+	newest value is shown once the interval has passed.
+	"""
+	# GWENGui slot used by updateWidget
+	updateSlot = 'updateIndicator'
+	# Set by updateIndicator(freeze=True), frozen indicators ignore updates
+	frozen = False
+
+	def __init__(self, parent, id, default, dim, label, width, precision=None, unit='', si=False, minInterval=0):
 		# Call parent constructor
 		super().__init__(parent)
 
@@ -196,6 +207,27 @@ class GWENIndicator(QtWidgets.QLineEdit):
 		self.dim = dim
 		self.label = label
 
+		# Formatting
+		self.precision = precision
+		self.unit = unit
+		self.si = si
+		self.formatted = precision is not None or bool(unit) or si
+		self.numberFormat = '{:.3g}' if precision is None else '{{:.{}f}}'.format(precision)
+
+		# Last value given to setValue and its text, repeated values are not formatted again
+		self.lastOutput = None
+		self.lastText = None
+		self.shown = None
+
+		# Throttling
+		self.minInterval = minInterval
+		self.pending = None
+		self.lastShown = QtCore.QElapsedTimer()
+		if minInterval:
+			self.timer = QtCore.QTimer(self)
+			self.timer.setSingleShot(True)
+			self.timer.timeout.connect(self._showPending_)
+
 		# Set defaut readout
 		self.setText(default)
 
@@ -210,6 +242,58 @@ class GWENIndicator(QtWidgets.QLineEdit):
 		return self.text()
 
 
+	def setText(self, text):
+		self.shown = text
+		super().setText(text)
+
+
+	def setValue(self, output):
+		""" Shows output, formatted. Does nothing if the text would not change """
+		if type(output) is type(self.lastOutput) and type(output) in _cacheable_ and output == self.lastOutput:
+			text = self.lastText
+		else:
+			text = self.format(output)
+			self.lastOutput = output
+			self.lastText = text
+		if text == self.shown:
+			self.pending = None
+			return
+		if self.minInterval:
+			if self.lastShown.isValid() and self.lastShown.elapsed() < self.minInterval:
+				# Too soon, show the newest text when the interval is over
+				self.pending = text
+				if not self.timer.isActive():
+					self.timer.start(self.minInterval - self.lastShown.elapsed())
+				return
+			self.lastShown.start()
+		self.setText(text)
+
+
+	def format(self, output):
+		""" Returns the text shown for output """
+		if not self.formatted or isinstance(output, (bool, np.bool_)) or not isinstance(output, numbers.Real):
+			return str(output)
+		value = float(output)
+		prefix = ''
+		if self.si and value and math.isfinite(value):
+			power = min(max(math.floor(math.log10(abs(value))/3), -si_power), si_power)
+			# 999.96 at one decimal rounds up to the next prefix
+			if power < si_power and abs(float(self.numberFormat.format(value/1000.0**power))) >= 1000:
+				power += 1
+			value /= 1000.0**power
+			prefix = si_prefixes[power + si_power]
+		text = str(output) if self.precision is None and not self.si else self.numberFormat.format(value)
+		unit = prefix + self.unit
+		return text + ' ' + unit if unit else text
+
+
+	def _showPending_(self):
+		if self.pending is not None:
+			text, self.pending = self.pending, None
+			self.lastShown.start()
+			self.setText(text)
+
+
 class GWENUserInput(QtWidgets.QLineEdit):
 	""" Class used to create a Qt user input box """
 	def __init__(self, parent, id, default, dim, label, width):
@@ -299,18 +383,130 @@ class GWENComboBox(QtWidgets.QComboBox):
 			
 
 class GWENLoggingBox(QtWidgets.QTextBrowser):
-	""" Class used to create a empty Qt text box which can log actions/messages in real time """
-	def __init__(self, parent, label, dim, id=None, size=[200,200]):
+	""" Class used to create a empty Qt text box which can log actions/messages in real time.
+	Only the last maxLines lines are kept, and messages are appended in batches: everything
+	logged within batchInterval ms goes into the document as a single edit.
+	"""
+	# GWENGui slot used by updateWidget
+	updateSlot = 'updateLog'
+	# Emitted (from any thread) when post() queued new lines
+	posted = QtCore.pyqtSignal()
+
+	def __init__(self, parent, id, dim, label, size=[200,200], maxLines=10000, batchInterval=16):
 		# Call parent constructor
 		super().__init__(parent)
-		# Labels do not require an ID
-		self.dim = dim
+
 		self.id = id
+		self.dim = dim
 		self.label = label
 
 		self.setFixedWidth(size[0])
 		self.setFixedHeight(size[1])
 
+		# Qt trims the oldest blocks (lines) once the cap is reached. 0 means unlimited
+		self.maxLines = maxLines
+		self.document().setMaximumBlockCount(maxLines)
+		# True once a line was appended. An empty first line leaves the document empty, so
+		# document().isEmpty() alone would merge the next line into it
+		self.hasLines = False
+
+		# Lines waiting for the next batched append
+		self.pending = list()
+		self.batchInterval = batchInterval
+		self.batchTimer = QtCore.QTimer(self)
+		self.batchTimer.setSingleShot(True)
+		self.batchTimer.timeout.connect(self.flush)
+
+		# Lines posted from other threads
+		self.postedLines = collections.deque(maxlen=maxLines or None)
+		self.postPending = False
+		self.posted.connect(self._drainPosted_, QtCore.Qt.QueuedConnection)
+
+
+	def queueLines(self, messages):
+		""" Queues lines for the next batched append (immediately if batchInterval is None) """
+		self.pending.extend(messages)
+		if self.batchInterval is None:
+			self.flush()
+		elif not self.batchTimer.isActive():
+			self.batchTimer.start(self.batchInterval)
+
+
+	def flush(self):
+		""" Appends every queued line now """
+		if self.pending:
+			messages, self.pending = self.pending, list()
+			self.appendLines(messages)
+
+
+	def appendLines(self, messages):
+		""" Appends a list of lines as one document edit (one relayout) """
+		# Lines that would be trimmed right away are not worth inserting
+		if self.maxLines and len(messages) > self.maxLines:
+			messages = messages[-self.maxLines:]
+
+		# Only follow the output if the user has not scrolled up
+		scrollBar = self.verticalScrollBar()
+		atBottom = scrollBar.value() == scrollBar.maximum()
+
+		cursor = QtGui.QTextCursor(self.document())
+		cursor.movePosition(QtGui.QTextCursor.End)
+		cursor.beginEditBlock()
+		for message in messages:
+			if self.hasLines or not self.document().isEmpty():
+				cursor.insertBlock()
+			self.hasLines = True
+			# Keep QTextBrowser.append behaviour for html messages
+			if QtCore.Qt.mightBeRichText(message):
+				cursor.insertHtml(message)
+			else:
+				# Default format, so formatting from an html line does not leak into the next one
+				cursor.insertText(message, QtGui.QTextCharFormat())
+		cursor.endEditBlock()
+
+		if atBottom:
+			scrollBar.setValue(scrollBar.maximum())
+
+
+	def clear(self):
+		""" Removes every line """
+		super().clear()
+		self.hasLines = False
+
+
+	def post(self, message):
+		""" Thread-safe, non-blocking append. The line is added by the GUI thread """
+		self.postedLines.append(message)
+		# Only one drain is in flight at a time
+		if not self.postPending:
+			self.postPending = True
+			self.posted.emit()
+
+
+	def _drainPosted_(self):
+		self.postPending = False
+		messages = list()
+		while self.postedLines:
+			messages.append(self.postedLines.popleft())
+		self.queueLines(messages)
+
+
+class GWENLogHandler(logging.Handler):
+	""" logging.Handler that routes Python log records into a GWENLoggingBox. emit() only
+	formats the record and hands it to the box, so the logging thread never blocks on the GUI.
+	"""
+	def __init__(self, logBox, level=logging.NOTSET):
+		# Call parent constructor
+		super().__init__(level)
+		self.logBox = logBox
+
+
+	def emit(self, record):
+		try:
+			self.logBox.post(self.format(record))
+		except Exception:
+			self.handleError(record)
+
 
 class GWENLabel(QtWidgets.QLabel):
 	""" Class used to create a normal Qt label """
@@ -375,181 +571,620 @@ class GWENFileDialog(QtWidgets.QFileDialog):
 
 
 class GWENImage(QtWidgets.QLabel):
-	""" Class used to create a Qt label of an image """
+	""" Class used to create a Qt label of an image. Files are decoded and scaled in a
+	thread pool (see GWENPixmapCache); a placeholder is shown until the image is ready
+	"""
 	def __init__(self, parent, id, image, size, dim):
 		# Call parent constructor
 		super().__init__(parent)
 		# Labels do not require an ID
 		self.id = id
 		self.dim = dim
+		self.ready = False
 
-		self.setPixmap(QtGui.QPixmap(image).scaled(size[0], size[1], QtCore.Qt.KeepAspectRatio, QtCore.Qt.FastTransformation))
+		if isinstance(image, str):
+			pixmap_cache.request(image, size, self)
+		else:
+			# Already decoded (QImage, QPixmap, ...)
+			self.showPixmap(QtGui.QPixmap(image).scaled(size[0], size[1], QtCore.Qt.KeepAspectRatio, QtCore.Qt.FastTransformation))
 		#self.setFixedSize(size[0],size[1])
 
 
-class GWENPlot(pg.GraphicsLayoutWidget):
-	""" Class used to create a Qt plot """
-	def __init__(self, parent, id, numCurves, labels, color):
-		# Call parent constructor
-		super().__init__(parent)
+	def showPixmap(self, pixmap):
+		""" Called with the scaled pixmap once it is ready (a null pixmap if loading failed) """
+		self.setPixmap(pixmap)
+		self.ready = True
 
-		self.id = id
-		self.dim = [4,4]
-		# List that holds curves in a plot
-		self.curves = []
 
-		# Available colors for plot (up to 8 colors)
-		colors = ['w','b','g','r','c','m','y','w']
+class _ImageLoader_(QtCore.QRunnable):
+	""" Decodes and scales one image file in a QThreadPool thread """
+	def __init__(self, key, signals):
+		super().__init__()
+		self.key = key
+		self.signals = signals
 
-		# Create plot object
-		self.axe = self.addPlot()
 
-		# If one curve, let the user set the color
-		if numCurves == 1 and color != None:
-			self.curves.append(self.axe.plot(pen=color))
-		else:
-			# Create a list to contain all curves
-			for curve in range(0,numCurves):
-				self.curves.append(self.axe.plot(pen=colors[curve]))
+	def run(self):
+		path, mtime, width, height = self.key
+		# QImage (unlike QPixmap) can be used outside the GUI thread
+		image = QtGui.QImage(path)
+		if not image.isNull():
+			image = image.scaled(width, height, QtCore.Qt.KeepAspectRatio, QtCore.Qt.FastTransformation)
+		self.signals.loaded.emit(self.key, image)
 
-		# Set title and axis labels
-		self.axe.setTitle(labels[0])
-		self.axe.setLabel('bottom',labels[1])
-		self.axe.setLabel('left',labels[2])
 
-		# Set Fixed Size 
-		self.setFixedSize(350,350)
+class GWENPixmapCache(QtCore.QObject):
+	""" Process-wide LRU cache of decoded and scaled image files, keyed by (path, mtime, size).
+	Holds at most maxBytes of pixmaps. Files are decoded in QThreadPool threads and every
+	widget waiting for the same key is served by one decode. Use from the GUI thread only.
+	"""
+	loaded = QtCore.pyqtSignal(object, QtGui.QImage)
 
+	def __init__(self, maxBytes=64*2**20):
+		super().__init__()
+		self.maxBytes = maxBytes
+		self.bytes = 0
+		self.pixmaps = collections.OrderedDict()	# key -> QPixmap, least recently used first
+		self.waiting = dict()						# key -> [widgets] while it is decoded
+		self.placeholders = dict()					# (width, height) -> QPixmap
+		self.pool = QtCore.QThreadPool.globalInstance()
+		# Emitted from pool threads, queued to this object in the GUI thread
+		self.loaded.connect(self._loaded_)
 
-	def updatePlot(self, x, *y):
-		""" Update Plot Object. Will take up to "n" number of arguments.
-		Will plot as many items specified against one x axis only
-		"""
-		for index,_y in enumerate(y):
-			self.curves[index].setData(x,_y)
-		
+		# Statistics
+		self.hits = 0
+		self.misses = 0
 
-class GWENStackPlot(pg.GraphicsLayoutWidget):
 
-	def __init__():
+	def request(self, path, size, widget):
+		""" Calls widget.showPixmap with the scaled image of path, right away if it is cached """
+		try:
+			mtime = os.stat(path).st_mtime_ns
+		except OSError:
+			mtime = None
+		key = (os.path.abspath(path), mtime, int(size[0]), int(size[1]))
+
+		pixmap = self.pixmaps.get(key)
+		if pixmap is not None:
+			self.pixmaps.move_to_end(key)
+			self.hits += 1
+			widget.showPixmap(pixmap)
+			return
+		self.misses += 1
+		widget.setPixmap(self._placeholder_(key[2], key[3]))
+		if key in self.waiting:
+			self.waiting[key].append(widget)
+			return
+		self.waiting[key] = [widget]
+		self.pool.start(_ImageLoader_(key, self))
+
+
+	def clear(self):
+		self.pixmaps.clear()
+		self.bytes = 0
+
+
+	def stats(self):
+		return {'hits': self.hits, 'misses': self.misses, 'pixmaps': len(self.pixmaps), 'bytes': self.bytes, 'maxBytes': self.maxBytes}
+
+
+	def _loaded_(self, key, image):
+		pixmap = QtGui.QPixmap.fromImage(image)
+		if not pixmap.isNull():
+			size = pixmap.width()*pixmap.height()*pixmap.depth()//8
+			self.pixmaps[key] = pixmap
+			self.bytes += size
+			# Evict least recently used pixmaps, the newest one stays even if it alone is too big
+			while self.bytes > self.maxBytes and len(self.pixmaps) > 1:
+				old, evicted = self.pixmaps.popitem(last=False)
+				self.bytes -= evicted.width()*evicted.height()*evicted.depth()//8
+		for widget in self.waiting.pop(key, []):
+			try:
+				widget.showPixmap(pixmap)
+			except RuntimeError:
+				# Widget deleted while its image was loading
+				pass
+
+
+	def _placeholder_(self, width, height):
+		placeholder = self.placeholders.get((width, height))
+		if placeholder is None:
+			placeholder = QtGui.QPixmap(max(width, 1), max(height, 1))
+			placeholder.fill(QtGui.QColor(103, 111, 112))
+			self.placeholders[(width, height)] = placeholder
+		return placeholder
+
+
+# Shared by every GWENImage, set pixmap_cache.maxBytes to change the memory cap
+pixmap_cache = GWENPixmapCache()
+
+
+class GWENTableModel(QtCore.QAbstractTableModel):
+	""" Table model over NumPy columns. Rows live in one growable array per column; the
+	view asks only for the cells it shows, so only those are formatted. Sorting keeps a
+	cached argsort of the sort column (new rows are merged into it) and filtering keeps a
+	boolean mask; both only change which storage rows the view rows point to (self.order).
+	"""
+	# More separate insert positions than this in one append reset the model instead
+	insert_runs = 16
+
+	def __init__(self, columns, formats=None, parent=None):
 		# Call parent constructor
-		# Set dim and id
-		pass
+		super().__init__(parent)
+		self.dtype = tableDtype(columns)
+		self.names = list(self.dtype.names)
+		self.rows = 0
+		self.columns = [np.empty(16, self.dtype[name]) for name in self.names]
+
+		formats = formats or dict()
+		self.formats = [self._formatter_(formats.get(name), self.dtype[name]) for name in self.names]
+		self.alignments = [QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter if self.dtype[name].kind in 'iuf' else QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter for name in self.names]
+
+		# View row -> storage row, None while neither sorting nor filtering is on
+		self.order = None
+		self.sortColumn = -1
+		self.descending = False
+		# Buffers with the capacity of the columns, so appends only write the new rows
+		self.sorted = None			# Storage rows in ascending order of the sort column
+		self.sortedValues = None	# Sort column values in that order, for merging new rows
+		self.mask = None			# Filter result per storage row
+		self.passed = None			# Storage rows that pass the filter, when not sorted
+		self.filter = None			# filter({name: column array}) -> bool array
+
+
+	def rowCount(self, parent=QtCore.QModelIndex()):
+		if parent.isValid():
+			return 0
+		return self.rows if self.order is None else len(self.order)
+
+
+	def columnCount(self, parent=QtCore.QModelIndex()):
+		return 0 if parent.isValid() else len(self.names)
+
+
+	def data(self, index, role=QtCore.Qt.DisplayRole):
+		if role == QtCore.Qt.DisplayRole:
+			row = index.row() if self.order is None else self.order[index.row()]
+			column = index.column()
+			return self.formats[column](self.columns[column][row])
+		if role == QtCore.Qt.TextAlignmentRole:
+			return self.alignments[index.column()]
+		return None
+
+
+	def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+		if role != QtCore.Qt.DisplayRole:
+			return None
+		if orientation == QtCore.Qt.Horizontal:
+			return self.names[section]
+		# Rows are numbered by storage position, so a row keeps its number when sorted
+		return str(section if self.order is None else self.order[section])
+
+
+	def columnData(self, name):
+		""" Returns a view of the stored values of column name (in storage order) """
+		return self.columns[self.names.index(name)][:self.rows]
+
+
+	def appendRows(self, rows):
+		""" Appends rows: a structured array, a dict of columns or a list of tuples """
+		rows = self._asColumns_(rows)
+		count = len(rows[0]) if rows else 0
+		if not count:
+			return
+		start = self.rows
+		stop = start + count
+		if stop > len(self.columns[0]):
+			# Amortized growth, existing rows are copied once per doubling
+			capacity = max(2*len(self.columns[0]), stop)
+			self.columns = [_grow_(values, start, capacity) for values in self.columns]
+			if self.mask is not None:
+				self.mask = _grow_(self.mask, start, capacity)
+		for column, values in enumerate(rows):
+			self.columns[column][start:stop] = values
+
+		if self.order is None:
+			self.beginInsertRows(QtCore.QModelIndex(), start, stop - 1)
+			self.rows = stop
+			self.endInsertRows()
+			return
+
+		new = np.arange(start, stop)
+		if self.mask is not None:
+			self.mask[start:stop] = self._filter_(start, stop)
+		if self.sorted is None:
+			# Filtered only: passing rows go to the end
+			passed = new[self.mask[start:stop]]
+			shown = len(self.order)
+			self.passed = self._merge_(self.passed, shown, np.full(len(passed), shown), passed)
+			self._insertRows_(shown + np.arange(len(passed)), self.passed[:shown + len(passed)], stop)
+			return
+
+		# Sorted: merge the new rows into the cached order
+		values = self.columns[self.sortColumn][start:stop]
+		byValue = np.argsort(values, kind='stable')
+		positions = np.searchsorted(self.sortedValues[:start], values[byValue], side='right')
+		def merge():
+			self.sorted = self._merge_(self.sorted, start, positions, new[byValue])
+			self.sortedValues = self._merge_(self.sortedValues, start, positions, values[byValue])
+			return self._viewOrder_(stop)
+		if self.mask is None:
+			# Where the new rows land follows from the merge. The view order is a view of
+			# the sorted rows, so merge only once the insert has been announced
+			shown = positions + np.arange(count)
+			self._insertRows_(stop - 1 - shown[::-1] if self.descending else shown, merge, stop)
+		else:
+			order = merge()
+			self._insertRows_(np.flatnonzero(order >= start), order, stop)
+
+
+	def updateColumn(self, name, values, start=0):
+		""" Overwrites column name from storage row start with values """
+		column = self.names.index(name)
+		values = np.asarray(values)
+		stop = min(start + len(values), self.rows)
+		if stop <= start:
+			return
+		self.columns[column][start:stop] = values[:stop - start]
+
+		if self.order is None:
+			self.dataChanged.emit(self.index(start, column), self.index(stop - 1, column), [QtCore.Qt.DisplayRole])
+			return
+		passed = self._filter_(start, stop) if self.mask is not None else None
+		if column == self.sortColumn or (passed is not None and not np.array_equal(passed, self.mask[start:stop])):
+			# Rows move, appear or disappear
+			self.beginResetModel()
+			if passed is not None:
+				self.mask[start:stop] = passed
+			if column == self.sortColumn:
+				self._sort_()
+			self.order = self._viewOrder_(self.rows)
+			self.endResetModel()
+		elif len(self.order):
+			# Where the rows are shown is scattered, the view only repaints what is visible
+			self.dataChanged.emit(self.index(0, column), self.index(len(self.order) - 1, column), [QtCore.Qt.DisplayRole])
+
+
+	def clear(self):
+		self.beginResetModel()
+		self.rows = 0
+		if self.sorted is not None:
+			self._sort_()
+		self.order = self._viewOrder_(0)
+		self.endResetModel()
+
+
+	def sort(self, column, order=QtCore.Qt.AscendingOrder):
+		""" Sorts the view by column (-1 for storage order). Called by the view's header """
+		self.layoutAboutToBeChanged.emit()
+		# Selection and current cell follow their rows
+		persistent = self.persistentIndexList()
+		rows = [self.order[index.row()] if self.order is not None else index.row() for index in persistent]
+
+		self.sortColumn = column
+		self.descending = order == QtCore.Qt.DescendingOrder
+		self._sort_()
+		self.order = self._viewOrder_(self.rows)
+
+		if persistent:
+			if self.order is None:
+				where = np.arange(self.rows)
+			else:
+				where = np.full(self.rows, -1)
+				where[self.order] = np.arange(len(self.order))
+			self.changePersistentIndexList(persistent, [self.index(int(where[row]), index.column()) for row, index in zip(rows, persistent)])
+		self.layoutChanged.emit()
+
 
-class GWENMatplotlibPlot(QtWidgets.QWidget):
-	""" Class to generate and update a matplotlib plot """ 
-	""" THIS IS CALLED IN GWENGui_Engine NOT GWENMatplotlibFig """
-	def __init__(self, parent, id, labels, legend, dim):
+	def setFilter(self, filter):
+		""" Shows only the rows for which filter, given {name: column array} and returning
+		a bool array, is True. None shows every row
+		"""
+		self.beginResetModel()
+		self.filter = filter
+		if filter is None:
+			self.mask = None
+		else:
+			self.mask = np.zeros(len(self.columns[0]), bool)
+			self.mask[:self.rows] = self._filter_(0, self.rows)
+		self.order = self._viewOrder_(self.rows)
+		self.endResetModel()
+
+
+	def toRecords(self, rows):
+		""" Returns rows (see appendRows) as a structured array with the table's dtype """
+		if isinstance(rows, np.ndarray) and rows.dtype == self.dtype:
+			return rows
+		if isinstance(rows, dict) or (isinstance(rows, np.ndarray) and rows.dtype.names):
+			records = np.empty(len(rows[self.names[0]]), self.dtype)
+			for name in self.names:
+				records[name] = rows[name]
+			return records
+		return np.array([tuple(row) for row in rows], dtype=self.dtype)
+
+
+	def _sort_(self):
+		if self.sortColumn < 0:
+			self.sorted = self.sortedValues = None
+			return
+		values = self.columns[self.sortColumn][:self.rows]
+		self.sorted = np.empty(len(self.columns[0]), np.intp)
+		self.sorted[:self.rows] = np.argsort(values, kind='stable')
+		self.sortedValues = np.empty(len(self.columns[0]), values.dtype)
+		np.take(values, self.sorted[:self.rows], out=self.sortedValues[:self.rows])
+
+
+	def _viewOrder_(self, rows):
+		""" View row -> storage row for the current sort and filter, None if neither is on """
+		if self.sorted is None and self.mask is None:
+			return None
+		if self.sorted is None:
+			passed = np.flatnonzero(self.mask[:rows])
+			self.passed = np.empty(len(self.columns[0]), np.intp)
+			self.passed[:len(passed)] = passed
+			return self.passed[:len(passed)]
+		order = self.sorted[:rows]
+		if self.descending:
+			order = order[::-1]
+		if self.mask is not None:
+			order = order[self.mask[order]]
+		return order
+
+
+	def _merge_(self, array, length, positions, values):
+		""" Inserts values before positions (ascending) into array[:length], in place when
+		there is room. Only what follows the first position moves, so nothing does when the
+		new values sort last (ie. sorted by time)
+		"""
+		if not len(values):
+			return array
+		if length + len(values) > len(array):
+			array = _grow_(array, length, max(2*len(array), length + len(values)))
+		first = positions[0]
+		array[first:length + len(values)] = np.insert(array[first:length], positions - first, values)
+		return array
+
+
+	def _insertRows_(self, positions, order, stop):
+		""" Announces new rows at view positions (ascending) and switches to the new view
+		order. order may be a function returning it, called once the insert has started
+		"""
+		runs = np.flatnonzero(np.diff(positions) != 1) + 1
+		if not len(positions):
+			# None of the new rows is shown
+			self.rows = stop
+			self.order = order() if callable(order) else order
+			return
+		if len(runs) >= self.insert_runs:
+			# Too scattered to announce run by run
+			self.beginResetModel()
+			self.rows = stop
+			self.order = order() if callable(order) else order
+			self.endResetModel()
+			return
+		if not len(runs):
+			self.beginInsertRows(QtCore.QModelIndex(), int(positions[0]), int(positions[-1]))
+			self.rows = stop
+			self.order = order() if callable(order) else order
+			self.endInsertRows()
+			return
+		# Several runs, inserted in ascending order: until a run is in, the rows of the
+		# following runs are left out of the order the view sees
+		if callable(order):
+			self.order = self.order.copy()
+			order = order()
+		self.rows = stop
+		bounds = np.concatenate(([0], runs, [len(positions)]))
+		for first, last in zip(bounds[:-1], bounds[1:]):
+			self.beginInsertRows(QtCore.QModelIndex(), int(positions[first]), int(positions[last - 1]))
+			self.order = np.delete(order, positions[last:]) if last < len(positions) else order
+			self.endInsertRows()
+
+
+	def _filter_(self, start, stop):
+		return np.asarray(self.filter({name: self.columns[column][start:stop] for column, name in enumerate(self.names)}), dtype=bool)
+
+
+	def _asColumns_(self, rows):
+		""" Returns a list with one array per column """
+		if isinstance(rows, dict) or (isinstance(rows, np.ndarray) and rows.dtype.names):
+			return [np.asarray(rows[name]) for name in self.names]
+		rows = self.toRecords(rows)
+		return [rows[name] for name in self.names]
+
+
+	def _formatter_(self, format, dtype):
+		""" Returns a function turning one stored value into its text """
+		if callable(format):
+			return format
+		if format is not None:
+			return format.format
+		if dtype.kind == 'f':
+			return '{:.6g}'.format
+		if dtype.kind == 'S':
+			return lambda value: value.decode(errors='replace')
+		return str
+
+
+def _grow_(array, length, capacity):
+	""" Returns a new array of size capacity starting with array[:length] """
+	grown = np.empty(capacity, array.dtype)
+	grown[:length] = array[:length]
+	return grown
+
+
+def tableDtype(columns):
+	""" Structured dtype for GWENTableModel columns: a dtype, a list of names (float64),
+	a list of (name, dtype) or a dict name -> dtype
+	"""
+	if isinstance(columns, np.dtype):
+		return columns
+	if isinstance(columns, dict):
+		columns = list(columns.items())
+	return np.dtype([(column, np.float64) if isinstance(column, str) else tuple(column) for column in columns])
+
+
+class GWENTable(QtWidgets.QTableView):
+	""" Class used to create a table over NumPy columns (see GWENTableModel). Only the
+	visible rows are drawn and formatted, whatever the number of rows
+	"""
+	# GWENGui slot used by updateWidget
+	updateSlot = 'updateTable'
+
+	def __init__(self, parent, id, columns, dim, label, size=[400,300], formats=None, sortable=True):
+		# Call parent constructor
 		super().__init__(parent)
+
 		self.id = id
 		self.dim = dim
-		self.matplotlibFig = self.GWENMatplotlibFig(labels, legend)
+		self.label = label
 
-		# Create layout combining axes and toolbar
-		toolbar = NavigationToolbar(self.matplotlibFig, parent)
-		layout = QtWidgets.QVBoxLayout()
-		layout.addWidget(toolbar)
-		layout.addWidget(self.matplotlibFig)
-		self.setLayout(layout)
+		self.setModel(GWENTableModel(columns, formats, self))
+		# Fixed row heights and column widths: resizing to contents would format every row
+		self.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+		self.verticalHeader().setDefaultSectionSize(self.fontMetrics().height() + 6)
+		self.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Interactive)
+		self.setWordWrap(False)
+		if sortable:
+			# Without an indicator, enabling sorting would sort by the first column right away
+			self.horizontalHeader().setSortIndicator(-1, QtCore.Qt.AscendingOrder)
+			self.setSortingEnabled(True)
 
-	def updatePlot(self, x, y, data_labels=None):
-		"""
-		@x ---> List or list of lists for x-axis data (or 2D numpy array of x_data)
-		@y ---> List or list of lists for y-axis data
-		@data_labels --> If more than one function is being plotted, supply a list of labels
-		"""
-		self.matplotlibFig.axes.cla()
+		self.setFixedWidth(size[0])
+		self.setFixedHeight(size[1])
 
-		# If 'x' is a list of lists (more than one function on plot)
-		if type(x[0]) == list:
-			for curve in range(len(x)):
-				self.matplotlibFig.axes.plot(x[curve], y[curve], label=data_labels[curve])
-				print(x[curve])
-		else:
-			self.matplotlibFig.axes.plot(x, y)
-		try: self.matplotlibFig.legend()
-		except: pass
-		self.matplotlibFig.draw()
-
-
-	class GWENMatplotlibFig(FigureCanvasQTAgg):
-		""" Child of GWENMatplotlibPlot. This is the plot. 
-			The parent simply adds the toolbar to the widget. """
-		def __init__(self, plot_labels, legend, width=5, height=5, dpi=90):
-			self.fig = plt.figure(figsize=(width, height), dpi=dpi)
-			self.axes = self.fig.add_subplot(111)
-			super().__init__(self.fig)
-
-			self.title = self.fig.suptitle(str(plot_labels[0]))
-			self.xlabel = plt.xlabel(str(plot_labels[1]))
-			self.ylabel = plt.ylabel(str(plot_labels[2]))
-			if legend:
-				self.legend = plt.legend()
-			self.setFixedSize(400, 360)
-
-		""" This probably needs to go outside into parent class """
-		# def updatePlot_Img(self, img_array, scaling):
-		#     """
-		#     Plot update callback.
-		#     @img_array: (numpy.array) image
-		#     @scaling: (int) pixel scaling factor
-		#     """
-		#     self.axes.cla()
-		#     if self.cbar: self.cbar.remove()
-		#     vmin, vmax = np.nanmin(img_array), np.nanmax(img_array)
-		#     dims = np.shape(img_array)
-		#     # Display interferogram with the appropriate pixel scaling factor.
-		#     self.im = self.axes.imshow(img_array, extent=[0, dims[0] * scaling, 0, dims[1] * scaling])
-		#     self.im.set_clim(vmin, vmax)
-		#     self.cbar = self.fig.colorbar(self.im, ticks=np.linspace(vmin, vmax, 10), format='%.2f')
-		#     self.draw()
-
-		""" Unfinished animation plot code """	
-		# class MyFigureCanvas(FigureCanvas, anim.FuncAnimation):
-		# 	'''
-		# 	This is the FigureCanvas in which the live plot is drawn.
-
-		# 	'''
-		# 	def __init__(self, parent, id, x_len:int, y_range:list, interval:int) -> None:
-		# 		'''
-		# 		:param x_len:       The nr of data points shown in one plot.
-		# 		:param y_range:     Range on y-axis.
-		# 		:param interval:    Get a new datapoint every .. milliseconds.
-
-		# 		'''
-		# 		# Call parent constructor
-		# 		#super().__init__(parent)
-		# 		self.id = id
-		# 		self.dim = [4,4]
-
-
-		# 		FigureCanvas.__init__(self, fig.Figure())
-		# 		# Range settings
-		# 		self._x_len_ = x_len
-		# 		self._y_range_ = y_range
-
-		# 		# Store two lists _x_ and _y_
-		# 		x = list(range(0, x_len))
-		# 		y = [0] * x_len
-
-		# 		# Store a figure and ax
-		# 		self._ax_  = self.figure.subplots()
-		# 		self._ax_.set_ylim(ymin=self._y_range_[0], ymax=self._y_range_[1])
-		# 		self._line_, = self._ax_.plot(x, y)
-
-		# 		# Call superclass constructors
-		# 		anim.FuncAnimation.__init__(self, self.figure, self._update_canvas_, fargs=(y,), interval=interval, blit=True)
-		# 		return
-
-		# 	def _update_canvas_(self, y):
-		# 		'''
-		# 		This function gets called regularly by the timer.
-
-		# 		'''
-		# 		y.append(round(get_next_datapoint(), 2))     # Add new datapoint
-		# 		y = y[-self._x_len_:]                        # Truncate list _y_
-		# 		self._line_.set_ydata(y)
-		# 		return self._line_,
+
+class GWENRingBuffer():
+	""" Fixed-capacity NumPy ring buffer that always exposes its contents as one
+	contiguous array. Every sample is written twice (at i and i+capacity), so the
+	newest "capacity" samples are a plain slice of the storage and no copy is needed.
+	"""
+	def __init__(self, capacity, dtype=np.float64):
+		self.capacity = int(capacity)
+		# Mirrored storage, preallocated once
+		self.buffer = np.zeros(2*self.capacity, dtype=dtype)
+		self.head = 0	# Next write position in [0,capacity)
+		self.size = 0	# Number of valid samples
+
+
+	def append(self, chunk):
+		""" Appends a chunk of samples. Cost depends only on the chunk length """
+		chunk = np.asarray(chunk, dtype=self.buffer.dtype).ravel()
+		# Only the newest samples can survive
+		if len(chunk) > self.capacity:
+			chunk = chunk[-self.capacity:]
+		n = len(chunk)
+		cap = self.capacity
+		buf = self.buffer
+
+		# Write into both halves, splitting the chunk if it wraps around
+		first = min(n, cap - self.head)
+		buf[self.head:self.head+first] = chunk[:first]
+		buf[self.head+cap:self.head+cap+first] = chunk[:first]
+		if first < n:
+			buf[:n-first] = chunk[first:]
+			buf[cap:cap+n-first] = chunk[first:]
+
+		self.head = (self.head + n) % cap
+		self.size = min(self.size + n, cap)
+
+
+	def clear(self):
+		""" Empties the buffer without releasing its storage """
+		self.head = 0
+		self.size = 0
+
+
+	def view(self):
+		""" Returns the valid samples, oldest first, as a contiguous view (no copy) """
+		start = (self.head - self.size) % self.capacity
+		return self.buffer[start:start+self.size]
+
+
+	def __len__(self):
+		return self.size
+
+
+class GWENLazyWidget():
+	""" Stand-in for a widget on a tab that has not been shown yet (GWENGui lazyTabs mode).
+	It only holds what is needed to build the widget and buffers the updates sent to it:
+	the latest arguments per update function, queued items and streamed samples, keeping
+	at most "capacity" items/samples. build() creates the widget and replays the buffer.
+	Any other attribute access builds the widget (inside buildParent) and is forwarded to it.
+	"""
+	# updateIndicator checks this before the widget exists
+	frozen = False
+
+	def __init__(self, id, dim, make, updateSlot=None, capacity=None):
+		self.id 		= id
+		self.dim 		= dim
+		self.make 		= make			# make(parent) -> (widget, label)
+		self.updateSlot = updateSlot
+		self.capacity 	= capacity
+		self.onBuild 	= None			# Called with the stand-in once the widget exists
+		self.buildParent = None		# Widget to build in when build() is not given one
+
+		self.target 		= None
+		self.targetLabel 	= None
+
+		# Buffered updates
+		self.latest = dict()	# apply -> args
+		self.queued = dict()	# apply -> [items]
+		self.stream = None		# [x ring buffer, y ring buffers...]
+
+
+	def post(self, apply, *args):
+		""" Records apply(widget, *args), replacing the previous call to apply """
+		self.latest[apply] = args
+
+
+	def postQueued(self, apply, item):
+		""" Records item, apply(widget, items) receives every item still kept """
+		items = self.queued.setdefault(apply, [])
+		items.append(item)
+		# Trim once in a while so appending stays O(1)
+		if self.capacity and len(items) > 2*self.capacity:
+			del items[:-self.capacity]
+
+
+	def appendData(self, x_chunk, *y_chunks, redraw=True):
+		""" Keeps the newest capacity streamed samples (see GWENPlot.appendData) """
+		if self.stream is None:
+			capacity = self.capacity or len(np.atleast_1d(x_chunk))
+			self.stream = [GWENRingBuffer(capacity) for buffer in range(len(y_chunks) + 1)]
+		for buffer, chunk in zip(self.stream, (x_chunk,) + y_chunks):
+			buffer.append(chunk)
+
+
+	def build(self, parent=None):
+		""" Creates the widget (once) inside parent, or buildParent if None, and applies the
+		buffered updates. Returns the widget
+		"""
+		if self.target is None:
+			self.target, self.targetLabel = self.make(parent if parent is not None else self.buildParent)
+			if self.frozen:
+				self.target.frozen = True
+
+			latest, self.latest = self.latest, dict()
+			queued, self.queued = self.queued, dict()
+			if self.stream is not None:
+				self.target.appendData(*[buffer.view() for buffer in self.stream], redraw=False)
+				self.stream = None
+			for apply, args in latest.items():
+				apply(self.target, *args)
+			for apply, items in queued.items():
+				apply(self.target, items[-self.capacity:] if self.capacity else items)
+
+			if self.onBuild is not None:
+				self.onBuild(self)
+		return self.target
+
+
+	def __getattr__(self, name):
+		# Only called for attributes the stand-in does not have
+		if name.startswith('__') or name in ('make', 'target'):
+			raise AttributeError(name)
+		return getattr(self.build(), name)
 
 
 class GWENDivies():
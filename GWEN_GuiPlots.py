@@ -0,0 +1,421 @@
+#   .d8888b.  888       888 8888888888 888b    888 
+#  d88P  Y88b 888   o   888 888        8888b   888 
+#  888    888 888  d8b  888 888        88888b  888 
+#  888        888 d888b 888 8888888    888Y88b 888 
+#  888  88888 888d88888b888 888        888 Y88b888 
+#  888    888 88888P Y88888 888        888  Y88888 
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888 
+#   "Y8888P88 888P     Y888 8888888888 888    Y888 
+#                                                                 
+# GWEN_GuiPlots.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+# 
+# https://github.com/krkung/GWEN
+#
+# Plot widgets built on pyqtgraph. Kept out of GWEN_GuiObjects.py so pyqtgraph is only
+# imported when GWENGui.addPlot (addStackPlot, addFrameView) is first called.
+#
+# Dependencies
+import time
+import collections
+import numpy as np
+from GWEN_GuiObjects import GWENRingBuffer, importBackend
+
+pg = importBackend('pyqtgraph')
+
+
+def minMaxDecimate(x, y, bins):
+	""" Peak-preserving decimation. Splits the samples into about "bins" equal groups and
+	keeps the minimum and maximum of each group in their original order, so spikes stay
+	visible. Returns (x, y) with at most 2*bins+2 points. Fully vectorized.
+	"""
+	n = len(y)
+	if n <= 2*bins:
+		return x, y
+
+	size = n // bins
+	count = n // size
+	body = y[:count*size].reshape(count, size)
+
+	# Index of the min and max of every group, in time order
+	offsets = np.arange(0, count*size, size)
+	imin = body.argmin(axis=1)
+	imax = body.argmax(axis=1)
+	index = np.empty(2*count, dtype=np.intp)
+	index[0::2] = np.minimum(imin, imax) + offsets
+	index[1::2] = np.maximum(imin, imax) + offsets
+
+	# Leftover samples that did not fill a whole group
+	if count*size < n:
+		tail = y[count*size:]
+		first, last = sorted((tail.argmin(), tail.argmax()))
+		index = np.concatenate((index, [count*size + first, count*size + last]))
+
+	return x[index], y[index]
+
+
+class GWENPlot(pg.GraphicsLayoutWidget):
+	""" Class used to create a Qt plot """
+	# GWENGui slot used by updateWidget
+	updateSlot = 'updatePlot'
+
+	def __init__(self, parent, id, numCurves, labels, color, capacity=None, decimate=False, skipFiniteCheck=False, connect='auto', xRange=None, yRange=None):
+		# Call parent constructor
+		super().__init__(parent)
+
+		self.id = id
+		self.dim = [4,4]
+		# List that holds curves in a plot
+		self.curves = []
+
+		# Streaming mode keeps the last "capacity" samples of x and each curve in ring buffers
+		self.capacity = capacity
+		if capacity:
+			self.updateSlot = 'appendData'
+			self.xBuffer = GWENRingBuffer(capacity)
+			self.yBuffers = [GWENRingBuffer(capacity) for curve in range(numCurves)]
+
+		# Decimation reduces each curve to a min/max pair per horizontal pixel of the visible range.
+		# The full data of every curve is kept so zooming/panning can re-decimate it, streaming
+		# plots decimate their ring buffers again instead
+		self.decimate = decimate
+		self.sources = [None]*numCurves
+		self.rendering = False
+
+		# Available colors for plot (up to 8 colors)
+		colors = ['w','b','g','r','c','m','y','w']
+
+		# Create plot object
+		self.axe = self.addPlot()
+
+		# If one curve, let the user set the color
+		if numCurves == 1 and color != None:
+			self.curves.append(self.axe.plot(pen=color))
+		else:
+			# Create a list to contain all curves
+			for curve in range(0,numCurves):
+				self.curves.append(self.axe.plot(pen=colors[curve]))
+
+		self.setOptions(skipFiniteCheck, connect, xRange, yRange)
+
+		# Set title and axis labels
+		self.axe.setTitle(labels[0])
+		self.axe.setLabel('bottom',labels[1])
+		self.axe.setLabel('left',labels[2])
+
+		# Zooming or panning changes what needs to be drawn
+		if decimate:
+			self.axe.vb.sigXRangeChanged.connect(self._onRangeChanged_)
+
+		# Set Fixed Size 
+		self.setFixedSize(350,350)
+
+
+	def updatePlot(self, x, *y):
+		""" Update Plot Object. Will take up to "n" number of arguments.
+		Will plot as many items specified against one x axis only. A single 2D array
+		is one curve per row. Contiguous float64/float32 arrays (and rows of a C-ordered
+		2D array) are handed to pyqtgraph as they are, without a conversion or copy;
+		lists and other sequences are converted on every call
+		"""
+		if len(y) == 1 and getattr(y[0], 'ndim', 1) == 2:
+			# Iterating a 2D array yields views of its rows
+			y = y[0]
+		for index,_y in enumerate(y):
+			self._render_(index,x,_y)
+
+
+	def setOptions(self, skipFiniteCheck=None, connect=None, xRange=None, yRange=None):
+		""" skipFiniteCheck skips the NaN/inf scans of every update (only for data known to
+		be finite): pyqtgraph's finite check and its dynamic range limit, which finds the data
+		bounds to clip huge values. connect is passed to the curves ('auto', 'all', 'finite', ...)
+		and a fixed xRange/yRange (min, max) turns off auto range, which otherwise scans the
+		data bounds on every update. None leaves an option as it is
+		"""
+		for curve in self.curves:
+			if skipFiniteCheck is not None:
+				curve.setSkipFiniteCheck(skipFiniteCheck)
+				curve.setDynamicRangeLimit(None if skipFiniteCheck else 1e6)
+			if connect is not None:
+				# setData without data would clear the curve, so its current data goes along
+				if curve.yData is None:
+					curve.setData(connect=connect)
+				else:
+					curve.setData(curve.xData, curve.yData, connect=connect)
+		if xRange is not None:
+			self.axe.setXRange(*xRange, padding=0)
+		if yRange is not None:
+			self.axe.setYRange(*yRange, padding=0)
+
+
+	def appendData(self, x, *y, redraw=True):
+		""" Streaming mode only. Appends a chunk of samples to the ring buffers and
+		redraws the curves from contiguous views of the buffers. Cost depends on
+		the chunk size, not on how much history is kept.
+		"""
+		if not self.capacity:
+			raise TypeError('Plot {} was not created in streaming mode (capacity=None).'.format(self.id))
+		self.xBuffer.append(x)
+		for index,_y in enumerate(y):
+			self.yBuffers[index].append(_y)
+		if redraw:
+			self.redraw()
+
+
+	def redraw(self):
+		""" Streaming mode only. Hands the current buffer contents to the curves """
+		xView = self.xBuffer.view()
+		for index,buffer in enumerate(self.yBuffers):
+			# Curves that are not being fed are left alone
+			if len(buffer) == len(xView):
+				self._render_(index,xView,buffer.view())
+
+
+	def clearData(self):
+		""" Streaming mode only. Empties the ring buffers and the curves """
+		if not self.capacity:
+			raise TypeError('Plot {} was not created in streaming mode (capacity=None).'.format(self.id))
+		self.xBuffer.clear()
+		for index,buffer in enumerate(self.yBuffers):
+			buffer.clear()
+			self.sources[index] = None
+			self.curves[index].setData([],[])
+
+
+	def _render_(self, index, x, y):
+		""" Hands the data of one curve to pyqtgraph, decimated to the view if enabled """
+		if self.decimate:
+			x = np.asarray(x)
+			y = np.asarray(y)
+			# Ring buffer views are overwritten by later appends, streaming plots take fresh
+			# views when the range changes instead of keeping these
+			if not self.capacity:
+				self.sources[index] = (x, y)
+			x, y = self._decimate_(x, y)
+		self.curves[index].setData(x,y)
+
+
+	def _decimate_(self, x, y):
+		""" Min/max decimation of one curve to ~2 points per pixel of the visible x range.
+		x must be increasing (ie. time) for the visible range to be cut out.
+		"""
+		viewBox = self.axe.vb
+		bins = int(viewBox.width()) or self.width()
+		if len(y) <= 2*bins:
+			return x, y
+
+		# When the user zoomed in, only the visible part (plus one point each side) is drawn
+		if not viewBox.autoRangeEnabled()[0]:
+			low, high = viewBox.viewRange()[0]
+			start = max(int(np.searchsorted(x, low)) - 1, 0)
+			stop = min(int(np.searchsorted(x, high, side='right')) + 1, len(x))
+			x = x[start:stop]
+			y = y[start:stop]
+
+		return minMaxDecimate(x, y, bins)
+
+
+	def _onRangeChanged_(self):
+		""" Re-decimates every curve for the new view range """
+		# setData can move the view (auto range), which would call back in here
+		if self.rendering:
+			return
+		self.rendering = True
+		try:
+			if self.capacity:
+				self.redraw()
+			for index,source in enumerate(self.sources):
+				if source is not None:
+					self.curves[index].setData(*self._decimate_(*source))
+		finally:
+			self.rendering = False
+
+
+class GWENStackPlot(pg.GraphicsLayoutWidget):
+	""" Class used to create a stack of plots in one scene. numPlots rows share (link) their
+	x axis and each row shows numCurves channels. Every channel has its own curve and color,
+	channel c being drawn in row c // numCurves with color c like the curves of a GWENPlot.
+	"""
+	# GWENGui slot used by updateWidget
+	updateSlot = 'updateStackPlot'
+
+	def __init__(self, parent, id, numPlots, numCurves, dim, labels):
+		# Call parent constructor
+		super().__init__(parent)
+
+		# Set dim and id
+		self.id = id
+		self.dim = dim
+		self.numPlots = numPlots
+		self.numCurves = numCurves
+
+		# labels: [title, x label, y label or one y label per row]
+		title, xLabel, yLabels = (list(labels) + ['', '', ''])[:3]
+		if isinstance(yLabels, str):
+			yLabels = [yLabels]*numPlots
+
+		colors = ['w','b','g','r','c','m','y']
+		self.axes = []
+		self.curves = []
+		for row in range(numPlots):
+			axe = self.addPlot(row=row, col=0)
+			if row:
+				axe.setXLink(self.axes[0])
+			else:
+				axe.setTitle(title)
+			# Only the bottom row shows the shared x axis
+			if row < numPlots - 1:
+				axe.hideAxis('bottom')
+			else:
+				axe.setLabel('bottom', xLabel)
+			axe.setLabel('left', yLabels[row] if row < len(yLabels) else '')
+			for channel in range(row*numCurves, (row + 1)*numCurves):
+				curve = pg.PlotCurveItem(pen=colors[channel % len(colors)])
+				axe.addItem(curve)
+				self.curves.append(curve)
+			self.axes.append(axe)
+
+		# GWENPlot is 350x350 for a 4x4 dim
+		self.setFixedSize(int(87.5*dim[1]), int(87.5*dim[0]))
+
+
+	def updateStackPlot(self, x, Y, finite=None):
+		""" Updates every channel at once. Y is a (channels, samples) array and x is shared
+		by all channels. Every curve gets a view of its row of Y, x and Y are converted (if
+		needed) and checked once per call. finite=True promises there is no NaN/inf so the
+		check is skipped, None checks x and Y, False lets pyqtgraph deal with every point
+		"""
+		x = np.asarray(x)
+		Y = np.asarray(Y)
+		if Y.ndim == 1:
+			Y = Y[np.newaxis]
+		if x.dtype.kind != 'f':
+			x = x.astype(np.float64)
+		if Y.dtype.kind != 'f':
+			Y = Y.astype(np.float64)
+		if finite is None:
+			finite = bool(np.isfinite(x).all() and np.isfinite(Y).all())
+		for curve, y in zip(self.curves, Y):
+			curve.setData(x, y, skipFiniteCheck=finite)
+
+
+class GWENFrameView(pg.GraphicsLayoutWidget):
+	""" Class used to show a stream of image frames (ie. a camera). Frames are 2D NumPy
+	arrays of any integer or float type, or 3D RGB(A) arrays. Single-channel frames are
+	scaled from the levels into a preallocated uint8 buffer, which pyqtgraph shows as is
+	with the colormap as its color table, so steady-state frames allocate nothing. RGB
+	frames are handed to pyqtgraph.
+	"""
+	# GWENGui slot used by updateWidget
+	updateSlot = 'updateFrame'
+
+	def __init__(self, parent, id, dim, levels=None, colormap=None, percentiles=(1, 99), levelsInterval=10, size=[350,350], showFPS=True):
+		# Call parent constructor
+		super().__init__(parent)
+
+		self.id = id
+		self.dim = dim
+
+		if levelsInterval < 1:
+			raise ValueError('Frame view {}: levelsInterval must be at least 1 (frames between auto levels), got {}.'.format(id, levelsInterval))
+		# Fixed (low, high) levels, or None to follow the percentiles of the frames
+		self.fixedLevels = levels
+		self.levels = levels
+		self.percentiles = percentiles
+		self.levelsInterval = levelsInterval
+		# Percentiles are computed on a strided sample of about this many pixels
+		self.sampleSize = 65536
+
+		# Display buffers, reallocated only when the frame geometry or type changes
+		self.geometry = None
+		self.display = None			# uint8 frame handed to the ImageItem
+		self.work = None			# float32 scratch for the scaling
+
+		self.frames = 0
+		self.frameTimes = collections.deque(maxlen=60)
+		self.lastReadout = 0.0
+
+		self.view = self.addViewBox(row=0, col=0, lockAspect=True, invertY=True, enableMenu=False)
+		self.image = pg.ImageItem(axisOrder='row-major')
+		self.view.addItem(self.image)
+		if colormap is not None:
+			# Becomes the QImage color table of the uint8 display buffer
+			self.image.setLookupTable(pg.colormap.get(colormap).getLookupTable(nPts=256, mode='byte'))
+
+		self.fpsLabel = self.addLabel('', row=1, col=0) if showFPS else None
+
+		self.setFixedSize(size[0], size[1])
+
+
+	def updateFrame(self, frame):
+		""" Shows frame, replacing the previous one """
+		frame = np.asarray(frame)
+		geometry = (frame.shape, frame.dtype)
+		if self.fixedLevels is None and (geometry != self.geometry or self.frames % self.levelsInterval == 0):
+			self.levels = self.autoLevels(frame)
+
+		if frame.ndim == 3:
+			# RGB(A), pyqtgraph applies the levels
+			self.image.setImage(frame, autoLevels=False, levels=self.levels)
+		else:
+			if geometry != self.geometry:
+				self.display = np.empty(frame.shape, np.uint8)
+				self.work = np.empty(frame.shape, np.float32)
+			self._map_(frame)
+			self.image.setImage(self.display, autoLevels=False, levels=None)
+		if geometry != self.geometry:
+			# New geometry, fit the view to it once
+			self.view.autoRange(padding=0)
+			self.geometry = geometry
+		self.frames += 1
+
+		now = time.perf_counter()
+		self.frameTimes.append(now)
+		if self.fpsLabel is not None and now - self.lastReadout > 0.5:
+			self.lastReadout = now
+			self.fpsLabel.setText('{:.1f} fps'.format(self.fps()))
+
+
+	def autoLevels(self, frame):
+		""" Returns (low, high) at the configured percentiles of a strided sample of frame.
+		Keeps the previous levels when the sample has no finite value
+		"""
+		flat = frame.reshape(-1)
+		sample = flat[::max(1, flat.size // self.sampleSize)]
+		if sample.dtype.kind in 'fc':
+			# NaN and inf would make the levels NaN
+			sample = sample[np.isfinite(sample)]
+		if not sample.size:
+			return self.levels if self.levels is not None else (0.0, 1.0)
+		low, high = np.percentile(sample, self.percentiles)
+		if not high > low:
+			high = low + 1
+		return float(low), float(high)
+
+
+	def setLevels(self, levels):
+		""" Fixes the levels to (low, high), None goes back to automatic levels """
+		self.fixedLevels = levels
+		if levels is not None:
+			self.levels = levels
+
+
+	def fps(self):
+		""" Frames per second over the last frames """
+		if len(self.frameTimes) < 2:
+			return 0.0
+		return (len(self.frameTimes) - 1)/(self.frameTimes[-1] - self.frameTimes[0])
+
+
+	def _map_(self, frame):
+		""" Writes frame, scaled from the levels to 0-255, into the display buffer """
+		low, high = self.levels
+		work = self.work
+		# In-place ufuncs only: a table lookup (np.take) would first copy the frame to intp indices
+		np.subtract(frame, low, out=work, casting='unsafe')
+		np.multiply(work, 255.0/(high - low), out=work)
+		# fmax/fmin also turn NaN into 0
+		np.fmax(work, 0, out=work)
+		np.fmin(work, 255, out=work)
+		np.copyto(self.display, work, casting='unsafe')
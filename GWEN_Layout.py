@@ -0,0 +1,222 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# GWEN_Layout.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# Qt-free layout planner used by GWENGui.createLayout. It walks the divies list
+# (endRow, endCol, newRow, newCol, makeTab, startGroup, endGroup) together with the
+# widget dims and compiles them into a placement plan. GWENGui then only has to create
+# the Qt layouts and drop every widget in its cell.
+#
+# A plan is a plain dict of lists, so it can be saved as JSON:
+#   'widgets'	one entry per widget, [row, col, rowSpan, colSpan, page, group, pane]
+#				(None for widgets no divie covers)
+#					page 	index of the top level tab. page == len(tabs) is the grid that is
+#							not followed by a makeTab (the central grid when there are no tabs)
+#					group 	index in 'groups', or None when placed directly on the page
+#					pane 	index of the group's mini tab, or len(group tabs) for the group's grid
+#   'tabs'		names of the top level tabs
+#   'groups'	one entry per group box, [name, page, row, col, rowSpan, colSpan, tabs, tabsRow, tabsCol]
+#				where tabs lists the names of its mini tabs and (tabsRow, tabsCol) is the cell
+#				of the mini tab widget in the group's grid
+#
+# Dependencies: none, the planner does not import Qt
+
+# Plans computed in this process, by the key given to planLayout
+_plans_ = dict()
+
+
+class _GridState_():
+	""" Mirrors the bookkeeping QGridLayout does when widgets are added: its row/column
+	count and the "next free position" used by addWidget calls without a position
+	"""
+	def __init__(self):
+		# An empty QGridLayout reports one row and one column
+		self.rows = 1
+		self.cols = 1
+		self.nextRow = 0
+		self.nextCol = 0
+
+
+	def add(self, row, col, rowSpan=1, colSpan=1):
+		lastRow = row + rowSpan - 1
+		lastCol = col + colSpan - 1
+		self.rows = max(self.rows, lastRow + 1)
+		self.cols = max(self.cols, lastCol + 1)
+		# Same rule as QGridLayoutPrivate::setNextPosAfter (row-wise filling)
+		if lastRow > self.nextRow or (lastRow == self.nextRow and lastCol >= self.nextCol):
+			self.nextRow = lastRow
+			self.nextCol = lastCol + 1
+			if self.nextCol >= self.cols:
+				self.nextCol = 0
+				self.nextRow += 1
+
+
+	def addNext(self):
+		""" Adds a 1x1 item at the next free position and returns that position """
+		row, col = self.nextRow, self.nextCol
+		self.add(row, col)
+		return row, col
+
+
+def planLayout(divies, dims, key=None):
+	""" Returns the placement plan for the given divies and widget dims. Given a key that
+	already identifies the panel (ie. the hash of its file), plans are memoized under it.
+	Hashing the divies and dims themselves would cost as much as planning them.
+	"""
+	plan = _plans_.get(key) if key is not None else None
+	if plan is None:
+		plan = compilePlan(divies, dims)
+		if key is not None:
+			_plans_[key] = plan
+	return plan
+
+
+def compilePlan(divies, dims):
+	""" Walks the divies and computes where every widget and group box goes. This is the
+	row/col arithmetic createLayout used to do while building the Qt objects.
+	divies is a list of GWENDivies (or (type, size, name) tuples), dims one [rows, cols] per widget.
+	"""
+	widgets = [None]*len(dims)
+	tabs = []
+	groups = []
+
+	grid = _GridState_()
+	page = 0			# Top level page being filled
+	group = None		# Group box being filled
+	pane = 0			# Mini tab of that group being filled
+	mini = False
+	master = None
+
+	# Same pointers as the original layout manager
+	widgetPtr = 0
+	row = col = nextRow = nextCol = newRow = newCol = rowSize = colSize = 0
+
+	for type, size, name in _divieTuples_(divies):
+
+		# assign row/col indices
+		row = nextRow
+		col = nextCol
+
+		# End Row will start grid layout on next available Row
+		if type == 'endRow':
+			if size:
+				for index in range(widgetPtr, min(widgetPtr + size, len(dims))):
+					rowSpan, colSpan = dims[index]
+					widgets[index] = [row, col, rowSpan, colSpan, page, group, pane]
+					grid.add(row, col, rowSpan, colSpan)
+					col += colSpan
+					rowSize = rowSpan if rowSpan > rowSize else rowSize
+
+				widgetPtr += size
+				nextRow += rowSize
+				row += rowSize
+				newCol = col if col > newCol else newCol
+				newRow = row if row > newRow else newRow
+
+		# End Col will start grid layout on next available col
+		elif type == 'endCol':
+			if size:
+				for index in range(widgetPtr, min(widgetPtr + size, len(dims))):
+					rowSpan, colSpan = dims[index]
+					widgets[index] = [row, col, rowSpan, colSpan, page, group, pane]
+					grid.add(row, col, rowSpan, colSpan)
+					row += rowSpan
+					colSize = colSpan if colSpan > colSize else colSize
+
+				widgetPtr += size
+				nextCol += colSize
+				col += colSize
+				newRow = row if row > newRow else newRow
+				newCol = col if col > newCol else newCol
+
+		# Adjust grid layout to start at new row
+		elif type == 'newRow':
+			nextCol = 0
+			nextRow = newRow
+
+		# Adjust grid layout to start at new col
+		elif type == 'newCol':
+			nextRow = 0
+			nextCol = newCol
+
+		# Current grid becomes a tab (a mini tab inside a group) and a new grid starts
+		elif type == 'makeTab':
+			if not mini:
+				tabs.append(name)
+				page += 1
+			else:
+				groups[group][6].append(name)
+				pane += 1
+			grid = _GridState_()
+			row=col=nextRow=nextCol=newRow=newCol=rowSize=colSize = 0
+
+		# Widgets after this call go into a group box with its own grid
+		elif type == 'startGroup':
+			master = (grid, nextRow, nextCol, newRow, newCol)
+			mini = True
+			group = len(groups)
+			pane = 0
+			groups.append([name, page, 0, 0, 1, 1, [], None, None])
+
+			row=col=nextRow=nextCol=newRow=newCol=rowSize=colSize = 0
+			grid = _GridState_()
+
+		# Ends the current group box and places it in the grid it was started in
+		elif type == 'endGroup':
+			if master is None:
+				raise ValueError('endGroup called without a matching startGroup.')
+			masterGrid, masterNextRow, masterNextCol, masterNewRow, masterNewCol = master
+			entry = groups[group]
+
+			# Mini tabs of the group go in the next free cell of the group's grid
+			if entry[6]:
+				entry[7], entry[8] = grid.addNext()
+
+			if not size:
+				rowSpan, colSpan = grid.rows, grid.cols
+			else:
+				rowSpan, colSpan = size[0], size[1]
+			entry[2:6] = [masterNextRow, masterNextCol, rowSpan, colSpan]
+			masterGrid.add(masterNextRow, masterNextCol, rowSpan, colSpan)
+			nextCol = masterNextCol + colSpan
+			newRow = rowSpan + masterNextRow if rowSpan + masterNextRow > masterNewRow else masterNewRow
+
+			# Update necessary index values
+			newCol = nextCol if nextCol > masterNewCol else masterNewCol
+
+			if not nextCol >= newCol:
+				nextRow = masterNextRow
+
+			# Back to the grid the group was started in
+			grid = masterGrid
+			mini = False
+			group = None
+			pane = 0
+			master = None
+
+		# Corner Case Fix
+		if nextCol >= newCol:
+			nextRow = 0
+			newCol = nextCol
+
+		if nextRow >= newRow:
+			nextCol = 0
+			newRow = nextRow
+
+	return {'widgets': widgets, 'tabs': tabs, 'groups': groups}
+
+
+def _divieTuples_(divies):
+	""" Accepts GWENDivies objects or (type, size, name) tuples """
+	return [tuple(divie) if isinstance(divie, (tuple, list)) else (divie.type, divie.size, divie.name) for divie in divies]
@@ -0,0 +1,199 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# GWEN_Panel.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# Declarative panel files. A panel is a JSON (.json) or TOML (.toml) file listing the
+# same add* and divies calls a GWEN script would make:
+#
+#   {
+#     "title": "Pump Panel",
+#     "lazyTabs": true,
+#     "items": [
+#       {"add": "Button", "id": "start", "callback": "pumps.start"},
+#       {"add": "Indicator", "id": "flow", "default": 0, "label": "Flow"},
+#       "endRow",
+#       {"divie": "makeTab", "name": "Pumps"}
+#     ]
+#   }
+#
+# "add" names a GWENGui.add* method (Button -> addButton), "divie" one of the divies calls
+# and every other key is passed as a keyword argument. A bare string is a divie without
+# arguments. "title" and "lazyTabs" are passed to GWENGui. Arguments named callback (or
+# ending in Callback) are dotted names, resolved against the callbacks dict given to
+# loadPanel first and then imported.
+#
+# loadPanel keeps a JSON file of the parsed calls and their layout plan, named after the
+# hash of the panel file and cache_format, so restarting a large panel skips planning (and
+# TOML parsing). Nothing in the cache is hashed or executed again on a hit.
+#
+# Dependencies
+import os
+import json
+import inspect
+import hashlib
+import importlib
+
+# Bump whenever the cached data (or the dims add* methods give widgets) changes, cached
+# plans are only found under the current format
+cache_format = 4
+cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'gwen', 'panels')
+
+divie_calls = ('endRow', 'endCol', 'newRow', 'newCol', 'makeTab', 'startGroup', 'endGroup')
+
+
+def loadPanel(path, callbacks=None, cacheDir=cache_dir):
+	""" Builds a GWENGui from a panel file and returns it (call launch() to show it).
+	callbacks maps dotted names used in the file to functions. Set cacheDir to None
+	to always parse and plan from scratch.
+	"""
+	from GWEN_GuiEngine import GWENGui
+	from GWEN_Layout import planLayout
+
+	with open(path, 'rb') as file:
+		data = file.read()
+	key = hashlib.sha1(data).hexdigest()
+
+	cached = _readCache_(cacheDir, key)
+	if cached is None:
+		settings, calls = panelCalls(_parse_(data, path))
+		plan = None
+	else:
+		settings, calls, plan = cached
+
+	gui = GWENGui(**settings)
+	signatures = dict()
+	for index, (method, kwargs) in enumerate(calls):
+		kwargs = {name: _resolve_(value, callbacks) if _isCallback_(name) else value for name, value in kwargs.items()}
+		function = getattr(gui, method, None)
+		if function is None:
+			raise ValueError('{}: item {} ({}) is invalid: GWENGui has no {}.'.format(path, index, method, method))
+		# Only arguments that do not fit the method make the item invalid, errors raised
+		# while building the widget are left alone
+		if method not in signatures:
+			signatures[method] = inspect.signature(function)
+		try:
+			signatures[method].bind(**kwargs)
+		except TypeError as error:
+			raise ValueError('{}: item {} ({}) is invalid: {}'.format(path, index, method, error)) from error
+		function(**kwargs)
+
+	# createLayout would add this itself, the plan has to include it
+	if not gui.divies:
+		gui.endCol()
+
+	# The file hash and cache_format identify the plan, only a cache that does not even
+	# cover these widgets is thrown away
+	if plan is None or len(plan['widgets']) != len(gui.widgets):
+		plan = planLayout(gui.divies, [widget.dim for widget in gui.widgets], key)
+		_writeCache_(cacheDir, key, {'settings': settings, 'calls': calls, 'plan': plan})
+	gui.layoutPlan = plan
+	return gui
+
+
+def readPanel(path):
+	""" Parses a panel file. Returns (settings, calls): the GWENGui arguments and a list of (method, kwargs) """
+	with open(path, 'rb') as file:
+		return panelCalls(_parse_(file.read(), path))
+
+
+def panelCalls(definition):
+	""" Turns a parsed panel definition into (settings, [(method, kwargs)]). Raises ValueError on bad items """
+	if not isinstance(definition, dict) or not isinstance(definition.get('items'), list):
+		raise ValueError('A panel needs an "items" list.')
+
+	calls = []
+	for index, item in enumerate(definition['items']):
+		if isinstance(item, str):
+			item = {'divie': item}
+		if not isinstance(item, dict):
+			raise ValueError('Panel item {} must be a string or a table, not {}.'.format(index, type(item).__name__))
+
+		kwargs = dict(item)
+		add = kwargs.pop('add', None)
+		divie = kwargs.pop('divie', None)
+		if (add is None) == (divie is None):
+			raise ValueError('Panel item {} needs exactly one of "add" or "divie".'.format(index))
+
+		if divie is not None:
+			if divie not in divie_calls:
+				raise ValueError('Panel item {}: unknown divie {}. Use one of {}.'.format(index, divie, divie_calls))
+			method = divie
+		else:
+			method = add if add.startswith('add') else 'add' + add
+		calls.append((method, kwargs))
+
+	settings = {'title': definition.get('title', 'GWENGui'), 'lazyTabs': bool(definition.get('lazyTabs', False))}
+	return settings, calls
+
+
+def _parse_(data, path):
+	if path.lower().endswith('.toml'):
+		try:
+			import tomllib
+		except ImportError:
+			# Python < 3.11
+			try:
+				import tomli as tomllib
+			except ImportError:
+				raise ImportError('TOML panels need Python 3.11+ or the tomli package. Use JSON instead.')
+		return tomllib.loads(data.decode())
+	return json.loads(data.decode())
+
+
+def _isCallback_(name):
+	return name == 'callback' or name.endswith('Callback')
+
+
+def _resolve_(name, callbacks):
+	""" Returns the function a dotted name refers to """
+	if not isinstance(name, str):
+		return name
+	if callbacks and name in callbacks:
+		return callbacks[name]
+	module, _, attribute = name.rpartition('.')
+	if not module:
+		raise ValueError('Callback {} is not in the callbacks given and is not a dotted name.'.format(name))
+	return getattr(importlib.import_module(module), attribute)
+
+
+def _cachePath_(cacheDir, key):
+	return os.path.join(cacheDir, '{}-{}.json'.format(key, cache_format))
+
+
+def _readCache_(cacheDir, key):
+	""" Returns (settings, calls, plan) from the cache, or None """
+	if not cacheDir:
+		return None
+	try:
+		with open(_cachePath_(cacheDir, key)) as file:
+			entry = json.load(file)
+		return entry['settings'], [(method, kwargs) for method, kwargs in entry['calls']], entry['plan']
+	except (OSError, ValueError, KeyError, TypeError):
+		return None
+
+
+def _writeCache_(cacheDir, key, entry):
+	# Losing the cache only costs the next launch a parse
+	if not cacheDir:
+		return
+	path = _cachePath_(cacheDir, key)
+	try:
+		# Values JSON has no type for (ie. TOML dates) are not cached
+		text = json.dumps(entry, separators=(',', ':'))
+		os.makedirs(cacheDir, exist_ok=True)
+		with open(path + '.tmp', 'w') as file:
+			file.write(text)
+		os.replace(path + '.tmp', path)
+	except (OSError, TypeError, ValueError):
+		pass
@@ -0,0 +1,252 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# GWEN_Profiler.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# Opt-in profiler for a GWENGui, created by GWENGui.enableProfiler. It times:
+#   update slots 		per slot and widget id (updatePlot / 'voltage', ...)
+#   button callbacks 	per button id (buttons added with a callback)
+#   createLayout
+#   paint 				paintEvent of every plot
+# Each timing keeps a count, a total, a maximum and a histogram with 4 bins per decade
+# from 1 us to 10 s. The last traceCapacity events are kept for a Chrome trace
+# (chrome://tracing or https://ui.perfetto.dev).
+#
+# The profiler only installs instance-level wrappers while it runs; a Gui without one
+# runs the plain class methods.
+#
+# Dependencies
+import os
+import json
+import time
+import bisect
+import threading
+import collections
+from PyQt5 import QtCore
+
+# Histogram bin edges in seconds: 1 us to 10 s, 4 bins per decade
+histogram_edges = tuple(10.0**(power/4.0) for power in range(-24, 5))
+
+# Update slots of GWENGui that are timed. updateWidget is left out, the slot it routes to is timed
+profiled_slots = ('updateIndicator', 'updateLog', 'updatePlot', 'appendData', 'updateMatPlot', 'updateLED', 'updateStackPlot', 'updateFrame', 'updateTable', 'updateTableColumn')
+# Widgets whose paintEvent is timed, by their update slot
+painted_slots = ('updatePlot', 'appendData', 'updateMatPlot', 'updateStackPlot', 'updateFrame')
+
+
+class GWENTiming():
+	""" Count, total, maximum and histogram of the durations of one thing """
+	__slots__ = ('count', 'total', 'max', 'bins')
+
+	def __init__(self):
+		self.count = 0
+		self.total = 0.0
+		self.max = 0.0
+		self.bins = [0]*(len(histogram_edges) + 1)
+
+
+	def add(self, duration):
+		self.count += 1
+		self.total += duration
+		if duration > self.max:
+			self.max = duration
+		self.bins[bisect.bisect(histogram_edges, duration)] += 1
+
+
+	def summary(self):
+		return {
+			'count': 	self.count,
+			'total': 	self.total,
+			'mean': 	self.total/self.count if self.count else 0.0,
+			'max': 		self.max,
+			'histogram': list(self.bins),
+		}
+
+
+class GWENProfiler():
+	""" Collects timings for a GWENGui. Everything runs in the GUI thread """
+	def __init__(self, gui, traceCapacity=100000):
+		self.gui = gui
+		# (category, name) -> GWENTiming, ie. ('updatePlot', 'voltage') or ('paint', 'voltage')
+		self.timings = collections.defaultdict(GWENTiming)
+		# (name, category, start, duration) of the latest events
+		self.trace = collections.deque(maxlen=traceCapacity)
+		self.origin = time.perf_counter()
+
+		self.started = dict()			# button -> start of its running callback
+		self.painted = dict()			# widget painted -> id
+		self.statusTimer = None
+		self.lastStatus = dict()		# (category, name) -> (count, total) at the last status update
+		self.running = False
+
+
+	def start(self, statusInterval=None):
+		""" Installs the wrappers. With statusInterval (ms), a summary is shown in the status bar """
+		if self.running:
+			return
+		self.running = True
+		self.gui.addSlotWrapper(self._wrap_, profiled_slots + ('createLayout',))
+		self.gui.addCallbackHook(self._begin_, self._end_)
+		for widget in self.gui.widgets:
+			self.watch(widget)
+		if statusInterval:
+			self.statusTimer = QtCore.QTimer(self.gui)
+			self.statusTimer.timeout.connect(self.showStatus)
+			self.statusTimer.start(statusInterval)
+
+
+	def stop(self):
+		""" Removes every wrapper, the timings are kept """
+		if not self.running:
+			return
+		self.running = False
+		self.gui.removeSlotWrapper(self._wrap_)
+		self.gui.removeCallbackHook(self._begin_, self._end_)
+		for widget in self.painted:
+			del widget.paintEvent
+		self.painted = dict()
+		if self.statusTimer is not None:
+			self.statusTimer.stop()
+			self.statusTimer.deleteLater()
+			self.statusTimer = None
+
+
+	def watch(self, widget):
+		""" Starts timing the painting of a widget (done by start and for lazy widgets once built) """
+		if not self.running or widget is None or hasattr(widget, 'make'):
+			# Stand-ins are watched when the engine builds them
+			return
+		if getattr(widget, 'updateSlot', None) in painted_slots:
+			# Matplotlib plots paint their canvas
+			painted = getattr(widget, 'matplotlibFig', widget)
+			if painted not in self.painted:
+				self.painted[painted] = widget.id
+				painted.paintEvent = self._timed_(painted.paintEvent, 'paint', widget.id)
+
+
+	def add(self, category, name, start, duration):
+		""" Records one event, start is a time.perf_counter() value """
+		self.timings[(category, name)].add(duration)
+		self.trace.append((name, category, start, duration))
+
+
+	def reset(self):
+		""" Clears the timings and the trace """
+		self.timings.clear()
+		self.trace.clear()
+		self.lastStatus = dict()
+
+
+	def stats(self):
+		""" Returns {category: {name: {count, total, mean, max, histogram}}} with times in seconds """
+		stats = dict()
+		for (category, name), timing in self.timings.items():
+			stats.setdefault(category, dict())[str(name)] = timing.summary()
+		return stats
+
+
+	def exportJSON(self, path):
+		""" Writes stats() and the histogram bin edges to path """
+		with open(path, 'w') as file:
+			json.dump({'histogramEdges': list(histogram_edges), 'stats': self.stats()}, file, indent=1)
+
+
+	def exportTrace(self, path):
+		""" Writes the traced events to path in the Chrome trace event format """
+		pid = os.getpid()
+		tid = threading.get_ident() & 0xffff
+		events = [{
+			'name': 	str(name),
+			'cat': 		category,
+			'ph': 		'X',
+			'ts': 		(start - self.origin)*1e6,
+			'dur': 		duration*1e6,
+			'pid': 		pid,
+			'tid': 		tid,
+		} for name, category, start, duration in self.trace]
+		with open(path, 'w') as file:
+			json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+
+
+	def summary(self, top=3):
+		""" One line: calls per second and time share since the last call, with the top timings """
+		now = time.perf_counter()
+		elapsed = now - self.lastStatus.get(None, (self.origin,))[0]
+		changes = []
+		for key, timing in self.timings.items():
+			count, total = self.lastStatus.get(key, (0, 0.0))
+			if timing.count > count:
+				changes.append((timing.total - total, timing.count - count, key))
+			self.lastStatus[key] = (timing.count, timing.total)
+		self.lastStatus[None] = (now,)
+		if not changes:
+			return 'Profiler: idle.'
+		changes.sort(reverse=True)
+		busy = sum(total for total, count, key in changes)
+		calls = sum(count for total, count, key in changes if key[0] != 'paint')
+		parts = ['{:.0f} calls/s'.format(calls/elapsed), 'busy {:.0%}'.format(busy/elapsed)]
+		for total, count, (category, name) in changes[:top]:
+			parts.append('{} {}: {:.2f} ms x{}'.format(category, name, 1000*total/count, count))
+		return ' | '.join(parts)
+
+
+	def showStatus(self):
+		self.gui.statusBar().showMessage(self.summary())
+
+
+	def _wrap_(self, slot, name):
+		""" Slot wrapper given to GWENGui.addSlotWrapper """
+		if name == 'createLayout':
+			return self._timed_(slot, 'layout', name)
+		timings = self.timings
+		trace = self.trace
+		clock = time.perf_counter
+		def timed(id, *args, **kwargs):
+			start = clock()
+			try:
+				return slot(id, *args, **kwargs)
+			finally:
+				duration = clock() - start
+				key = getattr(id, 'id', id)
+				timings[(name, key)].add(duration)
+				trace.append((key, name, start, duration))
+		timed.__name__ = slot.__name__
+		timed.__doc__ = slot.__doc__
+		return timed
+
+
+	def _timed_(self, function, category, name):
+		""" Returns function, timed as (category, name) """
+		key = (category, name)
+		timings = self.timings
+		trace = self.trace
+		clock = time.perf_counter
+		def timed(*args, **kwargs):
+			start = clock()
+			try:
+				return function(*args, **kwargs)
+			finally:
+				duration = clock() - start
+				timings[key].add(duration)
+				trace.append((name, category, start, duration))
+		timed.__name__ = getattr(function, '__name__', category)
+		return timed
+
+
+	def _begin_(self, button):
+		self.started[button] = time.perf_counter()
+
+
+	def _end_(self, button):
+		start = self.started.pop(button, None)
+		if start is not None:
+			self.add('callback', button.id, start, time.perf_counter() - start)
@@ -0,0 +1,367 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# GWEN_Recorder.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# Session recorder. GWENRecorder wraps the update slots of a GWENGui instance and streams
+# every call (timestamp, slot, widget id, arguments) to append-only binary files. Arrays
+# are stored as raw NumPy buffers. The update slot only snapshots its arguments into a
+# bounded queue, encoding and writing happen on a background thread.
+#
+# File layout (little endian):
+#   header 	magic 'GWENREC1', float64 wall clock time the file was started
+#   record 	uint32 length of the rest of the record, float64 time.time(), uint8 slot index
+#			(see slots), uint8 argument count, id value, argument values, keyword value
+#   value 	one tag byte followed by its data:
+#				N None, T/F bool, i int64, f float64, s uint32 length + utf-8,
+#				a array: uint8 length + dtype str, uint8 ndim, uint32 shape[ndim], raw C-order data
+#				  (lists of numbers are stored as arrays)
+#				r structured array: uint32 length + dtype descr literal, then as a
+#				l list, t tuple: uint32 count + values
+#				d dict: uint32 count + key, value pairs
+#				p uint32 length + pickle, only with allowPickle (anything else)
+#
+# Pickle runs code when loaded, so a recording is only pickled into or read back from with
+# an explicit allowPickle. Without it, values that have no tag are skipped with their record.
+#
+# Next to every file, a .idx sidecar lists (float64 time, uint64 offset) of the first
+# record after each indexInterval seconds, so a reader can seek without scanning.
+# Files rotate once they reach maxFileSize: run.gwrec, run.0001.gwrec, run.0002.gwrec, ...
+# Starting a recording deletes any earlier recording (and its rotated files) at that path.
+#
+# Dependencies
+import os
+import time
+import queue
+import glob
+import struct
+import ast
+import pickle
+import threading
+import traceback
+import numpy as np
+
+# Slots that are recorded. The index in this tuple is what is stored in the file, only append to it
+slots = ('updateIndicator', 'updateLog', 'updatePlot', 'appendData', 'updateMatPlot', 'updateLED', 'updateStackPlot', 'updateFrame', 'updateTable', 'updateTableColumn')
+
+magic = b'GWENREC1'
+file_header = struct.Struct('<8sd')
+record_header = struct.Struct('<IdBB')
+index_dtype = np.dtype([('t', '<f8'), ('offset', '<u8')])
+_double_ = struct.Struct('<d')
+_long_ = struct.Struct('<q')
+_uint_ = struct.Struct('<I')
+
+# Encoded widget ids
+_ids_ = dict()
+
+
+class GWENRecorder():
+	""" Records the update slot calls of a GWENGui to disk. Created by GWENGui.startRecording.
+	At most maxMemory bytes of snapshots wait for the writer thread; updates arriving while
+	that much is pending are dropped and counted instead of stalling the GUI thread.
+	"""
+	def __init__(self, gui, path, maxFileSize=256*2**20, maxMemory=64*2**20, indexInterval=0.1, allowPickle=False):
+		self.gui = gui
+		self.path = path
+		self.maxFileSize = maxFileSize
+		self.maxMemory = maxMemory
+		self.indexInterval = indexInterval
+		self.allowPickle = allowPickle
+
+		self.queue = queue.SimpleQueue()
+		self.pending = 0				# Bytes waiting in the queue
+		self.lock = threading.Lock()
+		self.files = []					# Every file written so far
+		self.thread = None
+
+		# Statistics
+		self.recorded = 0
+		self.dropped = 0
+		self.unencodable = 0			# Records skipped for a value without a tag (see allowPickle)
+		self.written = 0				# Bytes
+		self.error = None
+
+
+	def start(self):
+		""" Wraps the update slots of the Gui and starts the writer thread """
+		if self.thread is not None:
+			return
+		self._removeOld_()
+		self.thread = threading.Thread(target=self._write_, name='GWENRecorder', daemon=True)
+		self.thread.start()
+		self.gui.addSlotWrapper(self._wrap_, slots)
+
+
+	def stop(self):
+		""" Restores the slots and waits until everything queued is on disk """
+		self.gui.removeSlotWrapper(self._wrap_)
+		if self.thread is not None:
+			self.queue.put(None)
+			self.thread.join()
+			self.thread = None
+
+
+	def stats(self):
+		return {
+			'recorded': self.recorded,
+			'dropped': 	self.dropped,
+			'unencodable': self.unencodable,
+			'pending': 	self.pending,
+			'written': 	self.written,
+			'files': 	list(self.files),
+			'error': 	repr(self.error) if self.error else None,
+		}
+
+
+	def _wrap_(self, slot, name):
+		""" Returns slot with recording added. This is the hot path: only snapshot and enqueue """
+		code = slots.index(name)
+		def recorded(id, *args, **kwargs):
+			result = slot(id, *args, **kwargs)
+			size = 64
+			snapshot = []
+			for arg in args:
+				if isinstance(arg, np.ndarray):
+					# The caller may reuse its buffer, so copy it
+					arg = arg.copy()
+					size += arg.nbytes
+				elif isinstance(arg, list):
+					arg = list(arg)
+				snapshot.append(arg)
+			if self.pending + size > self.maxMemory:
+				self.dropped += 1
+				return result
+			with self.lock:
+				self.pending += size
+			self.queue.put((time.time(), code, getattr(id, 'id', id), snapshot, kwargs, size))
+			self.recorded += 1
+			return result
+		recorded.__name__ = slot.__name__
+		recorded.__doc__ = slot.__doc__
+		return recorded
+
+
+	def _filePath_(self, number):
+		if not number:
+			return self.path
+		root, ext = os.path.splitext(self.path)
+		return '{}.{:04d}{}'.format(root, number, ext)
+
+
+	def _removeOld_(self):
+		""" Deletes an earlier recording at the same path, rotated files and indexes included.
+		Left in place, a reader would chain its old rotated files after the new ones
+		"""
+		root, ext = os.path.splitext(self.path)
+		rotated = glob.glob(glob.escape(root) + '.[0-9][0-9][0-9][0-9]' + glob.escape(ext))
+		for file in [self.path] + rotated:
+			for path in (file, file + '.idx'):
+				if os.path.isfile(path):
+					os.remove(path)
+
+
+	def _write_(self):
+		""" Writer thread: encodes records and appends them, rotating files by size """
+		file = index = None
+		nextIndex = 0.0
+		try:
+			while True:
+				item = self.queue.get()
+				if item is None:
+					break
+				t, code, id, args, kwargs, size = item
+				with self.lock:
+					self.pending -= size
+
+				try:
+					data = encodeRecord(t, code, id, args, kwargs, self.allowPickle)
+				except TypeError:
+					self.unencodable += 1
+					continue
+				if file is None or file.tell() + len(data) > self.maxFileSize:
+					if file is not None:
+						file.close()
+						index.close()
+					path = self._filePath_(len(self.files))
+					self.files.append(path)
+					file = open(path, 'wb')
+					index = open(path + '.idx', 'wb')
+					file.write(file_header.pack(magic, t))
+					nextIndex = 0.0
+
+				if t >= nextIndex:
+					index.write(np.array((t, file.tell()), index_dtype).tobytes())
+					nextIndex = t + self.indexInterval
+				file.write(data)
+				self.written += len(data)
+
+				# Keep the files readable while recording when the queue runs dry
+				if self.queue.empty():
+					file.flush()
+					index.flush()
+		except Exception as error:
+			self.error = error
+			traceback.print_exc()
+		finally:
+			if file is not None:
+				file.close()
+				index.close()
+
+
+######################################## Encoding ###############################################
+
+def encodeRecord(t, code, id, args, kwargs, allowPickle=False):
+	""" Returns the bytes of one record. Raises TypeError for a value that can only be
+	pickled, unless allowPickle
+	"""
+	# Ids repeat all the time, encode each one once
+	encoded = _ids_.get(id) if type(id) is str else None
+	if encoded is None:
+		parts = [None]
+		encodeValue(id, parts, allowPickle)
+		encoded = b''.join(parts[1:])
+		if type(id) is str:
+			_ids_[id] = encoded
+	parts = [None, encoded]
+	for arg in args:
+		encodeValue(arg, parts, allowPickle)
+	encodeValue(kwargs or None, parts, allowPickle)
+	# The length does not count the length field itself
+	length = record_header.size - 4 + sum(len(part) for part in parts[1:])
+	parts[0] = record_header.pack(length, t, code, len(args))
+	return b''.join(parts)
+
+
+def encodeValue(value, parts, allowPickle=False):
+	""" Appends the encoding of value to the list of bytes parts """
+	# Exact type checks first, this runs for every argument of every record
+	kind = type(value)
+	if kind is float:
+		parts.append(b'f' + _double_.pack(value))
+	elif kind is int and -2**63 <= value < 2**63:
+		parts.append(b'i' + _long_.pack(value))
+	elif kind is str:
+		data = value.encode()
+		parts.append(b's' + _uint_.pack(len(data)))
+		parts.append(data)
+	elif value is None:
+		parts.append(b'N')
+	elif kind is bool:
+		parts.append(b'T' if value else b'F')
+	elif isinstance(value, np.ndarray) and not value.dtype.hasobject:
+		shape = struct.pack('<B{}I'.format(value.ndim), value.ndim, *value.shape)
+		if value.dtype.names is None:
+			dtype = value.dtype.str.encode()
+			parts.append(b'a' + struct.pack('<B', len(dtype)) + dtype + shape)
+		else:
+			descr = repr(np.lib.format.dtype_to_descr(value.dtype)).encode()
+			parts.append(b'r' + _uint_.pack(len(descr)) + descr + shape)
+		parts.append(np.ascontiguousarray(value).tobytes())
+	elif isinstance(value, np.generic):
+		encodeValue(value.item(), parts, allowPickle)
+	elif kind is list or kind is tuple:
+		# Lists of numbers (ie. updatePlot(id, x, y) with lists) are stored like arrays
+		array = np.asarray(value) if kind is list and value else None
+		if array is not None and array.dtype.kind in 'biuf':
+			encodeValue(array, parts, allowPickle)
+			return
+		parts.append((b'l' if kind is list else b't') + _uint_.pack(len(value)))
+		for item in value:
+			encodeValue(item, parts, allowPickle)
+	elif kind is dict:
+		parts.append(b'd' + _uint_.pack(len(value)))
+		for key, item in value.items():
+			encodeValue(key, parts, allowPickle)
+			encodeValue(item, parts, allowPickle)
+	elif allowPickle:
+		data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+		parts.append(b'p' + _uint_.pack(len(data)))
+		parts.append(data)
+	else:
+		raise TypeError('Cannot record a {} without allowPickle.'.format(kind.__name__))
+
+
+def decodeValue(buffer, offset, allowPickle=False):
+	""" Decodes the value at offset of buffer (bytes, mmap, ...). Returns (value, next offset).
+	Arrays are returned as views of the buffer where possible, copy them to keep them.
+	"""
+	tag = buffer[offset:offset+1]
+	offset += 1
+	if tag == b'N':
+		return None, offset
+	if tag == b'T':
+		return True, offset
+	if tag == b'F':
+		return False, offset
+	if tag == b'i':
+		return struct.unpack_from('<q', buffer, offset)[0], offset + 8
+	if tag == b'f':
+		return struct.unpack_from('<d', buffer, offset)[0], offset + 8
+	if tag == b's':
+		length = struct.unpack_from('<I', buffer, offset)[0]
+		offset += 4
+		return bytes(buffer[offset:offset+length]).decode(), offset + length
+	if tag == b'a' or tag == b'r':
+		if tag == b'a':
+			length = buffer[offset]
+			dtype = np.dtype(bytes(buffer[offset+1:offset+1+length]).decode())
+			offset += 1 + length
+		else:
+			# A literal, never evaluated as code
+			length = struct.unpack_from('<I', buffer, offset)[0]
+			dtype = np.lib.format.descr_to_dtype(ast.literal_eval(bytes(buffer[offset+4:offset+4+length]).decode()))
+			offset += 4 + length
+		ndim = buffer[offset]
+		shape = struct.unpack_from('<{}I'.format(ndim), buffer, offset + 1)
+		offset += 1 + 4*ndim
+		count = int(np.prod(shape))
+		array = np.frombuffer(buffer, dtype, count, offset).reshape(shape)
+		return array, offset + count*dtype.itemsize
+	if tag == b'l' or tag == b't':
+		count = struct.unpack_from('<I', buffer, offset)[0]
+		offset += 4
+		items = []
+		for item in range(count):
+			value, offset = decodeValue(buffer, offset, allowPickle)
+			items.append(value)
+		return (items if tag == b'l' else tuple(items)), offset
+	if tag == b'd':
+		count = struct.unpack_from('<I', buffer, offset)[0]
+		offset += 4
+		items = dict()
+		for item in range(count):
+			key, offset = decodeValue(buffer, offset, allowPickle)
+			items[key], offset = decodeValue(buffer, offset, allowPickle)
+		return items, offset
+	if tag == b'p':
+		if not allowPickle:
+			raise ValueError('Record at offset {} holds a pickled value, only read it with allowPickle if the file is trusted.'.format(offset - 1))
+		length = struct.unpack_from('<I', buffer, offset)[0]
+		offset += 4
+		return pickle.loads(buffer[offset:offset+length]), offset + length
+	raise ValueError('Corrupt record, unknown value tag {!r} at offset {}.'.format(tag, offset - 1))
+
+
+def decodeRecord(buffer, offset, allowPickle=False):
+	""" Decodes the record at offset. Returns (t, slot name, id, args, kwargs, next offset) """
+	length, t, code, count = record_header.unpack_from(buffer, offset)
+	end = offset + 4 + length
+	offset += record_header.size
+	id, offset = decodeValue(buffer, offset, allowPickle)
+	args = []
+	for arg in range(count):
+		value, offset = decodeValue(buffer, offset, allowPickle)
+		args.append(value)
+	kwargs, offset = decodeValue(buffer, offset, allowPickle)
+	return t, slots[code], id, args, kwargs or {}, end
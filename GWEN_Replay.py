@@ -0,0 +1,272 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# GWEN_Replay.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# Plays a recording made by GWEN_Recorder back into a GWENGui holding the same panel.
+# Recording files are memory-mapped and read record by record; seeking uses the .idx
+# time index, so only the records after the closest index entry are skipped over.
+# Playback runs from a QTimer in the GUI thread at real time, N times real time or as
+# fast as possible (speed 0).
+#
+#   python GWEN_Replay.py run.gwrec panel.json --speed 4
+#
+# Dependencies
+import os
+import mmap
+import time
+import traceback
+import numpy as np
+from PyQt5 import QtCore
+from GWEN_Recorder import decodeRecord, file_header, record_header, index_dtype
+
+
+def recordingFiles(path):
+	""" Returns the files of a recording in order: path followed by its rotated files """
+	if not isinstance(path, str):
+		return list(path)
+	files = [path]
+	root, ext = os.path.splitext(path)
+	while os.path.isfile('{}.{:04d}{}'.format(root, len(files), ext)):
+		files.append('{}.{:04d}{}'.format(root, len(files), ext))
+	return files
+
+
+class GWENReplay(QtCore.QObject):
+	""" Replays a recording into gui. speed is the playback rate (1 real time, 4 four times
+	faster, 0 as fast as possible). At most batchSize records are applied per timer tick so
+	the event loop keeps running even when playback falls behind. Pickled values are only
+	loaded with allowPickle, for recordings from a trusted source.
+	"""
+	finished = QtCore.pyqtSignal()
+
+	def __init__(self, gui, path, speed=1.0, batchSize=1000, allowPickle=False):
+		# Call parent constructor
+		super().__init__(gui)
+		self.gui = gui
+		self.speed = speed
+		self.batchSize = batchSize
+		self.allowPickle = allowPickle
+
+		self.files = recordingFiles(path)
+		self.maps = []
+		for file in self.files:
+			with open(file, 'rb') as handle:
+				self.maps.append(mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))
+
+		# Time index of every file, merged into (t, file, offset) arrays
+		times, numbers, offsets = [], [], []
+		for number, file in enumerate(self.files):
+			index = np.fromfile(file + '.idx', index_dtype) if os.path.isfile(file + '.idx') else np.zeros(0, index_dtype)
+			times.append(index['t'])
+			numbers.append(np.full(len(index), number))
+			offsets.append(index['offset'])
+		self.indexTimes = np.concatenate(times)
+		self.indexFiles = np.concatenate(numbers)
+		self.indexOffsets = np.concatenate(offsets)
+
+		# Session time of the first record
+		self.origin = file_header.unpack_from(self.maps[0], 0)[1]
+		self.cursor = (0, file_header.size)
+		self.next = None			# Record at the cursor, once decoded
+
+		# Playback clock: session time anchor and the wall clock time it was set at
+		self.anchor = self.origin
+		self.anchorClock = None
+
+		# Statistics
+		self.applied = 0
+		self.errors = 0
+
+		self.timer = QtCore.QTimer(self)
+		self.timer.setSingleShot(True)
+		self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+		self.timer.timeout.connect(self._tick_)
+
+
+	def play(self):
+		""" Starts (or resumes) playback from the current position """
+		self.anchorClock = time.perf_counter()
+		self.timer.start(0)
+
+
+	def pause(self):
+		""" Stops playback, play() continues from here """
+		if self.anchorClock is not None:
+			self.anchor = self._now_()
+			self.anchorClock = None
+		self.timer.stop()
+
+
+	def isPlaying(self):
+		return self.anchorClock is not None
+
+
+	def setSpeed(self, speed):
+		""" Changes the playback rate without jumping (0 plays as fast as possible) """
+		playing = self.isPlaying()
+		self.pause()
+		self.speed = speed
+		if playing:
+			self.play()
+
+
+	def position(self):
+		""" Seconds since the start of the recording """
+		return self._now_() - self.origin
+
+
+	def seek(self, seconds):
+		""" Moves to seconds after the start of the recording. Updates in between are skipped,
+		widgets show their new value with their next recorded update.
+		"""
+		target = self.origin + seconds
+		entry = np.searchsorted(self.indexTimes, target, 'right') - 1
+		if entry < 0:
+			self.cursor = (0, file_header.size)
+		else:
+			self.cursor = (int(self.indexFiles[entry]), int(self.indexOffsets[entry]))
+		self.next = None
+
+		# Skip the records before target using only their headers
+		while True:
+			number, offset = self.cursor
+			buffer = self.maps[number]
+			if offset >= len(buffer):
+				if number + 1 >= len(self.maps):
+					break
+				self.cursor = (number + 1, file_header.size)
+				continue
+			length, t = record_header.unpack_from(buffer, offset)[:2]
+			if t >= target:
+				break
+			self.cursor = (number, offset + 4 + length)
+
+		self.anchor = target
+		if self.anchorClock is not None:
+			self.anchorClock = time.perf_counter()
+
+
+	def duration(self):
+		""" Seconds from the first to the last record """
+		number = len(self.maps) - 1
+		entries = np.nonzero(self.indexFiles == number)[0]
+		offset = int(self.indexOffsets[entries[-1]]) if len(entries) else file_header.size
+		buffer = self.maps[number]
+		t = self.origin
+		while offset < len(buffer):
+			length, t = record_header.unpack_from(buffer, offset)[:2]
+			offset += 4 + length
+		return t - self.origin
+
+
+	def close(self):
+		""" Stops playback and releases the files """
+		self.pause()
+		self.next = None
+		for buffer in self.maps:
+			buffer.close()
+		self.maps = []
+
+
+	def stats(self):
+		return {
+			'position': self.position(),
+			'speed': 	self.speed,
+			'applied': 	self.applied,
+			'errors': 	self.errors,
+		}
+
+
+	def _now_(self):
+		""" Session time playback has reached """
+		if self.anchorClock is None:
+			return self.anchor
+		if not self.speed:
+			return float('inf')
+		return self.anchor + (time.perf_counter() - self.anchorClock)*self.speed
+
+
+	def _peek_(self):
+		""" Decodes the record at the cursor (once). Returns None at the end of the recording """
+		while self.next is None:
+			number, offset = self.cursor
+			buffer = self.maps[number]
+			if offset < len(buffer):
+				try:
+					self.next = decodeRecord(buffer, offset, self.allowPickle)
+				except ValueError:
+					# A pickled value without allowPickle (or a bad value), skip the record
+					self.errors += 1
+					traceback.print_exc()
+					self.cursor = (number, offset + 4 + record_header.unpack_from(buffer, offset)[0])
+			elif number + 1 < len(self.maps):
+				self.cursor = (number + 1, file_header.size)
+			else:
+				return None
+		return self.next
+
+
+	def _tick_(self):
+		""" Applies every record that is due, then waits for the next one """
+		now = self._now_()
+		for count in range(self.batchSize):
+			record = self._peek_()
+			if record is None:
+				self.anchor = self._now_() if self.speed else self.anchor
+				self.anchorClock = None
+				self.finished.emit()
+				return
+			t, slot, id, args, kwargs, end = record
+			if t > now:
+				break
+			self.next = None
+			self.cursor = (self.cursor[0], end)
+			if not self.speed:
+				self.anchor = t
+			# Arrays are views of the mapped file, widgets may keep what they are given
+			args = [arg.copy() if isinstance(arg, np.ndarray) else arg for arg in args]
+			try:
+				getattr(self.gui, slot)(id, *args, **kwargs)
+				self.applied += 1
+			except Exception:
+				# A widget missing from this panel must not end the replay
+				self.errors += 1
+				traceback.print_exc()
+		else:
+			# Behind schedule, let the event loop run and continue right away
+			self.timer.start(0)
+			return
+
+		self.timer.start(int(max(0.0, (record[0] - now)/self.speed)*1000))
+
+
+def main(argv=None):
+	import argparse
+	parser = argparse.ArgumentParser(description='Replay a GWEN recording into a panel.')
+	parser.add_argument('recording', help='first file of the recording (ie. run.gwrec)')
+	parser.add_argument('panel', help='JSON/TOML panel file the recording was made with (see GWEN_Panel)')
+	parser.add_argument('--speed', type=float, default=1.0, help='playback rate, 0 for as fast as possible (default 1)')
+	parser.add_argument('--start', type=float, default=0.0, help='seconds into the recording to start at')
+	parser.add_argument('--allow-pickle', action='store_true', help='load pickled values (runs code from the file, trusted recordings only)')
+	args = parser.parse_args(argv)
+
+	from GWEN_Panel import loadPanel
+	gui = loadPanel(args.panel)
+	replay = gui.startReplay(args.recording, args.speed, args.start, args.allow_pickle)
+	replay.finished.connect(lambda: gui.statusBar().showMessage('Replay finished ({} updates).'.format(replay.applied)))
+	gui.launch()
+
+
+if __name__ == '__main__':
+	main()
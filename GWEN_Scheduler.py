@@ -0,0 +1,270 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# GWEN_Scheduler.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# Frame-paced update scheduling used by GWEN_GuiEngine.py. Instead of touching a
+# Qt widget on every update call, the latest value per widget is recorded and all
+# dirty widgets are flushed together once per frame.
+#
+# It also provides GWENProducerQueue, the supported way to feed a GWENGui from worker
+# threads (serial readers, DAQ loops, ...) without touching Qt from those threads.
+#
+# Dependencies
+import time
+import threading
+import traceback
+import collections
+from PyQt5 import QtCore
+
+
+class GWENUpdateQueue():
+	""" Holds pending widget updates. Only the latest arguments are kept per widget and
+	update function, queued items (ie. log lines) are accumulated until the next flush.
+	"""
+	def __init__(self):
+		self.latest = dict()	# (widget, apply) -> args
+		self.queued = dict()	# (widget, apply) -> [items]
+
+		# Statistics
+		self.posted 	= 0
+		self.applied 	= 0
+		self.coalesced 	= 0
+
+
+	def post(self, widget, apply, *args):
+		""" Records apply(widget, *args), replacing any pending call to the same function """
+		self.posted += 1
+		size = len(self.latest)
+		self.latest[(widget, apply)] = args
+		# Dict did not grow, so an older value was overwritten
+		if len(self.latest) == size:
+			self.coalesced += 1
+
+
+	def postQueued(self, widget, apply, item, limit=None):
+		""" Records item, apply(widget, items) will receive all items queued since the last flush.
+		With a limit, only (at least) the last limit items are kept
+		"""
+		self.posted += 1
+		items = self.queued.get((widget, apply))
+		if items is None:
+			self.queued[(widget, apply)] = [item]
+		else:
+			items.append(item)
+			self.coalesced += 1
+			# Trim once in a while so appending stays O(1)
+			if limit and len(items) > 2*limit:
+				del items[:-limit]
+
+
+	def flush(self, widgets=None):
+		""" Applies the pending updates. If widgets is given, only updates for those widgets
+		are applied and the rest stay pending. Returns the number of updates applied.
+		"""
+		if widgets is None:
+			latest, self.latest = self.latest, dict()
+			queued, self.queued = self.queued, dict()
+		else:
+			latest = {key: self.latest.pop(key) for key in list(self.latest) if key[0] in widgets}
+			queued = {key: self.queued.pop(key) for key in list(self.queued) if key[0] in widgets}
+
+		for (widget, apply), args in latest.items():
+			apply(widget, *args)
+		for (widget, apply), items in queued.items():
+			apply(widget, items)
+
+		count = len(latest) + len(queued)
+		self.applied += count
+		return count
+
+
+	def __len__(self):
+		return len(self.latest) + len(self.queued)
+
+
+class GWENScheduler(QtCore.QObject):
+	""" Flushes a GWENUpdateQueue once per frame from a single QTimer """
+	def __init__(self, parent, interval=16):
+		# Call parent constructor
+		super().__init__(parent)
+
+		self.queue = GWENUpdateQueue()
+		self.post = self.queue.post
+		self.postQueued = self.queue.postQueued
+
+		# Statistics
+		self.frames 	= 0
+		self.lastFlush 	= 0.0
+		self.maxFlush 	= 0.0
+
+		# Single timer driving every flush
+		self.timer = QtCore.QTimer(self)
+		self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+		self.timer.setInterval(interval)
+		self.timer.timeout.connect(self.flush)
+
+
+	def start(self, interval=None):
+		""" Starts flushing. Optionally change the frame interval (ms) """
+		if interval is not None:
+			self.timer.setInterval(interval)
+		self.timer.start()
+
+
+	def stop(self):
+		""" Stops the timer and applies whatever is still pending """
+		self.timer.stop()
+		self.flush()
+
+
+	def flush(self):
+		""" Applies all pending updates. Called by the timer once per frame """
+		if not len(self.queue):
+			return
+		start = time.perf_counter()
+		self.queue.flush()
+		self.lastFlush = time.perf_counter() - start
+		self.maxFlush = max(self.maxFlush, self.lastFlush)
+		self.frames += 1
+
+
+	def stats(self):
+		""" Returns a dict of counters describing how much work the scheduler saved """
+		return {
+			'interval': 	self.timer.interval(),
+			'frames': 		self.frames,
+			'posted': 		self.queue.posted,
+			'applied': 		self.queue.applied,
+			'coalesced': 	self.queue.coalesced,
+			'pending': 		len(self.queue),
+			'lastFlush': 	self.lastFlush,
+			'maxFlush': 	self.maxFlush,
+		}
+
+
+class GWENProducerQueue(QtCore.QObject):
+	""" Bounded, thread-safe queue of (widget_id, payload) updates. push() may be called
+	from any thread; the GUI thread drains the queue in batches through a queued signal
+	and forwards every item to GWENGui.updateWidget. Must be created in the GUI thread.
+
+	When the queue is full, policy decides what happens:
+		'drop-oldest' 	discard the oldest queued update (default)
+		'drop-newest' 	discard the update being pushed
+		'block' 		wait (up to timeout seconds) for room. Never use from the GUI thread
+	"""
+	policies = ('drop-oldest', 'drop-newest', 'block')
+	ready = QtCore.pyqtSignal()
+
+	def __init__(self, gui, maxSize=10000, policy='drop-oldest', batchSize=500, timeout=None):
+		# Call parent constructor
+		super().__init__(gui)
+
+		if policy not in self.policies:
+			raise ValueError('Unknown back-pressure policy {}. Use one of {}.'.format(policy, self.policies))
+
+		self.gui 		= gui
+		self.maxSize 	= maxSize
+		self.policy 	= policy
+		self.batchSize 	= batchSize
+		self.timeout 	= timeout
+
+		self.items 		= collections.deque()
+		self.lock 		= threading.Lock()
+		self.notFull 	= threading.Condition(self.lock)
+		# True while a drain is already on its way to the GUI thread
+		self.signalled 	= False
+
+		# Statistics
+		self.pushed 	= 0
+		self.drained 	= 0
+		self.dropped 	= 0
+		self.errors 	= 0
+		self.maxDepth 	= 0
+
+		# Queued connection so drain always runs in the GUI thread
+		self.ready.connect(self.drain, QtCore.Qt.QueuedConnection)
+
+
+	def push(self, id, payload):
+		""" Queues an update for widget id. Safe to call from any thread.
+		Returns False if the update (or, for 'drop-oldest', an older one) was dropped.
+		"""
+		accepted = True
+		with self.lock:
+			if len(self.items) >= self.maxSize:
+				if self.policy == 'drop-newest':
+					self.dropped += 1
+					return False
+				elif self.policy == 'drop-oldest':
+					self.items.popleft()
+					self.dropped += 1
+					accepted = False
+				elif not self.notFull.wait_for(lambda: len(self.items) < self.maxSize, self.timeout):
+					self.dropped += 1
+					return False
+
+			self.items.append((id, payload))
+			self.pushed += 1
+			self.maxDepth = max(self.maxDepth, len(self.items))
+
+			# Only one signal is in flight at a time, the drain picks up everything queued
+			notify = not self.signalled
+			self.signalled = True
+
+		if notify:
+			self.ready.emit()
+		return accepted
+
+
+	def drain(self):
+		""" Applies up to batchSize queued updates. Runs in the GUI thread """
+		with self.lock:
+			count = min(self.batchSize, len(self.items))
+			batch = [self.items.popleft() for item in range(count)]
+			more = bool(self.items)
+			self.signalled = more
+			if self.policy == 'block':
+				self.notFull.notify_all()
+
+		for id, payload in batch:
+			try:
+				self.gui.updateWidget(id, payload)
+			except Exception:
+				# A bad update must not take the rest of the batch (or the event loop) down
+				self.errors += 1
+				traceback.print_exc()
+		self.drained += count
+
+		# Leave the event loop a chance to breathe before the next batch
+		if more:
+			self.ready.emit()
+
+
+	def depth(self):
+		""" Number of updates waiting in the queue """
+		return len(self.items)
+
+
+	def stats(self):
+		""" Returns a dict of queue counters """
+		return {
+			'depth': 	len(self.items),
+			'maxDepth': self.maxDepth,
+			'maxSize': 	self.maxSize,
+			'policy': 	self.policy,
+			'pushed': 	self.pushed,
+			'drained': 	self.drained,
+			'dropped': 	self.dropped,
+			'errors': 	self.errors,
+		}
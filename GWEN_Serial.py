@@ -0,0 +1,332 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# GWEN_Serial.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# Background serial acquisition. A GWENSerialSource owns one port and reads it from its
+# own thread. Raw bytes are cut into frames by a framer, every batch of frames is decoded
+# at once into NumPy arrays (one per channel) and the channels bound to widgets are pushed
+# through the Gui's bounded GWENProducerQueue. The GUI thread never touches the port.
+#
+#   source = gui.addSerialSource('/dev/ttyUSB0', GWENLineFramer(), GWENTextDecoder(['t', 'v']))
+#   source.bind('voltage', 'v', x='t')		# streaming plot
+#   source.bind('last', 'v')				# indicator shows the newest value
+#   source.start()
+#
+# Ports are opened with serial.serial_for_url, so 'loop://' or a pty work without hardware.
+#
+# Dependencies
+import time
+import struct
+import threading
+import traceback
+import numpy as np
+from GWEN_GuiObjects import importBackend
+
+serial = importBackend('serial')
+
+# Update slots of the widgets a source can feed
+bindable_slots = ('updateIndicator', 'updateLED', 'appendData', 'updateStackPlot')
+
+
+################################################ Framers ################################################
+
+class GWENDelimiterFramer():
+	""" Frames end with delimiter (not included in the frame) """
+	def __init__(self, delimiter=b'\n', maxLength=65536):
+		self.delimiter = delimiter
+		self.maxLength = maxLength
+		self.buffer = bytearray()
+		self.errors = 0
+
+
+	def feed(self, data):
+		""" Adds raw bytes, returns the list of complete frames """
+		self.buffer += data
+		if self.delimiter not in self.buffer:
+			# Garbage without any delimiter must not grow forever
+			if len(self.buffer) > self.maxLength:
+				self.buffer.clear()
+				self.errors += 1
+			return []
+		frames = self.buffer.split(self.delimiter)
+		self.buffer = frames.pop()
+		return [bytes(frame) for frame in frames]
+
+
+	def reset(self):
+		self.buffer.clear()
+
+
+class GWENLineFramer(GWENDelimiterFramer):
+	""" Text lines ending with \\n. A trailing \\r is removed and empty lines are skipped """
+	def __init__(self, maxLength=65536):
+		super().__init__(b'\n', maxLength)
+
+
+	def feed(self, data):
+		return [frame.rstrip(b'\r') for frame in super().feed(data) if frame.strip()]
+
+
+class GWENFixedFramer():
+	""" Every frame is exactly size bytes """
+	def __init__(self, size):
+		self.size = size
+		self.buffer = bytearray()
+		self.errors = 0
+
+
+	def feed(self, data):
+		self.buffer += data
+		count = len(self.buffer) // self.size
+		if not count:
+			return []
+		end = count*self.size
+		block = bytes(self.buffer[:end])
+		del self.buffer[:end]
+		return [block[start:start+self.size] for start in range(0, end, self.size)]
+
+
+	def reset(self):
+		self.buffer.clear()
+
+
+class GWENLengthFramer():
+	""" Frames start with their payload length, packed with the struct format prefix
+	(ie. '<H', little endian uint16). Only the payload is returned. A length above maxLength
+	means the stream is out of sync, one byte is dropped and parsing resumes.
+	"""
+	def __init__(self, prefix='<H', maxLength=4096):
+		self.prefix = struct.Struct(prefix)
+		self.maxLength = maxLength
+		self.buffer = bytearray()
+		self.errors = 0
+
+
+	def feed(self, data):
+		self.buffer += data
+		frames = []
+		offset = 0
+		header = self.prefix.size
+		# Walk the buffer with an offset and trim it once at the end
+		while len(self.buffer) - offset >= header:
+			length = self.prefix.unpack_from(self.buffer, offset)[0]
+			if length > self.maxLength:
+				offset += 1
+				self.errors += 1
+				continue
+			if len(self.buffer) - offset - header < length:
+				break
+			frames.append(bytes(self.buffer[offset+header:offset+header+length]))
+			offset += header + length
+		del self.buffer[:offset]
+		return frames
+
+
+	def reset(self):
+		self.buffer.clear()
+
+
+############################################### Decoders ################################################
+
+class GWENTextDecoder():
+	""" Decodes text frames of sep separated numbers, one value per channel """
+	def __init__(self, channels, sep=',', dtype=np.float64):
+		self.channels = list(channels)
+		self.sep = sep.encode() if isinstance(sep, str) else sep
+		self.dtype = dtype
+		self.errors = 0
+
+
+	def decode(self, frames):
+		""" Returns {channel: array} for a list of frames. Malformed frames are dropped """
+		width = len(self.channels)
+		if not frames:
+			return {channel: np.empty(0, self.dtype) for channel in self.channels}
+		# Parse every frame in one call, fall back to frame by frame if any is malformed. Every
+		# frame must have exactly width fields, the joined values alone cannot tell where a
+		# short frame shifted the following ones
+		values = None
+		if all(frame.count(self.sep) == width - 1 for frame in frames):
+			try:
+				values = np.array(self.sep.join(frames).split(self.sep), dtype=self.dtype)
+			except ValueError:
+				pass
+		if values is None or len(values) != width*len(frames):
+			rows = []
+			for frame in frames:
+				try:
+					row = np.array(frame.split(self.sep), dtype=self.dtype)
+				except ValueError:
+					row = ()
+				if len(row) == width:
+					rows.append(row)
+				else:
+					self.errors += 1
+			values = np.array(rows, dtype=self.dtype)
+		values = values.reshape(-1, width)
+		return {channel: values[:, column] for column, channel in enumerate(self.channels)}
+
+
+class GWENBinaryDecoder():
+	""" Decodes binary frames with a NumPy structured dtype, ie. [('t', '<u4'), ('v', '<f4')].
+	Every field is a channel. Frames of the wrong size are dropped.
+	"""
+	def __init__(self, dtype):
+		self.dtype = np.dtype(dtype)
+		self.channels = list(self.dtype.names)
+		self.errors = 0
+
+
+	def decode(self, frames):
+		size = self.dtype.itemsize
+		good = [frame for frame in frames if len(frame) == size]
+		self.errors += len(frames) - len(good)
+		records = np.frombuffer(b''.join(good), dtype=self.dtype)
+		return {channel: records[channel] for channel in self.channels}
+
+
+################################################ Source #################################################
+
+class GWENSerialSource():
+	""" Reads one serial port in a background thread and feeds the bound widgets.
+	Create (and bind) it in the GUI thread. Decoded batches are pushed at most every
+	interval seconds, so a fast port produces a few large updates instead of many small ones.
+	"""
+	def __init__(self, gui, port, framer, decoder, baudrate=115200, interval=0.02, **kwargs):
+		self.gui = gui
+		self.framer = framer
+		self.decoder = decoder
+		self.interval = interval
+
+		# A port name, a pyserial URL (loop://, socket://, ...) or an already open port
+		if isinstance(port, str):
+			self.port = serial.serial_for_url(port, baudrate=baudrate, timeout=interval, **kwargs)
+		else:
+			self.port = port
+
+		# Bounded queue between this thread and the GUI thread
+		self.queue = gui.producerQueue if gui.producerQueue is not None else gui.enableProducerQueue()
+		self.bindings = []
+		self.samples = 0
+		self.thread = None
+		self.running = threading.Event()
+
+		# Statistics
+		self.bytesRead = 0
+		self.frames = 0
+		self.batches = 0
+		self.error = None
+
+
+	def bind(self, id, channels, x=None):
+		""" Sends channels to widget id. Indicators and LEDs get the newest value of the first
+		channel, streaming plots get (x, *channels) appended and stack plots (x, channels array),
+		with x a channel or, if None, the sample index.
+		"""
+		if isinstance(channels, str):
+			channels = [channels]
+		for channel in list(channels) + ([x] if x else []):
+			if channel not in self.decoder.channels:
+				raise ValueError('Unknown channel {}. Decoder channels are {}.'.format(channel, self.decoder.channels))
+		slot = getattr(self.gui.getWidget(id), 'updateSlot', None)
+		if slot == 'updatePlot':
+			# Every batch would replace the whole plot
+			raise ValueError('Plot {} is not a streaming plot, add it with a capacity to bind it to a serial source.'.format(id))
+		if slot not in bindable_slots:
+			raise ValueError('Widget {} ({}) cannot be bound to a serial source. Bind indicators, LEDs, streaming plots or stack plots.'.format(id, slot))
+		self.bindings.append((id, list(channels), x, slot))
+
+
+	def start(self):
+		""" Starts the reader thread """
+		if self.thread is not None and self.thread.is_alive():
+			return
+		self.running.set()
+		self.thread = threading.Thread(target=self._read_, name='GWENSerial {}'.format(self.port.port), daemon=True)
+		self.thread.start()
+
+
+	def stop(self, close=True):
+		""" Stops the reader thread and optionally closes the port """
+		self.running.clear()
+		if self.thread is not None:
+			self.thread.join()
+			self.thread = None
+		if close:
+			self.port.close()
+
+
+	def write(self, data):
+		""" Writes bytes to the port (ie. commands). Safe to call from the GUI thread """
+		return self.port.write(data)
+
+
+	def stats(self):
+		return {
+			'bytes': 		self.bytesRead,
+			'frames': 		self.frames,
+			'batches': 		self.batches,
+			'framingErrors': self.framer.errors,
+			'decodeErrors': self.decoder.errors,
+			'error': 		repr(self.error) if self.error else None,
+		}
+
+
+	def _read_(self):
+		""" Reader thread: read, frame, and push decoded batches every interval """
+		frames = []
+		deadline = time.perf_counter() + self.interval
+		try:
+			while self.running.is_set():
+				data = self.port.read(max(1, self.port.in_waiting))
+				if data:
+					self.bytesRead += len(data)
+					frames += self.framer.feed(data)
+				if frames and time.perf_counter() >= deadline:
+					self._publish_(frames)
+					frames = []
+					deadline = time.perf_counter() + self.interval
+			if frames:
+				self._publish_(frames)
+		except Exception as error:
+			# A dead port ends the thread, stats() reports why
+			self.error = error
+			traceback.print_exc()
+
+
+	def _publish_(self, frames):
+		""" Decodes a batch of frames and pushes the bound channels """
+		channels = self.decoder.decode(frames)
+		count = len(next(iter(channels.values()))) if channels else 0
+		self.frames += len(frames)
+		self.batches += 1
+		if not count:
+			return
+		index = None
+		for id, names, x, slot in self.bindings:
+			if slot in ('updateIndicator', 'updateLED'):
+				self.queue.push(id, channels[names[0]][-1].item())
+				continue
+			if x is None:
+				if index is None:
+					index = np.arange(self.samples, self.samples + count, dtype=np.float64)
+				xData = index
+			else:
+				xData = channels[x]
+			if slot == 'updateStackPlot':
+				# One (channels, samples) array for the whole stack
+				self.queue.push(id, (xData, np.array([channels[name] for name in names])))
+			else:
+				self.queue.push(id, (xData,) + tuple(channels[name] for name in names))
+		self.samples += count
@@ -0,0 +1,164 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# GWEN_Version.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# Identifies which build of GWEN is running. Nothing happens at import time, the
+# version is only looked up when getVersion() is called. In order, it comes from:
+#   1. A GWEN_VERSION file next to this module (written by stampVersion() when deploying)
+#   2. The on-disk cache, as long as the git HEAD it was read from has not changed
+#   3. The HEAD commit of the git repository GWEN lives in (read directly, no git history walk)
+#
+# Dependencies
+import os
+import json
+
+# Directory GWEN is installed in
+gwen_path = os.path.dirname(os.path.abspath(__file__))
+stamp_file = os.path.join(gwen_path, 'GWEN_VERSION')
+cache_file = os.path.join(os.path.expanduser('~'), '.cache', 'gwen', 'version.json')
+
+# In-memory cache, filled by the first getVersion() call
+_version_ = None
+
+
+def getVersion(refresh=False):
+	""" Returns the GWEN version identifier (stamped version or HEAD commit hash),
+	or None if it cannot be determined. Set refresh to ignore the caches.
+	"""
+	global _version_
+	if _version_ is not None and not refresh:
+		return _version_
+
+	# Stamped builds never touch git
+	if os.path.isfile(stamp_file):
+		with open(stamp_file) as file:
+			_version_ = file.read().strip() or None
+		return _version_
+
+	git_dir = _findGitDir_(gwen_path)
+	if git_dir is None:
+		return None
+
+	# The cache entry is valid as long as HEAD and the branch ref have not been modified
+	key = _headSignature_(git_dir)
+	cache = _readCache_()
+	entry = cache.get(git_dir)
+	if entry and entry.get('signature') == key and not refresh:
+		_version_ = entry.get('version')
+		return _version_
+
+	_version_ = _readHead_(git_dir)
+	cache[git_dir] = {'signature': key, 'version': _version_}
+	_writeCache_(cache)
+	return _version_
+
+
+def stampVersion(version=None):
+	""" Writes the GWEN_VERSION file so deployed copies report a fixed version without git.
+	Uses the current HEAD commit if no version is given. Returns the stamped version.
+	"""
+	if version is None:
+		git_dir = _findGitDir_(gwen_path)
+		version = _readHead_(git_dir) if git_dir else None
+	if version is None:
+		raise ValueError('No version given and no git repository found to read it from.')
+	with open(stamp_file, 'w') as file:
+		file.write(version + '\n')
+	return version
+
+
+def _findGitDir_(path):
+	""" Walks up from path until a .git directory (or worktree .git file) is found """
+	while True:
+		git = os.path.join(path, '.git')
+		if os.path.isdir(git):
+			return git
+		if os.path.isfile(git):
+			# Worktrees and submodules point to the real git dir
+			with open(git) as file:
+				line = file.read().strip()
+			if line.startswith('gitdir:'):
+				return os.path.normpath(os.path.join(path, line[len('gitdir:'):].strip()))
+		parent = os.path.dirname(path)
+		if parent == path:
+			return None
+		path = parent
+
+
+def _headRef_(git_dir):
+	""" Returns the ref HEAD points to (ie. refs/heads/master), or None if HEAD is detached """
+	with open(os.path.join(git_dir, 'HEAD')) as file:
+		head = file.read().strip()
+	if head.startswith('ref:'):
+		return head[len('ref:'):].strip()
+	return None
+
+
+def _headSignature_(git_dir):
+	""" Cheap fingerprint of HEAD: modification times of HEAD, the branch ref and packed-refs """
+	signature = []
+	try:
+		paths = ['HEAD', 'packed-refs']
+		ref = _headRef_(git_dir)
+		if ref:
+			paths.append(ref)
+		for path in paths:
+			path = os.path.join(git_dir, path)
+			signature.append(os.stat(path).st_mtime_ns if os.path.exists(path) else 0)
+	except OSError:
+		return None
+	return signature
+
+
+def _readHead_(git_dir):
+	""" Returns the commit hash HEAD points to, or None """
+	try:
+		ref = _headRef_(git_dir)
+		if ref is None:
+			with open(os.path.join(git_dir, 'HEAD')) as file:
+				return file.read().strip()
+
+		# Loose ref first, then packed refs
+		loose = os.path.join(git_dir, ref)
+		if os.path.isfile(loose):
+			with open(loose) as file:
+				return file.read().strip()
+		packed = os.path.join(git_dir, 'packed-refs')
+		if os.path.isfile(packed):
+			with open(packed) as file:
+				for line in file:
+					parts = line.split()
+					if len(parts) == 2 and parts[1] == ref:
+						return parts[0]
+	except OSError:
+		pass
+	return None
+
+
+def _readCache_():
+	try:
+		with open(cache_file) as file:
+			return json.load(file)
+	except (OSError, ValueError):
+		return dict()
+
+
+def _writeCache_(cache):
+	# A read-only home directory only costs us the cache
+	try:
+		os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+		with open(cache_file, 'w') as file:
+			json.dump(cache, file)
+	except OSError:
+		pass
@@ -0,0 +1,186 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# GWEN_Watchdog.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# Event loop watchdog, created by GWENGui.enableWatchdog. A QTimer beats every interval
+# ms in the GUI thread; how late each beat fires is the event loop latency. A helper
+# thread checks the last beat and, once the GUI thread has been stuck for more than
+# threshold seconds, captures its Python stack. The stall is recorded when the loop
+# runs again, with its duration, the stack and the widget whose button callback or
+# update slot was running:
+#
+#   {'time': 1700000000.0, 'duration': 2.5, 'widget': 'start', 'activity': 'callback',
+#    'stack': ['  File "pumps.py", line 12, in start\n    time.sleep(2.5)\n', ...]}
+#
+# The last capacity stalls are kept, see stalls() and dump().
+#
+# Dependencies
+import sys
+import json
+import time
+import threading
+import traceback
+import collections
+from PyQt5 import QtCore
+from GWEN_Profiler import profiled_slots
+
+
+class GWENWatchdog(QtCore.QObject):
+	""" Measures event loop latency and records stalls longer than threshold seconds """
+	# Emitted in the GUI thread with the stall record once the loop runs again
+	stalled = QtCore.pyqtSignal(dict)
+
+	def __init__(self, gui, threshold=0.1, interval=10, capacity=100, latencyWindow=1000):
+		# Call parent constructor
+		super().__init__(gui)
+		self.gui = gui
+		self.threshold = threshold
+		self.interval = interval
+
+		self.records = collections.deque(maxlen=capacity)
+		self.lags = collections.deque(maxlen=latencyWindow)	# Latest beat latencies (s)
+		self.beats = 0
+		self.lastBeat = None
+		self.maxLag = 0.0
+
+		# (activity, widget id) running in the GUI thread, read by the helper thread
+		self.current = None
+		# Stack captured by the helper thread: (beat it was captured after, activity, stack)
+		self.capture = None
+
+		self.guiThread = threading.get_ident()
+		self.running = threading.Event()
+		self.thread = None
+		self.timer = QtCore.QTimer(self)
+		self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+		self.timer.timeout.connect(self._beat_)
+
+
+	def start(self):
+		""" Starts the heartbeat and the helper thread. Call from the GUI thread """
+		if self.running.is_set():
+			return
+		self.guiThread = threading.get_ident()
+		self.lastBeat = time.perf_counter()
+		self.running.set()
+		self.gui.addSlotWrapper(self._wrap_, profiled_slots)
+		self.gui.addCallbackHook(self._begin_, self._end_)
+		self.timer.start(self.interval)
+		self.thread = threading.Thread(target=self._watch_, name='GWENWatchdog', daemon=True)
+		self.thread.start()
+
+
+	def stop(self):
+		if not self.running.is_set():
+			return
+		self.running.clear()
+		self.timer.stop()
+		self.gui.removeSlotWrapper(self._wrap_)
+		self.gui.removeCallbackHook(self._begin_, self._end_)
+		self.thread.join()
+		self.thread = None
+
+
+	def stalls(self):
+		""" Returns the recorded stalls, oldest first """
+		return list(self.records)
+
+
+	def clear(self):
+		self.records.clear()
+		self.lags.clear()
+		self.maxLag = 0.0
+
+
+	def dump(self, path):
+		""" Writes the recorded stalls and the latency summary to path (JSON) """
+		with open(path, 'w') as file:
+			json.dump({'latency': self.latency(), 'stalls': self.stalls()}, file, indent=1)
+
+
+	def latency(self):
+		""" Event loop latency over the latest beats: mean, p50, p99 and max (s) """
+		lags = sorted(self.lags)
+		if not lags:
+			return {'beats': self.beats, 'mean': 0.0, 'p50': 0.0, 'p99': 0.0, 'max': self.maxLag}
+		return {
+			'beats': 	self.beats,
+			'mean': 	sum(lags)/len(lags),
+			'p50': 		lags[len(lags)//2],
+			'p99': 		lags[min(len(lags) - 1, int(len(lags)*0.99))],
+			'max': 		self.maxLag,
+		}
+
+
+	def _beat_(self):
+		""" Heartbeat in the GUI thread """
+		now = time.perf_counter()
+		gap = now - self.lastBeat
+		lag = max(0.0, gap - self.interval/1000.0)
+		self.lags.append(lag)
+		if lag > self.maxLag:
+			self.maxLag = lag
+
+		if lag > self.threshold:
+			# A capture made after an earlier beat belongs to another stall
+			capture = self.capture if self.capture is not None and self.capture[0] == self.beats else None
+			record = {
+				'time': 	time.time() - gap,
+				'duration': gap,
+				'widget': 	capture[1][1] if capture and capture[1] else None,
+				'activity': capture[1][0] if capture and capture[1] else None,
+				'stack': 	capture[2] if capture else None,
+			}
+			self.records.append(record)
+			self.stalled.emit(record)
+		self.capture = None
+		self.lastBeat = now
+		self.beats += 1
+
+
+	def _watch_(self):
+		""" Helper thread: captures the GUI thread stack once it is stuck """
+		poll = max(0.005, self.threshold/4)
+		while self.running.is_set():
+			time.sleep(poll)
+			beats = self.beats
+			if self.capture is not None or time.perf_counter() - self.lastBeat <= self.threshold:
+				continue
+			current = self.current
+			frame = sys._current_frames().get(self.guiThread)
+			stack = traceback.format_list(traceback.extract_stack(frame)) if frame is not None else []
+			# The loop may have beaten meanwhile, _beat_ then drops this capture
+			self.capture = (beats, current, stack)
+
+
+	def _wrap_(self, slot, name):
+		""" Slot wrapper given to GWENGui.addSlotWrapper, tracks the widget being updated """
+		def watched(id, *args, **kwargs):
+			previous = self.current
+			self.current = (name, getattr(id, 'id', id))
+			try:
+				return slot(id, *args, **kwargs)
+			finally:
+				self.current = previous
+		watched.__name__ = slot.__name__
+		watched.__doc__ = slot.__doc__
+		return watched
+
+
+	def _begin_(self, button):
+		self.current = ('callback', button.id)
+
+
+	def _end_(self, button):
+		self.current = None
@@ -0,0 +1,43 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# tests/test_import.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# Importing the engine stays within its time budget and leaves the plotting backends
+# unloaded until a widget needs them.
+#
+# Dependencies
+import subprocess
+import sys
+from GWEN_Benchmark import checkImportBudget, gwen_path, import_budget
+
+
+def test_import_within_budget():
+	ok, result = checkImportBudget(repeat=3)
+	assert not result['heavyModules'], 'imported eagerly: {}'.format(result['heavyModules'])
+	assert ok, 'median import took {:.3f} s, budget {} s'.format(result['median'], import_budget)
+
+
+def test_backends_load_with_their_widgets():
+	script = (
+		'import sys, GWEN_GuiEngine\n'
+		'gui = GWEN_GuiEngine.GWENGui()\n'
+		'gui.addIndicator("value")\n'
+		'assert "pyqtgraph" not in sys.modules\n'
+		'gui.addPlot("plot", 1, ["", "x", "y"])\n'
+		'assert "pyqtgraph" in sys.modules\n'
+		'assert "matplotlib" not in sys.modules\n'
+		'print("ok")\n'
+	)
+	output = subprocess.check_output([sys.executable, '-c', script], cwd=gwen_path)
+	assert output.decode().split()[-1] == 'ok'
@@ -0,0 +1,218 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# tests/test_layout.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# GWEN_Layout.compilePlan against the layout manager createLayout had before the planner
+# existed. legacyLayout below is that code with the labels left out: it fills real Qt grid
+# layouts, tabs and group boxes, and every widget must end up in the cell, page, group and
+# mini tab the plan gives it.
+#
+# Dependencies
+import random
+import pytest
+from PyQt5 import QtWidgets
+from GWEN_Layout import compilePlan, planLayout
+
+
+def legacyLayout(divies, dims):
+	""" Runs the original createLayout loop over (type, size, name) divies and widgets of the
+	given dims. Returns (widgets, pages, groups, groupTabs, tabs): pages holds the tab pages
+	followed by the widget holding the last grid, groups the group boxes, groupTabs their mini
+	tab widgets (None for a group without mini tabs) and tabs the top level tab widget
+	"""
+	widgets = []
+	for dim in dims:
+		widget = QtWidgets.QWidget()
+		widget.dim = dim
+		widgets.append(widget)
+
+	tabs = QtWidgets.QTabWidget()
+	miniTabs = QtWidgets.QTabWidget()
+	groupBox = QtWidgets.QGroupBox()
+	mini = False
+	pages, groups, groupTabs = [], [], []
+
+	gridLayout = QtWidgets.QGridLayout()
+	widgetPtr = row = col = nextRow = nextCol = newRow = newCol = rowSize = colSize = 0
+	for type, size, name in divies:
+		row = nextRow
+		col = nextCol
+
+		if type == 'endRow' and size:
+			for widget in widgets[widgetPtr:widgetPtr+size]:
+				gridLayout.addWidget(widget, row, col, widget.dim[0], widget.dim[1])
+				col += widget.dim[1]
+				rowSize = widget.dim[0] if widget.dim[0] > rowSize else rowSize
+			widgetPtr += size
+			nextRow += rowSize
+			row += rowSize
+			newCol = col if col > newCol else newCol
+			newRow = row if row > newRow else newRow
+
+		elif type == 'endCol' and size:
+			for widget in widgets[widgetPtr:widgetPtr+size]:
+				gridLayout.addWidget(widget, row, col, widget.dim[0], widget.dim[1])
+				row += widget.dim[0]
+				colSize = widget.dim[1] if widget.dim[1] > colSize else colSize
+			widgetPtr += size
+			nextCol += colSize
+			col += colSize
+			newRow = row if row > newRow else newRow
+			newCol = col if col > newCol else newCol
+
+		elif type == 'newRow':
+			nextCol = 0
+			nextRow = newRow
+
+		elif type == 'newCol':
+			nextRow = 0
+			nextCol = newCol
+
+		elif type == 'makeTab':
+			page = QtWidgets.QWidget()
+			page.setLayout(gridLayout)
+			if not mini:
+				tabs.addTab(page, name)
+				pages.append(page)
+			else:
+				miniTabs.addTab(page, name)
+			gridLayout = QtWidgets.QGridLayout()
+			row=col=nextRow=nextCol=newRow=newCol=rowSize=colSize = 0
+
+		elif type == 'startGroup':
+			groupBox.setTitle(name)
+			master = (gridLayout, nextRow, nextCol, newRow, newCol)
+			mini = True
+			row=col=nextRow=nextCol=newRow=newCol=rowSize=colSize = 0
+			gridLayout = QtWidgets.QGridLayout()
+
+		elif type == 'endGroup':
+			masterGridLayout, masterNextRow, masterNextCol, masterNewRow, masterNewCol = master
+			if miniTabs.count():
+				gridLayout.addWidget(miniTabs)
+				groupTabs.append(miniTabs)
+				miniTabs = QtWidgets.QTabWidget()
+			else:
+				groupTabs.append(None)
+			groupBox.setLayout(gridLayout)
+
+			if not size:
+				masterGridLayout.addWidget(groupBox, masterNextRow, masterNextCol, gridLayout.rowCount(), gridLayout.columnCount())
+				nextCol = masterNextCol + gridLayout.columnCount()
+				newRow = gridLayout.rowCount() + masterNextRow if gridLayout.rowCount() + masterNextRow > masterNewRow else masterNewRow
+			else:
+				masterGridLayout.addWidget(groupBox, masterNextRow, masterNextCol, size[0], size[1])
+				nextCol = masterNextCol + size[1]
+				newRow = size[0] + masterNextRow if size[0] + masterNextRow > masterNewRow else masterNewRow
+
+			newCol = nextCol if nextCol > masterNewCol else masterNewCol
+			if not nextCol >= newCol:
+				nextRow = masterNextRow
+
+			gridLayout = masterGridLayout
+			groups.append(groupBox)
+			groupBox = QtWidgets.QGroupBox()
+			mini = False
+
+		# Corner Case Fix
+		if nextCol >= newCol:
+			nextRow = 0
+			newCol = nextCol
+
+		if nextRow >= newRow:
+			nextCol = 0
+			newRow = nextRow
+
+	last = QtWidgets.QWidget()
+	last.setLayout(gridLayout)
+	pages.append(last)
+	# Keep the Qt objects alive until the caller is done
+	return widgets, pages, groups, groupTabs, tabs
+
+
+def cell(widget):
+	""" [row, col, rowSpan, colSpan] of widget in the grid of its parent """
+	layout = widget.parentWidget().layout()
+	return list(layout.getItemPosition(layout.indexOf(widget)))
+
+
+def legacyPlan(divies, dims):
+	""" The placements legacyLayout produced, in the format of compilePlan """
+	widgets, pages, groups, groupTabs, tabs = legacyLayout(divies, dims)
+	placements = []
+	for widget in widgets:
+		owner = widget.parentWidget()
+		if owner is None:
+			placements.append(None)
+		elif owner in pages:
+			placements.append(cell(widget) + [pages.index(owner), None, 0])
+		elif owner in groups:
+			group = groups.index(owner)
+			panes = groupTabs[group].count() if groupTabs[group] is not None else 0
+			placements.append(cell(widget) + [pages.index(owner.parentWidget()), group, panes])
+		else:
+			group = next(index for index, miniTabs in enumerate(groupTabs) if miniTabs is not None and miniTabs.indexOf(owner) >= 0)
+			placements.append(cell(widget) + [pages.index(groups[group].parentWidget()), group, groupTabs[group].indexOf(owner)])
+
+	boxes = []
+	for group, box in enumerate(groups):
+		miniTabs = groupTabs[group]
+		names = [miniTabs.tabText(index) for index in range(miniTabs.count())] if miniTabs is not None else []
+		tabsCell = cell(miniTabs)[:2] if miniTabs is not None else [None, None]
+		boxes.append([box.title(), pages.index(box.parentWidget())] + cell(box) + [names] + tabsCell)
+	return {'widgets': placements, 'tabs': [tabs.tabText(index) for index in range(tabs.count())], 'groups': boxes}
+
+
+def randomPanel(generator):
+	""" Random well-formed divies (groups are not nested) and the dims of their widgets """
+	divies, dims = [], []
+	grouped = False
+	for step in range(generator.randint(1, 30)):
+		choice = generator.random()
+		if choice < 0.5:
+			size = generator.randint(0, 4)
+			divies.append((generator.choice(('endRow', 'endCol')), size, None))
+			dims += [[generator.randint(1, 3), generator.randint(1, 3)] for widget in range(size)]
+		elif choice < 0.65:
+			divies.append((generator.choice(('newRow', 'newCol')), None, None))
+		elif choice < 0.8:
+			divies.append(('makeTab', None, 'tab {}'.format(step)))
+		elif not grouped:
+			divies.append(('startGroup', None, 'group {}'.format(step)))
+			grouped = True
+		else:
+			size = 0 if generator.random() < 0.5 else [generator.randint(1, 4), generator.randint(1, 4)]
+			divies.append(('endGroup', size, None))
+			grouped = False
+	if grouped:
+		divies.append(('endGroup', 0, None))
+	return divies, dims
+
+
+@pytest.mark.parametrize('seed', range(1000))
+def test_plan_matches_legacy_layout(qapp, seed):
+	divies, dims = randomPanel(random.Random(seed))
+	assert compilePlan(divies, dims) == legacyPlan(divies, dims)
+
+
+def test_plan_layout_memoizes_by_key():
+	divies = [('endRow', 2, None)]
+	plan = planLayout(divies, [[1, 1], [1, 2]], key='panel')
+	assert planLayout(divies, [[1, 1], [1, 2]], key='panel') is plan
+	assert planLayout(divies, [[1, 1], [1, 2]]) is not plan
+
+
+def test_unmatched_end_group():
+	with pytest.raises(ValueError):
+		compilePlan([('endGroup', 0, None)], [])
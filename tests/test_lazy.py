@@ -0,0 +1,81 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# tests/test_lazy.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# lazyTabs stand-ins: widgets built early, through an attribute of the stand-in, belong to
+# the Gui and end up in their tab like the others.
+#
+# Dependencies
+from PyQt5 import QtCore
+from GWEN_GuiObjects import GWENLazyWidget
+
+
+def makeGui():
+	from GWEN_GuiEngine import GWENGui
+	gui = GWENGui(lazyTabs=True)
+	gui.addIndicator('first')
+	gui.endRow()
+	gui.makeTab('one')
+	gui.addIndicator('second', label='Second')
+	gui.addPlot('plot', 1, ['', 'x', 'y'])
+	gui.endRow()
+	gui.makeTab('two')
+	return gui
+
+
+def deleteLater(qapp):
+	QtCore.QCoreApplication.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+	qapp.processEvents()
+
+
+def test_stand_in_used_before_layout(qapp):
+	gui = makeGui()
+	assert isinstance(gui.widgets[1], GWENLazyWidget)
+	# Any attribute the stand-in does not have builds the widget
+	assert gui.widgetIndex['second'].isEnabled()
+	widget = gui.getWidget('second')
+	assert not isinstance(widget, GWENLazyWidget)
+	assert not widget.isWindow()
+	assert widget.window() is gui
+
+	gui.createLayout()
+	# The replaced central widget is deleted with everything still inside it
+	deleteLater(qapp)
+	assert widget.objectName() is not None
+	assert widget.parentWidget() is gui.tabs.widget(1)
+	assert gui.labels[1].parentWidget() is gui.tabs.widget(1)
+
+	gui.tabs.setCurrentIndex(1)
+	assert gui.getWidget('plot') is not None and not isinstance(gui.getWidget('plot'), GWENLazyWidget)
+	assert gui.tabs.widget(1).layout().indexOf(gui.getWidget('plot')) >= 0
+	assert gui.getString('second') == ''
+	gui.deleteLater()
+	deleteLater(qapp)
+
+
+def test_stand_in_used_after_layout(qapp):
+	gui = makeGui()
+	gui.createLayout()
+	deleteLater(qapp)
+	standIn = gui.widgetIndex['plot']
+	assert isinstance(standIn, GWENLazyWidget)
+	assert standIn.curves
+	plot = gui.getWidget('plot')
+	assert plot.parentWidget() is gui.tabs.widget(1)
+	assert not plot.isWindow()
+
+	gui.tabs.setCurrentIndex(1)
+	assert gui.tabs.widget(1).layout().indexOf(plot) >= 0
+	gui.deleteLater()
+	deleteLater(qapp)
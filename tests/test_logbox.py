@@ -0,0 +1,53 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# tests/test_logbox.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# Batched log box appends keep one block per message, empty messages included.
+#
+# Dependencies
+import pytest
+from GWEN_GuiObjects import GWENLoggingBox
+
+
+def lines(box):
+	document = box.document()
+	return [document.findBlockByNumber(block).text() for block in range(document.blockCount())]
+
+
+@pytest.mark.parametrize('batches', [
+	[['', 'a', '', 'b', '']],
+	[[''], ['a'], [''], ['b', '']],
+	[['', ''], ['<b>bold</b>', 'plain']],
+])
+def test_every_message_is_one_line(qapp, batches):
+	box = GWENLoggingBox(None, 'log', [2,2], None, batchInterval=None)
+	for batch in batches:
+		box.queueLines(batch)
+	expected = [message.replace('<b>bold</b>', 'bold') for batch in batches for message in batch]
+	assert lines(box) == expected
+
+
+def test_clear_starts_over(qapp):
+	box = GWENLoggingBox(None, 'log', [2,2], None, batchInterval=None)
+	box.appendLines(['', 'a'])
+	box.clear()
+	box.appendLines(['b'])
+	assert lines(box) == ['b']
+
+
+def test_oldest_lines_are_trimmed(qapp):
+	box = GWENLoggingBox(None, 'log', [2,2], None, maxLines=3)
+	box.appendLines([str(line) for line in range(5)])
+	box.appendLines(['5', ''])
+	assert lines(box) == ['4', '5', '']
@@ -0,0 +1,125 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# tests/test_plot.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# The updatePlot fast path: contiguous float arrays reach pyqtgraph without a copy and a
+# steady-state update stays within its allocation budget. Stack plots hand every channel a
+# view of its row and only skip the finite check for finite data.
+#
+# Dependencies
+import numpy as np
+from GWEN_Benchmark import benchPlotAllocations, fast_plot_budget
+
+
+def makePlot(curves, **options):
+	from GWEN_GuiEngine import GWENGui
+	gui = GWENGui()
+	gui.addPlot('plot', curves, ['', 'x', 'y'], **options)
+	gui.endRow()
+	gui.createLayout()
+	return gui
+
+
+def test_fast_path_allocations(qapp):
+	peak, shared = benchPlotAllocations()
+	assert shared
+	assert peak <= fast_plot_budget
+
+
+def test_rows_of_2d_array_are_not_copied(qapp):
+	gui = makePlot(3)
+	x = np.arange(50, dtype=np.float32)
+	Y = np.random.default_rng(0).random((3, 50)).astype(np.float32)
+	gui.updatePlot('plot', x, Y)
+	for row, curve in enumerate(gui.getWidget('plot').curves):
+		assert np.shares_memory(curve.curve.xData, x)
+		assert np.shares_memory(curve.curve.yData, Y[row])
+		assert np.array_equal(curve.curve.yData, Y[row])
+	gui.deleteLater()
+
+
+def test_lists_and_separate_curves_still_work(qapp):
+	gui = makePlot(2)
+	gui.updatePlot('plot', [0, 1, 2], [1, 2, 3], np.array([3.0, 2.0, 1.0]))
+	curves = gui.getWidget('plot').curves
+	assert curves[0].curve.yData.tolist() == [1, 2, 3]
+	assert curves[1].curve.yData.tolist() == [3, 2, 1]
+	gui.deleteLater()
+
+
+def test_options_reach_the_curves(qapp):
+	gui = makePlot(1, skipFiniteCheck=True, connect='finite', xRange=(0, 10), yRange=(-1, 1))
+	plot = gui.getWidget('plot')
+	curve = plot.curves[0]
+	assert curve.opts['skipFiniteCheck']
+	assert curve.opts['connect'] == 'finite'
+	assert not any(plot.axe.vb.autoRangeEnabled())
+	gui.deleteLater()
+
+
+def makeStack(numPlots, numCurves):
+	from GWEN_GuiEngine import GWENGui
+	gui = GWENGui()
+	gui.addStackPlot('stack', numPlots, numCurves)
+	gui.endRow()
+	gui.createLayout()
+	return gui
+
+
+def test_stack_plot_channels_get_views_and_colors(qapp):
+	gui = makeStack(3, 2)
+	x = np.arange(20, dtype=np.float64)
+	Y = np.sin(x/5 + np.arange(5)[:, np.newaxis])
+	gui.updateStackPlot('stack', x, Y)
+	stack = gui.getWidget('stack')
+	assert len(stack.curves) == 6
+	for channel, curve in enumerate(stack.curves[:5]):
+		assert curve.getViewBox() is stack.axes[channel // 2].vb
+		assert np.shares_memory(curve.yData, Y[channel])
+		assert np.shares_memory(curve.xData, x)
+	colors = [curve.opts['pen'].color().name() for curve in stack.curves]
+	assert len(set(colors)) == len(colors)
+	# Fewer channels than curves leaves the rest as they were
+	assert not len(stack.curves[5].yData)
+	gui.deleteLater()
+
+
+def test_stack_plot_checks_finite_data(qapp):
+	gui = makeStack(2, 1)
+	stack = gui.getWidget('stack')
+	x = np.arange(10, dtype=np.float64)
+	Y = np.ones((2, 10))
+	gui.updateStackPlot('stack', x, Y)
+	assert all(curve.opts['skipFiniteCheck'] for curve in stack.curves)
+	Y[1, 3] = np.nan
+	gui.updateStackPlot('stack', x, Y)
+	assert not any(curve.opts['skipFiniteCheck'] for curve in stack.curves)
+	gui.updateStackPlot('stack', x, np.ones((2, 10)), finite=True)
+	assert all(curve.opts['skipFiniteCheck'] for curve in stack.curves)
+	gui.deleteLater()
+
+
+def test_connect_can_change_after_data(qapp):
+	gui = makePlot(1)
+	plot = gui.getWidget('plot')
+	x = np.arange(6, dtype=np.float64)
+	y = np.arange(6, dtype=np.float64)
+	gui.updatePlot('plot', x, y)
+	plot.setOptions(connect='pairs')
+	curve = plot.curves[0]
+	assert curve.curve.opts['connect'] == 'pairs'
+	assert np.shares_memory(curve.curve.yData, y)
+	gui.updatePlot('plot', x, y + 1)
+	assert curve.curve.opts['connect'] == 'pairs'
+	gui.deleteLater()
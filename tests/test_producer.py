@@ -0,0 +1,66 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# tests/test_producer.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# pushUpdate from the GUI thread and from worker threads.
+#
+# Dependencies
+import threading
+
+
+def makeGui():
+	from GWEN_GuiEngine import GWENGui
+	gui = GWENGui()
+	gui.addIndicator('value')
+	gui.endRow()
+	gui.createLayout()
+	return gui
+
+
+def inThread(function):
+	""" Runs function in a worker thread, returns what it raised (or None) """
+	raised = []
+	def run():
+		try:
+			function()
+		except Exception as error:
+			raised.append(error)
+	thread = threading.Thread(target=run)
+	thread.start()
+	thread.join()
+	return raised[0] if raised else None
+
+
+def test_gui_thread_creates_the_queue(qapp):
+	gui = makeGui()
+	assert gui.producerQueue is None
+	gui.pushUpdate('value', 'queued')
+	assert gui.producerQueue is not None
+	qapp.processEvents()
+	assert gui.getString('value') == 'queued'
+	gui.deleteLater()
+
+
+def test_worker_thread_needs_the_queue_first(qapp):
+	gui = makeGui()
+	error = inThread(lambda: gui.pushUpdate('value', 'lost'))
+	assert isinstance(error, RuntimeError)
+	assert 'enableProducerQueue' in str(error)
+
+	gui.enableProducerQueue()
+	assert inThread(lambda: [gui.pushUpdate('value', str(index)) for index in range(100)]) is None
+	qapp.processEvents()
+	assert gui.producerStats()['drained'] == 100
+	assert gui.getString('value') == '99'
+	gui.deleteLater()
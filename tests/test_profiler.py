@@ -0,0 +1,37 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# tests/test_profiler.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# Every update is timed once, under the slot that applied it.
+#
+# Dependencies
+
+
+def test_routed_updates_are_timed_once(qapp):
+	from GWEN_GuiEngine import GWENGui
+	gui = GWENGui()
+	gui.addIndicator('value')
+	gui.endRow()
+	gui.createLayout()
+	profiler = gui.enableProfiler()
+	for index in range(10):
+		gui.updateWidget('value', index)
+	gui.updateIndicator('value', 10)
+	gui.disableProfiler()
+
+	stats = profiler.stats()
+	assert 'updateWidget' not in stats
+	assert stats['updateIndicator']['value']['count'] == 11
+	assert len([event for event in profiler.trace if event[1] != 'layout']) == 11
+	gui.deleteLater()
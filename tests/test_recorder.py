@@ -0,0 +1,163 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# tests/test_recorder.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# Recorder encoding round trips, file rotation and replacing an earlier recording.
+#
+# Dependencies
+import os
+import fractions
+import pytest
+import numpy as np
+from GWEN_Recorder import encodeValue, decodeValue, encodeRecord, decodeRecord, file_header, magic
+from GWEN_Replay import recordingFiles
+
+
+def roundTrip(value, allowPickle=False):
+	parts = []
+	encodeValue(value, parts, allowPickle)
+	data = b''.join(parts)
+	decoded, offset = decodeValue(data, 0, allowPickle)
+	assert offset == len(data)
+	return decoded
+
+
+def readRecording(path):
+	""" Every record of a recording and its rotated files, as (slot, id, args, kwargs) """
+	records = []
+	for file in recordingFiles(path):
+		with open(file, 'rb') as handle:
+			data = handle.read()
+		assert file_header.unpack_from(data, 0)[0] == magic
+		offset = file_header.size
+		while offset < len(data):
+			t, slot, id, args, kwargs, offset = decodeRecord(data, offset)
+			records.append((slot, id, [arg.copy() if isinstance(arg, np.ndarray) else arg for arg in args], kwargs))
+	return records
+
+
+@pytest.mark.parametrize('value', [None, True, False, 0, -2**63, 2**63 - 1, 1.5, float('inf'), '', 'héllo', (), [], {}, ['a', 1, None], (1, 'b', [2.5]), {'a': 1, 2: [3, 'c']}])
+def test_plain_values_round_trip(value):
+	decoded = roundTrip(value)
+	assert decoded == value
+	assert type(decoded) is type(value)
+
+
+@pytest.mark.parametrize('dtype', ['<f8', '>f4', '<i2', '<u8', '?', 'S5', '<c16', '<M8[ms]'])
+@pytest.mark.parametrize('shape', [(), (0,), (7,), (3, 4), (2, 3, 2)])
+def test_arrays_round_trip(dtype, shape):
+	array = np.zeros(shape, dtype)
+	array.reshape(-1)[...] = np.arange(array.size).astype(dtype) if np.dtype(dtype).kind != 'S' else b'abc'
+	decoded = roundTrip(array)
+	assert decoded.dtype == array.dtype
+	assert decoded.shape == array.shape
+	assert np.array_equal(decoded, array)
+
+
+def test_non_contiguous_and_structured_arrays():
+	array = np.arange(20.0).reshape(4, 5)[:, ::2]
+	assert np.array_equal(roundTrip(array), array)
+	records = np.array([(1.5, 2, b'ab'), (3.5, 4, b'cd')], dtype=[('t', '<f8'), ('n', '<i4'), ('s', 'S2')])
+	decoded = roundTrip(records)
+	assert decoded.dtype == records.dtype
+	assert decoded.tolist() == records.tolist()
+
+
+def test_number_lists_and_numpy_scalars():
+	decoded = roundTrip([1.0, 2.0, 3.0])
+	assert isinstance(decoded, np.ndarray) and decoded.tolist() == [1.0, 2.0, 3.0]
+	assert roundTrip(np.float32(0.5)) == 0.5
+	assert type(roundTrip(np.int64(3))) is int
+
+
+def test_pickle_only_when_allowed():
+	value = fractions.Fraction(1, 3)
+	with pytest.raises(TypeError):
+		roundTrip(value)
+	assert roundTrip(value, allowPickle=True) == value
+	parts = []
+	encodeValue(value, parts, allowPickle=True)
+	with pytest.raises(ValueError):
+		decodeValue(b''.join(parts), 0)
+
+
+def test_record_round_trip():
+	y = np.linspace(0, 1, 11)
+	data = encodeRecord(12.5, 2, 'plot', [[0.0, 1.0], y], {'redraw': False})
+	t, slot, id, args, kwargs, offset = decodeRecord(data + b'trailing', 0)
+	assert (t, slot, id, kwargs, offset) == (12.5, 'updatePlot', 'plot', {'redraw': False}, len(data))
+	assert args[0].tolist() == [0.0, 1.0]
+	assert np.array_equal(args[1], y)
+
+
+def makeGui():
+	from GWEN_GuiEngine import GWENGui
+	gui = GWENGui()
+	gui.addIndicator('value')
+	gui.addPlot('plot', 2, ['', 'x', 'y'])
+	gui.endRow()
+	gui.createLayout()
+	return gui
+
+
+def test_recording_rotates_and_reads_back(qapp, tmp_path):
+	gui = makeGui()
+	path = str(tmp_path / 'run.gwrec')
+	gui.startRecording(path, maxFileSize=4096)
+	sent = []
+	for call in range(200):
+		gui.updateIndicator('value', 'call {}'.format(call))
+		x = np.arange(10, dtype=np.float64) + call
+		gui.updatePlot('plot', x, np.sin(x), np.cos(x))
+		sent += [('updateIndicator', 'value', ['call {}'.format(call)]), ('updatePlot', 'plot', [x, np.sin(x), np.cos(x)])]
+	stats = gui.stopRecording()
+	gui.deleteLater()
+
+	assert stats['error'] is None
+	assert stats['recorded'] == len(sent) and not stats['dropped'] and not stats['unencodable']
+	assert len(stats['files']) > 1
+	assert recordingFiles(path) == stats['files']
+	for file in stats['files']:
+		assert os.path.getsize(file) <= 4096
+		assert os.path.isfile(file + '.idx')
+
+	records = readRecording(path)
+	assert len(records) == len(sent)
+	for (slot, id, args, kwargs), (sentSlot, sentId, sentArgs) in zip(records, sent):
+		assert (slot, id, kwargs) == (sentSlot, sentId, {})
+		assert len(args) == len(sentArgs)
+		for arg, sentArg in zip(args, sentArgs):
+			assert np.array_equal(arg, sentArg) if isinstance(sentArg, np.ndarray) else arg == sentArg
+
+
+def test_new_recording_replaces_rotated_files(qapp, tmp_path):
+	gui = makeGui()
+	path = str(tmp_path / 'run.gwrec')
+	gui.startRecording(path, maxFileSize=2048)
+	for call in range(300):
+		gui.updateIndicator('value', 'first run {}'.format(call))
+	first = gui.stopRecording()['files']
+	assert len(first) > 2
+
+	gui.startRecording(path, maxFileSize=2048)
+	for call in range(10):
+		gui.updateIndicator('value', 'second run {}'.format(call))
+	second = gui.stopRecording()['files']
+	gui.deleteLater()
+
+	assert second == [path]
+	for file in first[1:]:
+		assert not os.path.exists(file)
+		assert not os.path.exists(file + '.idx')
+	assert [args for slot, id, args, kwargs in readRecording(path)] == [['second run {}'.format(call)] for call in range(10)]
@@ -0,0 +1,89 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# tests/test_ringbuffer.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# GWENRingBuffer against a plain list keeping the newest capacity samples, and the
+# streaming plot built on it.
+#
+# Dependencies
+import random
+import pytest
+import numpy as np
+from GWEN_GuiObjects import GWENRingBuffer
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_wraparound_matches_reference(seed):
+	generator = random.Random(seed)
+	capacity = generator.randint(1, 50)
+	ring = GWENRingBuffer(capacity)
+	reference = []
+	for step in range(200):
+		if generator.random() < 0.02:
+			ring.clear()
+			reference = []
+			continue
+		# Chunks shorter and longer than the capacity, empty ones included
+		chunk = np.arange(generator.randint(0, 2*capacity), dtype=np.float64) + 1000*step
+		ring.append(chunk)
+		reference = (reference + list(chunk))[-capacity:]
+		assert len(ring) == len(reference)
+		assert ring.view().tolist() == reference
+
+
+def test_view_is_contiguous_and_shares_storage():
+	ring = GWENRingBuffer(8, np.float32)
+	for start in range(0, 100, 3):
+		ring.append(np.arange(start, start + 3))
+		view = ring.view()
+		assert view.flags['C_CONTIGUOUS']
+		assert view.dtype == np.float32
+		assert np.shares_memory(view, ring.buffer)
+
+
+def test_view_survives_until_overwritten():
+	ring = GWENRingBuffer(4)
+	ring.append([1, 2, 3])
+	view = ring.view()
+	# The storage is never reallocated, an old view only changes where it is overwritten
+	ring.append([4])
+	assert view.tolist() == [1, 2, 3]
+	assert ring.view().tolist() == [1, 2, 3, 4]
+
+
+def test_clear_keeps_storage():
+	ring = GWENRingBuffer(5)
+	buffer = ring.buffer
+	ring.append(np.ones(7))
+	ring.clear()
+	assert len(ring) == 0
+	assert len(ring.view()) == 0
+	ring.append([2, 3])
+	assert ring.buffer is buffer
+	assert ring.view().tolist() == [2, 3]
+
+
+def test_streaming_plot_keeps_newest_samples(qapp):
+	from GWEN_GuiEngine import GWENGui
+	gui = GWENGui()
+	gui.addPlot('plot', 2, ['', 'x', 'y'], capacity=100)
+	gui.endRow()
+	gui.createLayout()
+	for start in range(0, 250, 25):
+		x = np.arange(start, start + 25, dtype=np.float64)
+		gui.appendData('plot', x, x, -x)
+	plot = gui.getWidget('plot')
+	assert plot.xBuffer.view().tolist() == list(range(150, 250))
+	assert plot.yBuffers[1].view().tolist() == [-value for value in range(150, 250)]
+	gui.deleteLater()
@@ -0,0 +1,148 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# tests/test_serial.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# Framers and decoders over pyserial's loop:// port, read back in random chunk sizes,
+# and a source feeding widgets through the producer queue.
+#
+# Dependencies
+import time
+import random
+import struct
+import pytest
+import numpy as np
+
+serial = pytest.importorskip('serial')
+
+from GWEN_Serial import GWENDelimiterFramer, GWENLineFramer, GWENFixedFramer, GWENLengthFramer, GWENTextDecoder, GWENBinaryDecoder
+
+
+def throughLoop(data, framer, seed=0):
+	""" Writes data to a loop:// port and feeds what is read back to framer in random
+	chunk sizes. Returns every frame
+	"""
+	generator = random.Random(seed)
+	port = serial.serial_for_url('loop://', timeout=0.1)
+	try:
+		frames = []
+		# loop:// holds at most 4096 bytes, a larger write would block
+		for start in range(0, len(data), 1024):
+			block = data[start:start+1024]
+			port.write(block)
+			received = 0
+			while received < len(block):
+				chunk = port.read(min(generator.randint(1, 64), len(block) - received))
+				assert chunk, 'loop:// returned less than was written'
+				received += len(chunk)
+				frames += framer.feed(chunk)
+		return frames
+	finally:
+		port.close()
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_delimiter_framer(seed):
+	frames = [bytes(random.Random(seed + index).choices(b'abc,123', k=index % 17)) for index in range(100)]
+	framer = GWENDelimiterFramer(b';')
+	assert throughLoop(b''.join(frame + b';' for frame in frames) + b'partial', framer, seed) == frames
+	assert framer.buffer == b'partial'
+
+
+def test_line_framer_strips_returns_and_skips_empty_lines():
+	data = b'1,2\r\n\n3,4\n  \r\n5,6\r\n7'
+	assert throughLoop(data, GWENLineFramer()) == [b'1,2', b'3,4', b'5,6']
+
+
+def test_delimiter_framer_drops_garbage_without_delimiter():
+	framer = GWENDelimiterFramer(b'\n', maxLength=32)
+	assert throughLoop(b'x'*100, framer) == []
+	assert framer.errors >= 1
+	assert len(framer.buffer) <= 32 + 64
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_fixed_framer(seed):
+	frames = [bytes([index])*6 for index in range(100)]
+	framer = GWENFixedFramer(6)
+	assert throughLoop(b''.join(frames) + b'abc', framer, seed) == frames
+	assert framer.buffer == b'abc'
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_length_framer(seed):
+	generator = random.Random(seed)
+	frames = [bytes(generator.randrange(256) for byte in range(generator.randint(0, 300))) for index in range(50)]
+	framer = GWENLengthFramer('<H', maxLength=300)
+	assert throughLoop(b''.join(struct.pack('<H', len(frame)) + frame for frame in frames), framer, seed) == frames
+	assert framer.errors == 0
+
+
+def test_length_framer_resyncs_after_bad_length():
+	framer = GWENLengthFramer('<H', maxLength=8)
+	frame = b'\x03\x00abc'
+	# 0xffff is above maxLength: one byte is dropped at a time until a length fits
+	assert throughLoop(b'\xff\xff' + frame + frame, framer) == [b'abc', b'abc']
+	assert framer.errors == 2
+
+
+def test_text_decoder_drops_malformed_frames_without_shifting():
+	decoder = GWENTextDecoder(['t', 'v'])
+	channels = decoder.decode([b'0,1.5', b'1', b'2,2.5', b'3,x', b'4,4.5,9', b'5,5.5'])
+	assert channels['t'].tolist() == [0, 2, 5]
+	assert channels['v'].tolist() == [1.5, 2.5, 5.5]
+	assert decoder.errors == 3
+
+
+def test_binary_decoder_over_loop():
+	dtype = np.dtype([('t', '<u4'), ('v', '<f4')])
+	records = np.zeros(50, dtype)
+	records['t'] = np.arange(50)
+	records['v'] = np.arange(50)/4
+	frames = throughLoop(records.tobytes(), GWENFixedFramer(dtype.itemsize))
+	decoder = GWENBinaryDecoder(dtype)
+	channels = decoder.decode(frames + [b'short'])
+	assert channels['t'].tolist() == records['t'].tolist()
+	assert channels['v'].tolist() == records['v'].tolist()
+	assert decoder.errors == 1
+
+
+def test_source_feeds_bound_widgets(qapp):
+	from GWEN_GuiEngine import GWENGui
+	gui = GWENGui()
+	gui.addIndicator('last')
+	gui.addPlot('stream', 1, ['', 'x', 'y'], capacity=1000)
+	gui.endRow()
+	gui.createLayout()
+
+	source = gui.addSerialSource('loop://', GWENLineFramer(), GWENTextDecoder(['t', 'v']), interval=0.01)
+	source.bind('last', 'v')
+	source.bind('stream', 'v', x='t')
+	with pytest.raises(ValueError):
+		source.bind('last', 'missing')
+	source.start()
+	source.write(b''.join('{},{}\n'.format(index, index/2).encode() for index in range(500)))
+
+	deadline = time.monotonic() + 10
+	plot = gui.getWidget('stream')
+	while len(plot.xBuffer) < 500 and time.monotonic() < deadline:
+		qapp.processEvents()
+		time.sleep(0.005)
+	source.stop()
+	qapp.processEvents()
+
+	assert source.stats()['frames'] == 500
+	assert plot.xBuffer.view().tolist() == list(range(500))
+	assert plot.yBuffers[0].view().tolist() == [index/2 for index in range(500)]
+	assert gui.getFloat('last') == 249.5
+	gui.deleteLater()
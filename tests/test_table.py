@@ -0,0 +1,148 @@
+#   .d8888b.  888       888 8888888888 888b    888
+#  d88P  Y88b 888   o   888 888        8888b   888
+#  888    888 888  d8b  888 888        88888b  888
+#  888        888 d888b 888 8888888    888Y88b 888
+#  888  88888 888d88888b888 888        888 Y88b888
+#  888    888 88888P Y88888 888        888  Y88888
+#  Y88b  d88P 8888P   Y8888 888        888   Y8888
+#   "Y8888P88 888P     Y888 8888888888 888    Y888
+#
+# tests/test_table.py
+#
+# Authors: Mundo Guzman, Kyle Kung, Cole Meyers  |   Maintainer: Kyle Kung
+#
+# https://github.com/krkung/GWEN
+#
+# GWENTableModel against a NumPy reference: after every append, column update, sort and
+# filter the view must show the rows a stable argsort and a boolean mask of all the data
+# give, and the row signals must account for every row the view gained.
+#
+# Dependencies
+import random
+import pytest
+import numpy as np
+from PyQt5 import QtCore
+from GWEN_GuiObjects import GWENTableModel
+
+dtype = np.dtype([('t', np.float64), ('v', np.int32), ('name', 'S4')])
+
+
+def referenceOrder(records, column, descending, filter):
+	""" Storage rows in view order """
+	order = np.arange(len(records))
+	if column >= 0:
+		order = np.argsort(records[dtype.names[column]], kind='stable')
+		if descending:
+			order = order[::-1]
+	if filter is not None:
+		order = order[filter(records)[order]]
+	return order
+
+
+class RowCounter():
+	""" Follows the row count the way a view does, from the model's signals only """
+	def __init__(self, model):
+		self.model = model
+		self.rows = model.rowCount()
+		model.rowsInserted.connect(self.inserted)
+		model.modelReset.connect(self.reset)
+
+	def inserted(self, parent, first, last):
+		self.rows += last - first + 1
+		assert self.rows == self.model.rowCount()
+
+	def reset(self):
+		self.rows = self.model.rowCount()
+
+
+def randomRows(generator, count):
+	rows = np.zeros(count, dtype)
+	rows['t'] = [generator.random() for row in range(count)]
+	# Few distinct values, so ties are common
+	rows['v'] = [generator.randint(0, 5) for row in range(count)]
+	rows['name'] = [generator.choice([b'a', b'b', b'cc']) for row in range(count)]
+	return rows
+
+
+def asInput(generator, rows):
+	""" rows in one of the forms appendRows takes """
+	form = generator.randrange(3)
+	if form == 0:
+		return rows
+	if form == 1:
+		return {name: rows[name] for name in dtype.names}
+	return [tuple(row) for row in rows.tolist()]
+
+
+def shown(model):
+	""" Storage rows and (t, v, name) texts the view shows """
+	order = [int(model.headerData(row, QtCore.Qt.Vertical)) for row in range(model.rowCount())]
+	texts = [[model.data(model.index(row, column)) for column in range(model.columnCount())] for row in range(model.rowCount())]
+	return order, texts
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_model_matches_numpy_reference(qapp, seed):
+	generator = random.Random(seed)
+	model = GWENTableModel(dtype)
+	counter = RowCounter(model)
+	records = np.zeros(0, dtype)
+	column, descending, filter = -1, False, None
+	filters = [None, lambda columns: columns['v'] % 2 == 0, lambda columns: columns['t'] > 0.5]
+
+	for step in range(60):
+		action = generator.random()
+		if action < 0.5:
+			# Mostly small appends, sometimes a large one
+			rows = randomRows(generator, generator.choice([0, 1, 2, 5, 40, 300]))
+			model.appendRows(asInput(generator, rows))
+			records = np.concatenate((records, rows))
+		elif action < 0.65:
+			column = generator.randrange(-1, len(dtype.names))
+			descending = generator.random() < 0.5
+			model.sort(column, QtCore.Qt.DescendingOrder if descending else QtCore.Qt.AscendingOrder)
+		elif action < 0.8:
+			filter = generator.choice(filters)
+			model.setFilter(filter)
+		elif action < 0.95 and len(records):
+			name = generator.choice(dtype.names[:2])
+			start = generator.randrange(len(records))
+			values = randomRows(generator, generator.randint(1, 20))[name]
+			model.updateColumn(name, values, start)
+			stop = min(start + len(values), len(records))
+			records[name][start:stop] = values[:stop - start]
+		else:
+			model.clear()
+			records = np.zeros(0, dtype)
+
+		order = referenceOrder(records, column, descending, filter)
+		assert counter.rows == model.rowCount() == len(order)
+		viewOrder, texts = shown(model)
+		assert viewOrder == order.tolist()
+		assert texts == [['{:.6g}'.format(records['t'][row]), str(records['v'][row]), records['name'][row].decode()] for row in order]
+		for name in dtype.names:
+			assert np.array_equal(model.columnData(name), records[name])
+
+
+def test_sort_moves_persistent_indexes(qapp):
+	model = GWENTableModel(['x'])
+	model.appendRows({'x': np.array([3.0, 1.0, 2.0])})
+	index = QtCore.QPersistentModelIndex(model.index(0, 0))
+	model.sort(0)
+	assert index.row() == 2
+	assert model.data(model.index(index.row(), 0)) == '3'
+	model.sort(0, QtCore.Qt.DescendingOrder)
+	assert index.row() == 0
+	model.sort(-1)
+	assert index.row() == 0
+
+
+def test_appends_in_sort_order_insert_at_the_end(qapp):
+	model = GWENTableModel(['t'])
+	model.sort(0)
+	inserted = []
+	model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+	model.modelReset.connect(lambda: inserted.append('reset'))
+	for start in range(0, 100, 10):
+		model.appendRows({'t': np.arange(start, start + 10, dtype=np.float64)})
+	assert inserted == [(start, start + 9) for start in range(0, 100, 10)]